@@ -1,13 +1,13 @@
 #!/bin/bash
 
-# Version info
-VERSION=1.0.0-beta
+# Version info (defined in src/gtit.py)
+VERSION=$(python3 src/gtit.py --version | cut -d ' ' -f 2)
 
 # Clear files
 rm -r build dist package
 
-# Build
-pyinstaller src/gtit.py
+# Build (the binaries are not compressed with UPX, as they would be decompressed at each run)
+pyinstaller --noupx src/gtit.py
 
 # Create final folder and move files
 mkdir package
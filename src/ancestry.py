@@ -0,0 +1,156 @@
+# This file is used to answer ancestry questions (is A an ancestor of B? how many distinct
+# ancestors does X have?) without walking the tree again for every question.
+
+from individual import Individual
+
+
+class AncestorIndex:
+    """Ancestors of every individual, stored as bitsets.
+
+    Each individual gets a dense number (its position in the topological order) and its
+    ancestors are stored as a Python int whose bit n is set if the individual number n is
+    an ancestor. The sets are built in topological order, parents before children, so the
+    ancestors of an individual are simply its parents and their ancestors:
+
+        ancestors[child] = bit(father) | ancestors[father] | bit(mother) | ancestors[mother]
+
+    Membership, set sizes and shared ancestors are then bitwise operations. The individuals
+    that can't be ordered (parent/child cycles) are computed afterwards, until nothing changes.
+    """
+
+    _individuals: 'list[Individual]'    # Individuals by number
+    _numbers: dict                      # Individual -> number
+    _parents: 'list[int]'               # Bitset of the parents of each individual
+    _ancestors: 'list[int]'             # Bitset of all the ancestors of each individual
+    _paths: list                        # Number of ancestors counted with repetitions (None in a cycle)
+
+
+
+
+    @staticmethod
+    def iter_bits(bitset: int):
+        """Yield the number of every bit set in the bitset, lowest first."""
+        while bitset:
+            lowest: int = bitset & -bitset
+            yield lowest.bit_length() - 1
+            bitset ^= lowest
+
+
+
+
+    def __init__(self, ged_data) -> None:
+        ordered: set = set(ged_data.topological_order)
+        self._individuals = list(ged_data.topological_order) + [indi for indi in ged_data.individuals if indi not in ordered]
+        self._numbers = {indi: number for number, indi in enumerate(self._individuals)}
+
+        self._parents = [0] * len(self._individuals)
+        self._ancestors = [0] * len(self._individuals)
+        self._paths = [None] * len(self._individuals)
+
+        # Same graph as the topological order, so parents are always numbered before their children
+        parents, _ = ged_data.get_parent_child_graph()
+        for number, indi in enumerate(self._individuals):
+            for parent in parents[indi]:
+                self._parents[number] |= 1 << self._numbers[parent]
+
+        # Parents come before their children: a single pass is enough
+        for number in range(len(ged_data.topological_order)):
+            ancestors: int = self._parents[number]
+            paths: int = 0
+            for parent in self.iter_bits(self._parents[number]):
+                ancestors |= self._ancestors[parent]
+                paths += 1 + self._paths[parent]
+            self._ancestors[number] = ancestors
+            self._paths[number] = paths
+
+        # The other individuals are in a cycle or descend from one: repeat until the sets are stable
+        unordered: range = range(len(ged_data.topological_order), len(self._individuals))
+        changed: bool = True
+        while changed:
+            changed = False
+            for number in unordered:
+                ancestors: int = self._parents[number]
+                for parent in self.iter_bits(self._parents[number]): ancestors |= self._ancestors[parent]
+                if ancestors != self._ancestors[number]:
+                    self._ancestors[number] = ancestors
+                    changed = True
+
+
+
+    def to_individuals(self, bitset: int) -> 'list[Individual]':
+        """Return the individuals of a bitset, parents before their children."""
+        return [self._individuals[number] for number in self.iter_bits(bitset)]
+
+
+
+    def get_ancestor_bits(self, indi: Individual, generations: int = None) -> int:
+        """Return the bitset of the ancestors of the individual, up to the given number of generations
+        (every generation if None).
+        """
+        number: int = self._numbers[indi]
+        if generations is None: return self._ancestors[number]
+
+        # Add the parents of the last generation found, until the limit or until every ancestor is found
+        found: int = 0
+        generation: int = 1 << number
+        for _ in range(generations):
+            parents: int = 0
+            for n in self.iter_bits(generation): parents |= self._parents[n]
+            generation = parents & ~found
+            found |= parents
+            if not generation or found == self._ancestors[number]: break
+
+        return found
+
+
+
+    def get_ancestors(self, indi: Individual, generations: int = None) -> 'list[Individual]':
+        """Return the distinct ancestors of the individual, up to the given number of generations (every generation if None)."""
+        return self.to_individuals(self.get_ancestor_bits(indi, generations))
+
+
+
+    def count_ancestors(self, indi: Individual, generations: int = None) -> int:
+        """Return the number of distinct ancestors of the individual, up to the given number of generations (every generation if None)."""
+        return self.get_ancestor_bits(indi, generations).bit_count()
+
+
+
+    def is_ancestor(self, ancestor: Individual, indi: Individual) -> bool:
+        """Return True if 'ancestor' is an ancestor of 'indi'."""
+        return (self._ancestors[self._numbers[indi]] >> self._numbers[ancestor]) & 1 == 1
+
+
+
+    def get_common_ancestors(self, first: Individual, second: Individual) -> 'list[Individual]':
+        """Return the ancestors shared by both individuals."""
+        return self.to_individuals(self._ancestors[self._numbers[first]] & self._ancestors[self._numbers[second]])
+
+
+
+    def get_implex(self, indi: Individual, generations: int = None) -> float:
+        """Return the pedigree collapse of the individual, up to the given number of generations (every
+        generation if None): the share of its ancestors that appear more than once in its pedigree,
+        between 0 (every ancestor is distinct) and 1.
+
+        Each ancestor is counted once per path leading to them, and compared with the number of
+        distinct ancestors. None is returned for the individuals of a cycle without a limit (infinite pedigree).
+        """
+        number: int = self._numbers[indi]
+
+        if generations is None: paths: int = self._paths[number]
+        else:
+            # Count the ancestors of each generation with their number of paths
+            paths: int = 0
+            multiplicities: dict = {number: 1}
+            for _ in range(generations):
+                parents: dict = {}
+                for n, multiplicity in multiplicities.items():
+                    for parent in self.iter_bits(self._parents[n]): parents[parent] = parents.get(parent, 0) + multiplicity
+                if not parents: break
+                paths += sum(parents.values())
+                multiplicities = parents
+
+        if paths is None: return None
+        if paths == 0: return 0.0
+        return 1 - self.count_ancestors(indi, generations) / paths
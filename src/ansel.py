@@ -0,0 +1,92 @@
+# This file registers the 'ansel' codec, used by a lot of .GED files (ANSEL is the
+# default character set of GEDCOM 5.5).
+#
+# ANSEL is ASCII plus a set of special characters (0xA1 to 0xCF) and combining diacritics
+# (0xE0 to 0xFE). Unlike Unicode, the diacritics are written BEFORE the letter they modify.
+
+import codecs
+import unicodedata
+
+
+SPECIAL_CHARACTERS: dict = {
+    0xA1: 'Ł', 0xA2: 'Ø', 0xA3: 'Đ', 0xA4: 'Þ', 0xA5: 'Æ', 0xA6: 'Œ',
+    0xA7: 'ʹ', 0xA8: '·', 0xA9: '♭', 0xAA: '®', 0xAB: '±', 0xAC: 'Ơ',
+    0xAD: 'Ư', 0xAE: 'ʼ', 0xB0: 'ʻ', 0xB1: 'ł', 0xB2: 'ø', 0xB3: 'đ',
+    0xB4: 'þ', 0xB5: 'æ', 0xB6: 'œ', 0xB7: 'ʺ', 0xB8: 'ı', 0xB9: '£',
+    0xBA: 'ð', 0xBC: 'ơ', 0xBD: 'ư', 0xBE: '□', 0xBF: '■', 0xC0: '°',
+    0xC1: 'ℓ', 0xC2: '℗', 0xC3: '©', 0xC4: '♯', 0xC5: '¿', 0xC6: '¡',
+    0xC7: 'ß', 0xC8: '€', 0xCD: 'e', 0xCE: 'o', 0xCF: 'ß',
+}
+
+COMBINING_CHARACTERS: dict = {
+    0xE0: '\u0309', 0xE1: '\u0300', 0xE2: '\u0301', 0xE3: '\u0302', 0xE4: '\u0303', 0xE5: '\u0304',
+    0xE6: '\u0306', 0xE7: '\u0307', 0xE8: '\u0308', 0xE9: '\u030C', 0xEA: '\u030A', 0xEB: '\uFE20',
+    0xEC: '\uFE21', 0xED: '\u0315', 0xEE: '\u030B', 0xEF: '\u0310', 0xF0: '\u0327', 0xF1: '\u0328',
+    0xF2: '\u0323', 0xF3: '\u0324', 0xF4: '\u0325', 0xF5: '\u0333', 0xF6: '\u0332', 0xF7: '\u0326',
+    0xF8: '\u031C', 0xF9: '\u032E', 0xFA: '\uFE22', 0xFB: '\uFE23', 0xFE: '\u0313',
+}
+
+# Reverse tables, used to encode
+ENCODING_TABLE: dict = {c: b for b, c in SPECIAL_CHARACTERS.items() if b not in (0xCD, 0xCE, 0xCF)}
+COMBINING_ENCODING_TABLE: dict = {c: b for b, c in COMBINING_CHARACTERS.items()}
+
+
+
+
+def decode(data: bytes, errors: str = 'strict') -> 'tuple[str, int]':
+    """Decode ANSEL bytes. The diacritics are moved after their letter, then the text is
+    normalized (NFC), so 'e' with an acute accent becomes the single character 'é'.
+    """
+    characters: list[str] = []
+    pending_diacritics: list[str] = []
+
+    for byte in bytes(data):
+        if byte in COMBINING_CHARACTERS:
+            pending_diacritics.append(COMBINING_CHARACTERS[byte])
+            continue
+
+        if byte < 0x80: character = chr(byte)
+        elif byte in SPECIAL_CHARACTERS: character = SPECIAL_CHARACTERS[byte]
+        elif errors == 'strict': raise UnicodeDecodeError('ansel', bytes(data), 0, len(data), f"invalid ANSEL byte 0x{byte:02X}")
+        elif errors == 'ignore': continue
+        else: character = '�'
+
+        characters.append(character)
+        characters += pending_diacritics
+        pending_diacritics = []
+
+    characters += pending_diacritics
+    return unicodedata.normalize('NFC', ''.join(characters)), len(data)
+
+
+
+def encode(text: str, errors: str = 'strict') -> 'tuple[bytes, int]':
+    """Encode text to ANSEL, writing the diacritics before their letter."""
+    result: bytearray = bytearray()
+    pending: bytearray = bytearray()    # The last letter, followed by its diacritics
+
+    for character in unicodedata.normalize('NFD', text):
+        if character in COMBINING_ENCODING_TABLE:
+            pending.insert(0, COMBINING_ENCODING_TABLE[character])
+            continue
+
+        result += pending
+        pending = bytearray()
+
+        if ord(character) < 0x80: pending.append(ord(character))
+        elif character in ENCODING_TABLE: pending.append(ENCODING_TABLE[character])
+        elif errors == 'strict': raise UnicodeEncodeError('ansel', text, 0, len(text), f"character {character!r} has no ANSEL equivalent")
+        elif errors == 'replace': pending.append(ord('?'))
+
+    result += pending
+    return bytes(result), len(text)
+
+
+
+
+def search_codec(name: str) -> codecs.CodecInfo:
+    if name != 'ansel': return None
+    return codecs.CodecInfo(name='ansel', encode=encode, decode=decode)
+
+
+codecs.register(search_codec)
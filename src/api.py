@@ -0,0 +1,160 @@
+# This file is the entry point to use gtit as a library, in a web backend for example.
+#
+# Its functions never print nor prompt: they return dictionaries and lists (that can be
+# serialized as JSON) and raise exceptions. A .GED file is loaded with load(), or with
+# load_async() from an asyncio event loop:
+#
+#     ged_data = await api.load_async("family.ged", progress = lambda bytes_read, total_bytes, records: ...)
+#     api.get_individual(ged_data, "Victoria")
+#
+# load_async() parses the file in a worker thread, so the event loop keeps running during the
+# loading, and cancelling the awaiting task stops the parsing. The returned GEDData is frozen,
+# so it can be queried by several requests at the same time.
+
+import asyncio
+import threading
+from geddata import GEDData, LoadCancelled, AmbiguousIndividualError
+from individual import Individual
+
+
+
+
+def load(filepath: str, progress = None, cancel: threading.Event = None) -> GEDData:
+    """Parse the .GED file and return it frozen.
+
+    progress is called as progress(bytes_read, total_bytes, records) while the file is read,
+    and the loading stops with a LoadCancelled exception if cancel is set (see GEDData.parse()).
+    """
+    ged_data: GEDData = GEDData()
+    ged_data.parse(filepath, progress, cancel)
+    return ged_data.freeze()
+
+
+
+async def load_async(filepath: str, progress = None, executor = None) -> GEDData:
+    """Load the .GED file in a worker thread (of the executor, or of the default executor of the
+    loop) and return it frozen, without blocking the event loop.
+
+    progress is called in the thread of the event loop, as progress(bytes_read, total_bytes, records).
+    If the awaiting task is cancelled, the worker thread stops at the next record and the
+    asyncio.CancelledError is raised right away, without waiting for the thread.
+    """
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+    cancel: threading.Event = threading.Event()
+
+    # Called in the worker thread: the callback is scheduled in the loop
+    def report(bytes_read: int, total_bytes: int, records: int) -> None:
+        if not cancel.is_set(): loop.call_soon_threadsafe(progress, bytes_read, total_bytes, records)
+
+    try:
+        return await loop.run_in_executor(executor, load, filepath, report if progress is not None else None, cancel)
+    except asyncio.CancelledError:
+        cancel.set()
+        raise
+
+
+
+
+def individual_to_dict(indi: Individual) -> dict:
+    """Return the informations of the individual, with its parents and children as ids."""
+    return {
+        "id": indi.id,
+        "reference": indi.reference,
+        "name": indi.get_cleared_raw_name(),
+        "first_name": indi.first_name,
+        "last_name": indi.last_name,
+        "sex": indi.sex,
+        "birth_date": (str(indi.birth_date) or None) if indi.birth_date else None,
+        "birth_place": indi.birth_place,
+        "death_date": (str(indi.death_date) or None) if indi.death_date else None,
+        "death_place": indi.death_place,
+        "generation": indi.generation,
+        "component": indi.component,
+        "father": indi.father.id if indi.father else None,
+        "mother": indi.mother.id if indi.mother else None,
+        "children": [child.id for child in indi.children],
+    }
+
+
+
+def find_individuals(ged_data: GEDData, search: str, fuzzy: bool = False, k: int = 10) -> 'list[dict]':
+    """Return the individuals whose name matches the 'search' regex, or the k individuals whose
+    name is the closest to search if fuzzy is True (the closest first)."""
+    individuals: list[Individual] = ged_data.find_individuals_fuzzy(search, k) if fuzzy else ged_data.find_individuals(search)
+    return [individual_to_dict(indi) for indi in individuals]
+
+
+
+def get_individual(ged_data: GEDData, search: str, fuzzy: bool = False) -> dict:
+    """Return the individual with the given id, or the only one matching the name, None if there is none.
+
+    Raise an AmbiguousIndividualError if several individuals match the name: their list
+    is its individuals attribute.
+    """
+    indi: Individual = ged_data.find_individual(search, fuzzy, interactive = False)
+    return individual_to_dict(indi) if indi is not None else None
+
+
+
+def get_tree(ged_data: GEDData, search: str, depth: int, fuzzy: bool = False) -> 'list[list[dict]]':
+    """Return the generations of the ancestors (depth > 0) or of the descendants (depth < 0) of
+    the individual (see get_individual()), from the individual itself to the given depth.
+    None if the individual is not found."""
+    root: Individual = ged_data.find_individual(search, fuzzy, interactive = False)
+    if root is None: return None
+
+    step: int = 1 if depth >= 0 else -1
+    return [[individual_to_dict(indi) for indi in root.get_ancestors(generation)] for generation in range(0, depth + step, step)]
+
+
+
+def get_relationship(ged_data: GEDData, first_search: str, second_search: str, fuzzy: bool = False) -> dict:
+    """Return how the first individual is related to the second one, with the paths from each of
+    them to their closest common ancestors. None if they have no common ancestor.
+
+    Raise a LookupError if one of the individuals is not found (see get_individual()).
+    """
+    from relationship import Relationship
+
+    individuals: list[Individual] = []
+    for search in (first_search, second_search):
+        indi: Individual = ged_data.find_individual(search, fuzzy, interactive = False)
+        if indi is None: raise LookupError(f"Could not find the individual '{search}'.")
+        individuals.append(indi)
+
+    relationship: Relationship = Relationship.find(*individuals)
+    if relationship is None: return None
+
+    return {
+        "name": relationship.get_name(),
+        "ancestors": [individual_to_dict(indi) for indi in relationship.ancestors],
+        "first_path": [individual_to_dict(indi) for indi in relationship.first_path],
+        "second_path": [individual_to_dict(indi) for indi in relationship.second_path],
+    }
+
+
+
+def search_text(ged_data: GEDData, query: str) -> 'list[dict]':
+    """Return the individuals linked to the notes and sources matching the query (see TextIndex.search()),
+    with the references of these records."""
+    matches: dict = ged_data.get_text_index().find_individuals(query)
+    return [{"individual": individual_to_dict(ged_data.get_individual(int(reference.strip('@')[1:]))), "records": records}
+            for reference, records in matches.items()]
+
+
+
+def get_statistics(ged_data: GEDData) -> dict:
+    """Return the number of individuals, families and founders, the parent/child cycles, the
+    number of individuals per generation and the size of each connected component (the largest first)."""
+    generations: dict = {}
+    for indi in ged_data.individuals:
+        if indi.generation is not None: generations[indi.generation] = generations.get(indi.generation, 0) + 1
+
+    return {
+        "individuals": len(ged_data.individuals),
+        "families": len(ged_data.families),
+        "founders": generations.get(0, 0),
+        "cycles": [list(cycle) for cycle in ged_data.cycles],
+        "generations": dict(sorted(generations.items())),
+        "components": list(ged_data.component_sizes),
+    }
@@ -1,3 +1,4 @@
+import re
 from enum import Enum
 
 
@@ -18,6 +19,7 @@ class Date:
     MONTHS_TOKENS: 'list[str]' = ["JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC"]
     MONTH_NAMES: 'list[str]' = ["January", "February", "March", "April", "May", "June", "July", "August", "September", "October", "November", "December"]
     CIRCA_TOKENS: 'list[str]' = ["ABT", "CAL", "EST"]
+    CIRCA_YEARS: int = 5            # Uncertainty of the approximated dates, in years, for get_year_bounds()
 
     day: str = None
     month: int = None
@@ -54,7 +56,7 @@ class Date:
             elif word == "TO" and self.is_from_to: is_second_year = True
             elif word == "AND" and self.is_between: is_second_year = True
             elif word == "FROM": self.is_from_to = True
-            elif word == "BETWEEN": self.is_between = True
+            elif word in ("BET", "BETWEEN"): self.is_between = True
             elif word == "BEF": self.is_before = True
             elif word == "AFT": self.is_after = True
 
@@ -108,6 +110,43 @@ class Date:
 
 
 
+    @staticmethod
+    def year_to_int(year: str) -> int:
+        """Return the given year as an int, or None. Dual years like 1750/51 give the first one."""
+        if not year: return None
+        match = re.match(r'\d+', year)
+        return int(match.group(0)) if match else None
+
+
+
+    def get_year(self) -> int:
+        """Return the year of this date as an int, or None if unknown."""
+        return Date.year_to_int(self.year)
+
+
+
+    def get_other_year(self) -> int:
+        """Return the second year of this date (BETWEEN/FROM dates) as an int, or None if unknown."""
+        return Date.year_to_int(self.other_year)
+
+
+
+    def get_year_bounds(self) -> 'tuple[int, int]':
+        """Return the earliest and latest possible years of this date. A bound is None if unknown:
+        the earliest year of a BEF date, the latest one of an AFT date, both if the year is unknown.
+        Approximated dates are CIRCA_YEARS years wide on each side.
+        """
+        year: int = self.get_year()
+        if year is None: return None, None
+
+        if (self.is_between or self.is_from_to) and self.get_other_year() is not None: return year, self.get_other_year()
+        if self.is_before: return None, year
+        if self.is_after: return year, None
+        if self.is_circa: return year - self.CIRCA_YEARS, year + self.CIRCA_YEARS
+        return year, year
+
+
+
     
     def __str__(self) -> str:
         """Represent the date as a str"""
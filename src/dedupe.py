@@ -0,0 +1,182 @@
+# This file is used to find individuals that are probably duplicates of each other.
+# Comparing every pair of individuals is too slow for big files, so the individuals are first
+# grouped into blocks of similar individuals, and only individuals of the same block are compared.
+
+from difflib import SequenceMatcher
+
+import phonetic
+from individual import Individual
+
+
+class DuplicateFinder:
+    """Find probable duplicates among a list of individuals.
+
+    Each individual is given a blocking key made of:
+    - the Soundex code of its last name;
+    - its birth year, rounded down to YEAR_BUCKET_SIZE years (or '?' if unknown);
+    - the initial of its first name.
+
+    The individuals of a block are compared with each other, and with the individuals of the
+    neighbouring blocks (see get_neighbour_keys()): the next decade, so that 1799 and 1800 are
+    compared, and the unknown years. They are compared with a weighted similarity on their names,
+    birth and death years and places (see similarity()). Pairs scoring at least the
+    threshold are returned, the most similar first. A pair is only scored if both individuals
+    have a last name, or if a year can be compared: 2 "John" without any date are not duplicates.
+
+    The comparisons only use plain tuples (see get_record()), so that the comparisons of more than
+    POOL_BLOCK_SIZE ** 2 / 2 pairs can be sent to worker processes.
+    """
+
+    YEAR_BUCKET_SIZE: int = 10
+    POOL_BLOCK_SIZE: int = 200          # Blocks with more individuals (or as many pairs) are compared in the process pool
+
+    # Weight of each criterion in the similarity. Unknown values don't count.
+    WEIGHTS: dict = {"name": 0.5, "birth_year": 0.2, "death_year": 0.15, "place": 0.15}
+
+    threshold: float
+    jobs: int
+
+
+
+
+    @staticmethod
+    def get_record(indi: Individual) -> tuple:
+        """Return the information needed to compare the individual, as a tuple:
+        (reference, normalized name, has a last name, sex, birth year, death year, set of place words).
+        """
+        birth_year: int = indi.birth_date.get_year() if indi.birth_date else None
+        death_year: int = indi.death_date.get_year() if indi.death_date else None
+
+        places: set = set()
+        for place in (indi.birth_place, indi.death_place):
+            places.update(phonetic.normalize(place).split())
+
+        return (indi.reference, phonetic.normalize(indi._raw_name), bool(phonetic.normalize(indi.last_name)), indi.sex, birth_year, death_year, frozenset(places))
+
+
+
+    @staticmethod
+    def get_blocking_key(indi: Individual) -> tuple:
+        """Return the key of the block the individual belongs to."""
+        last_name: str = indi.last_name if indi.last_name else indi._raw_name.split(' ')[-1]
+        first_name: str = phonetic.normalize(indi.first_name)
+
+        birth_year: int = indi.birth_date.get_year() if indi.birth_date else None
+        year_bucket = birth_year // DuplicateFinder.YEAR_BUCKET_SIZE if birth_year is not None else '?'
+
+        return (phonetic.soundex(last_name), year_bucket, first_name[:1])
+
+
+
+    @staticmethod
+    def get_neighbour_keys(key: tuple) -> 'list[tuple]':
+        """Return the keys of the blocks whose individuals are also compared with the ones of the
+        block key: the next decade and the unknown years. The previous decade is not returned, as
+        it compares itself with this one, so each pair of blocks is compared once."""
+        soundex, year_bucket, initial = key
+        if year_bucket == '?': return []
+        return [(soundex, year_bucket + 1, initial), (soundex, '?', initial)]
+
+
+
+    @staticmethod
+    def similarity(a: tuple, b: tuple, threshold: float = 0.0) -> float:
+        """Return the similarity, between 0 and 1, of 2 records created by get_record().
+        0.0 is returned if the similarity is lower than threshold.
+        """
+        _, name_a, last_name_a, sex_a, birth_a, death_a, places_a = a
+        _, name_b, last_name_b, sex_b, birth_b, death_b, places_b = b
+
+        # Individuals of different sexes are never duplicates
+        if sex_a and sex_b and sex_a != sex_b: return 0.0
+
+        weights: dict = DuplicateFinder.WEIGHTS
+        score: float = 0.0
+        total: float = weights["name"]
+        years_compared: bool = False
+
+        for key, year_a, year_b in (("birth_year", birth_a, birth_b), ("death_year", death_a, death_b)):
+            if year_a is None or year_b is None: continue
+            difference: int = abs(year_a - year_b)
+            score += weights[key] * (1.0 if difference == 0 else 0.5 if difference <= 2 else 0.0)
+            total += weights[key]
+            years_compared = True
+
+        if places_a and places_b:
+            score += weights["place"] * len(places_a & places_b) / len(places_a | places_b)
+            total += weights["place"]
+
+        # The first names alone (with places at most) are too common to tell anything
+        if not (last_name_a and last_name_b) and not years_compared: return 0.0
+
+        # The names are compared last: their quick upper bounds often tell that the threshold can't be
+        # reached (with a margin for the rounding errors)
+        matcher: SequenceMatcher = SequenceMatcher(None, name_a, name_b)
+        needed_ratio: float = (threshold * total - score) / weights["name"] - 1e-9
+        if matcher.real_quick_ratio() < needed_ratio or matcher.quick_ratio() < needed_ratio: return 0.0
+
+        score += weights["name"] * matcher.ratio()
+        return score / total if score / total >= threshold else 0.0
+
+
+
+    @staticmethod
+    def compare_block(records: 'list[tuple]', threshold: float, others: 'list[tuple]' = None) -> 'list[tuple]':
+        """Compare every pair of records of a block, or every record of the block with every record
+        of the others block if given.
+        Returns the (score, reference, reference) of the pairs scoring at least threshold.
+        """
+        pairs: list[tuple] = []
+        for i, a in enumerate(records):
+            for b in (records[i + 1:] if others is None else others):
+                score: float = DuplicateFinder.similarity(a, b, threshold)
+                if score >= threshold: pairs.append((score, a[0], b[0]))
+        return pairs
+
+
+
+
+    def __init__(self, threshold: float = 0.85, jobs: int = 1) -> None:
+        self.threshold = threshold
+        self.jobs = jobs
+
+
+
+    def get_blocks(self, individuals: 'list[Individual]') -> 'list[tuple[list[tuple], list[tuple]]]':
+        """Group the individuals by blocking key, and return the comparisons to do: (block, None) to
+        compare the individuals of a block with each other, (block, other block) to compare them with
+        the individuals of a neighbouring block (see get_neighbour_keys())."""
+        blocks: dict = {}
+        for indi in individuals:
+            blocks.setdefault(self.get_blocking_key(indi), []).append(self.get_record(indi))
+
+        comparisons: list[tuple] = [(block, None) for block in blocks.values() if len(block) > 1]
+        for key, block in blocks.items():
+            comparisons += [(block, blocks[neighbour]) for neighbour in self.get_neighbour_keys(key) if neighbour in blocks]
+        return comparisons
+
+
+
+    def find_duplicates(self, individuals: 'list[Individual]') -> 'list[tuple]':
+        """Return the probable duplicates as a list of (score, reference, reference), the best score first."""
+        comparisons: list[tuple] = self.get_blocks(individuals)
+        pairs: list[tuple] = []
+
+        def is_large(comparison: tuple) -> bool:
+            block, others = comparison
+            size: int = len(block) * (len(block) // 2 if others is None else len(others))
+            return self.jobs > 1 and size > self.POOL_BLOCK_SIZE ** 2 // 2
+
+        for block, others in [comparison for comparison in comparisons if not is_large(comparison)]:
+            pairs += self.compare_block(block, self.threshold, others)
+
+        large_comparisons: list[tuple] = [comparison for comparison in comparisons if is_large(comparison)]
+        if large_comparisons:
+            from concurrent.futures import ProcessPoolExecutor     # Slow to import: only when needed
+            with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+                blocks, others = zip(*large_comparisons)
+                for block_pairs in executor.map(self.compare_block, blocks, [self.threshold] * len(blocks), others):
+                    pairs += block_pairs
+
+        pairs.sort(key=lambda pair: pair[0], reverse=True)
+        return pairs
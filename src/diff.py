@@ -0,0 +1,175 @@
+# This file is used to compare two versions of a .GED file, record by record.
+#
+# Both files are read as streams. The first pass hashes each level 0 record of the old file,
+# the second one hashes the records of the new file and only keeps the records that are new
+# or whose hash differs, and the third one reads the old version of the changed and removed
+# records. Only these records are parsed into items, and compared field by field.
+
+import hashlib
+import gedreader
+from item import Item
+
+
+class GEDDiff:
+    """Differences between an old and a new version of a .GED file.
+
+    The records are matched by their reference (xref): the records without reference (the
+    header and the trailer) are not compared. A record is changed if any of its lines differs,
+    ignoring the indentation and the line terminators. The fields listed in FIELDS are
+    compared one by one; the other differences are summed up as 'other fields'.
+    """
+
+    # Fields compared for each type of record: a tag, or a tag and the tag of its child
+    FIELDS: dict = {
+        "INDI": ["NAME", "SEX", "BIRT.DATE", "BIRT.PLAC", "DEAT.DATE", "DEAT.PLAC", "FAMC", "FAMS"],
+        "FAM": ["HUSB", "WIFE", "CHIL", "MARR.DATE", "MARR.PLAC"],
+    }
+    LIST_FIELDS: 'list[str]' = ["FAMC", "FAMS", "CHIL"]    # Fields that can be repeated (compared as lists of values)
+
+    old_path: str
+    new_path: str
+    added: 'list[Item]'                 # Records of the new file only
+    removed: 'list[Item]'               # Records of the old file only
+    changed: 'list[tuple]'              # (old record, new record, differences) of the records that differ, in the order of the new file
+
+
+
+
+    def __init__(self, old_path: str, new_path: str) -> None:
+        self.old_path = old_path
+        self.new_path = new_path
+        self.added = []
+        self.removed = []
+        self.changed = []
+
+
+
+    @staticmethod
+    def iter_hashed_records(filepath: str):
+        """Read the input and yield (reference, digest, encoding, lines) for each level 0 record
+        with a reference. lines are the lines of the record, as bytes."""
+        reference: str = None
+        hasher = None
+        record_encoding: str = None
+        lines: list[bytes] = []
+
+        for encoding, line in gedreader.iter_input_lines(filepath):
+            line = line.strip()
+            if line[:2] == b'0 ' or line == b'0':
+                if reference is not None: yield reference, hasher.digest(), record_encoding, lines
+                parts: list[bytes] = line.split(None, 2)
+                reference = parts[1].decode('ascii', 'replace') if len(parts) > 1 and parts[1][:1] == b'@' else None
+                hasher = hashlib.blake2b(digest_size = 16)
+                record_encoding = encoding
+                lines = []
+
+            if reference is None: continue
+            hasher.update(line + b'\n')
+            lines.append(line)
+
+        if reference is not None: yield reference, hasher.digest(), record_encoding, lines
+
+
+
+    @staticmethod
+    def to_record(encoding: str, lines: 'list[bytes]') -> Item:
+        return next(gedreader.iter_lines_records((encoding, line) for line in lines))
+
+
+
+
+    def compare(self) -> None:
+        """Read both files and fill added, removed and changed (see compare_fields())."""
+
+        # Hash every record of the old file
+        hashes: dict = {}
+        for reference, digest, _, _ in self.iter_hashed_records(self.old_path):
+            hashes[reference] = digest
+
+        # Keep the records of the new file that are not in the old one, or differ from it
+        changed: dict = {}              # Reference -> new record
+        for reference, digest, encoding, lines in self.iter_hashed_records(self.new_path):
+            old_digest: bytes = hashes.pop(reference, None)
+            if old_digest == digest: continue
+            if old_digest is None: self.added.append(self.to_record(encoding, lines))
+            else: changed[reference] = self.to_record(encoding, lines)
+
+        # The references left are the removed records: read them with the old version of the changed records
+        old_records: dict = {}
+        if hashes or changed:
+            for reference, _, encoding, lines in self.iter_hashed_records(self.old_path):
+                if reference in hashes: self.removed.append(self.to_record(encoding, lines))
+                elif reference in changed: old_records[reference] = self.to_record(encoding, lines)
+
+        # Records whose lines only differ by their spacing have no difference
+        for reference, record in changed.items():
+            differences: list[tuple] = self.compare_fields(old_records[reference], record)
+            if differences: self.changed.append((old_records[reference], record, differences))
+
+
+
+    @staticmethod
+    def get_field(record: Item, field: str):
+        """Return the value of the field of the record (see FIELDS), the list of its values for LIST_FIELDS."""
+        tags: list[str] = field.split('.')
+        if tags[0] in GEDDiff.LIST_FIELDS: return [child.value for child in record.get_children(tags[0])]
+
+        item: Item = record
+        for tag in tags:
+            item = item.get_child(tag)
+            if item is None: return None
+        return item.value
+
+
+
+    @staticmethod
+    def get_other_lines(record: Item, fields: 'list[str]') -> 'list[tuple]':
+        """Return (path, tag, value) for every item of the record, in order, except the compared fields.
+        The path is the tags from the level 1 item to the item, joined by dots (BIRT.SOUR for example)."""
+        lines: list[tuple] = []
+        items: list[tuple] = [('', record)]
+        while items:
+            path, item = items.pop()
+            if path not in fields: lines.append((path, item.identifier, item.value))
+            items += [(f"{path}.{child.identifier}" if path else child.identifier, child) for child in reversed(item.children)]
+        return lines
+
+
+
+    def compare_fields(self, old: Item, new: Item) -> 'list[tuple]':
+        """Return (field, old value, new value) for each field of FIELDS that differs between the
+        two versions of the record, and ('other fields', None, None) if something else differs."""
+        fields: list[str] = self.FIELDS.get(new.identifier, [])
+        differences: list[tuple] = []
+        for field in fields:
+            old_value = self.get_field(old, field)
+            new_value = self.get_field(new, field)
+            if old_value != new_value: differences.append((field, old_value, new_value))
+
+        if self.get_other_lines(old, fields) != self.get_other_lines(new, fields): differences.append(("other fields", None, None))
+        return differences
+
+
+
+    @staticmethod
+    def get_label(record: Item) -> str:
+        """Return a short description of the record: the name of an individual, the spouses of a
+        family, or the title of a source."""
+        if record.identifier == 'INDI':
+            name: str = record.get_child('NAME').value if record.get_child('NAME') is not None else ''
+            return ' '.join(name.replace('/', ' ').split())
+        if record.identifier == 'FAM':
+            return ' + '.join(child.value for child in record.children if child.identifier in ('HUSB', 'WIFE'))
+        title: Item = record.get_child('TITL')
+        return title.value if title is not None else ''
+
+
+
+    @staticmethod
+    def describe(field: str, old_value, new_value) -> str:
+        """Return the difference of a field as text: 'old -> new', or the added and removed values of LIST_FIELDS."""
+        if field.split('.')[0] in GEDDiff.LIST_FIELDS:
+            changes: list[str] = [f"+{value}" for value in new_value if value not in old_value]
+            changes += [f"-{value}" for value in old_value if value not in new_value]
+            return ' '.join(changes) if changes else "reordered"
+        return f"{old_value or '(none)'} -> {new_value or '(none)'}"
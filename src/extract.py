@@ -0,0 +1,293 @@
+# This file is used to extract a part of a .GED file (the ancestors or descendants of an individual)
+# into a new .GED file.
+#
+# The input is read twice, as a stream: the first pass only keeps the position and the pointers of
+# each record, and the second one copies the bytes of the selected records as they are.
+
+import re
+import datetime
+import gedreader
+from item import Item
+from graph_arrays import GraphArrays, has_numpy
+
+
+class Extractor:
+    """Extract the ancestors and/or descendants of an individual, and the records they refer to.
+
+    scan() reads the input once and keeps, for each level 0 record, its tag, its position in
+    the input and the pointers it contains (at any level). get_closure() then selects the
+    individuals, their families and, transitively, the sources, notes, media and repositories
+    they refer to. write() reads the input again and copies the selected records byte for byte
+    after a new header. Only the lines pointing to records that were not selected are removed,
+    so that the new file has no dangling pointer.
+    """
+
+    # Records referenced by the selected records that are extracted with them
+    LINKED_RECORDS: 'list[str]' = ["SOUR", "NOTE", "OBJE", "REPO", "SUBM"]
+
+    filepath: str
+    records: dict               # xref -> (tag, start, end, list of the pointers of the record)
+    links: dict                 # xref of each individual and family -> {tag: pointers} of its family links
+    names: dict                 # xref of each individual -> its name
+    charset: str                # Character set declared by the input ('1 CHAR' of the header)
+    submitter: str              # xref of the submitter of the input, if any
+    newline: bytes              # Line terminator of the input
+
+    _graph: tuple               # Parents and children of each individual, built on demand (see get_parent_child_graph())
+    _arrays: GraphArrays        # The same graph as NumPy arrays, built on demand (see get_generations())
+
+
+
+
+    def __init__(self, filepath: str) -> None:
+        self.filepath = filepath
+        self.records = {}
+        self.links = {}
+        self.names = {}
+        self.charset = None
+        self.submitter = None
+        self.newline = b'\n'
+        self._graph = None
+        self._arrays = None
+
+
+
+    @staticmethod
+    def get_pointers(record: Item) -> 'list[str]':
+        """Return the pointers of every item of the record (not the reference of the record itself)."""
+        pointers: list[str] = []
+        items: list[Item] = list(record.children)
+        while items:
+            item: Item = items.pop()
+            if item.is_pointer(): pointers.append(item.value)
+            items += item.children
+        return pointers
+
+
+
+    @staticmethod
+    def get_links(record: Item, tag: str) -> 'list[str]':
+        """Return the pointers of the children of the record with the given tag (FAMC, HUSB, CHIL, etc.)."""
+        return [child.value for child in record.get_children(tag) if child.is_pointer()]
+
+
+
+
+    def scan(self) -> None:
+        """Read the input and store the position and the pointers of every record."""
+        for record, start, end in gedreader.iter_record_spans(self.filepath):
+            if record.identifier == 'HEAD':
+                charset: Item = record.get_child('CHAR')
+                self.charset = charset.value.strip() if charset is not None else None
+                submitters: list[str] = Extractor.get_links(record, 'SUBM')
+                self.submitter = submitters[0] if submitters else None
+                continue
+
+            if record.reference is None: continue
+            self.records[record.reference] = (record.identifier, start, end, Extractor.get_pointers(record))
+
+            if record.identifier == 'INDI':
+                name: Item = record.get_child('NAME')
+                self.names[record.reference] = ' '.join(name.value.replace('/', ' ').split()) if name is not None else ''
+                self.links[record.reference] = {tag: Extractor.get_links(record, tag) for tag in ('FAMC', 'FAMS')}
+            elif record.identifier == 'FAM':
+                self.links[record.reference] = {tag: Extractor.get_links(record, tag) for tag in ('HUSB', 'WIFE', 'CHIL')}
+
+        # Keep the line terminator of the input
+        for encoding, chunk in gedreader.iter_input_chunks(self.filepath):
+            if b'\r\n' in chunk: self.newline = b'\r\n'
+            break
+
+
+
+    def find_individuals(self, search: str) -> 'list[str]':
+        """Return the xref of the individuals matching search: a reference id, or a regular expression on the name."""
+        try: return [xref for xref in [f"@I{int(search)}@"] if xref in self.names]
+        except ValueError: return [xref for xref, name in self.names.items() if re.search(search, name) is not None]
+
+
+
+
+    def get_family_members(self, family: str, tags: 'tuple[str]') -> 'list[str]':
+        members: list[str] = []
+        for tag in tags: members += self.links.get(family, {}).get(tag, [])
+        return members
+
+
+
+    def get_parent_child_graph(self) -> 'tuple[dict, dict]':
+        """Return the parents and the children of each individual, as dicts of xref -> list of xrefs.
+
+        The parents are found through the families where the individual is a child (FAMC), and
+        the children through the families where it is a spouse (FAMS).
+        """
+        if self._graph is not None: return self._graph
+
+        parents: dict = {}
+        children: dict = {}
+        for indi in self.names:
+            parents[indi] = [parent for family in self.links[indi]['FAMC']
+                             for parent in self.get_family_members(family, ('HUSB', 'WIFE')) if parent in self.names]
+            children[indi] = [child for family in self.links[indi]['FAMS']
+                              for child in self.get_family_members(family, ('CHIL',)) if child in self.names]
+        self._graph = (parents, children)
+        return self._graph
+
+
+
+    def get_generations(self, root: str, depth: int, upward: bool = True) -> 'list[list[str]]':
+        """Return the successive generations of ancestors (or descendants if upward is False) of root,
+        up to depth generations. An individual is only part of the first generation where it is found.
+
+        With NumPy, the generations are expanded on the arrays of the graph (see GraphArrays.get_frontiers()).
+        """
+        parents, children = self.get_parent_child_graph()
+        if has_numpy():
+            if self._arrays is None: self._arrays = GraphArrays.from_graph(self.names, parents, children)
+            return [self._arrays.to_individuals(frontier) for frontier in self._arrays.get_frontiers([root], depth, upward)]
+
+        neighbours: dict = parents if upward else children
+        visited: set = {root}
+        generations: list[list[str]] = []
+        generation: list[str] = [root]
+        while generation and len(generations) < depth:
+            generation = [indi for indi in dict.fromkeys(other for indi in generation for other in neighbours[indi]) if indi not in visited]
+            visited.update(generation)
+            if generation: generations.append(generation)
+        return generations
+
+
+
+    def get_closure(self, root: str, depth: int, both: bool = False) -> set:
+        """Return the xref of the records to extract.
+
+        If depth > 0, the ancestors of root up to depth generations are extracted. If depth < 0,
+        its descendants up to -depth generations, with the other parent of each descendant. If
+        both is True, both the ancestors and the descendants up to abs(depth) generations.
+        The families linking the extracted individuals, and the records they refer to, are extracted too.
+        """
+        individuals: set = {root}
+
+        # Ancestors: follow the families where the individuals are children
+        if depth > 0 or both:
+            for generation in self.get_generations(root, abs(depth), True): individuals.update(generation)
+
+        # Descendants: follow the families where the individuals are spouses, and add the other
+        # parent of the children (the descendants of the last generation have no children extracted)
+        if depth < 0 or both:
+            generations: list[list[str]] = [[root]] + self.get_generations(root, abs(depth), False)
+            for generation in generations[1:]: individuals.update(generation)
+            for indi in (indi for generation in generations[:abs(depth)] for indi in generation):
+                for family in self.links[indi]['FAMS']:
+                    if not any(child in self.names for child in self.get_family_members(family, ('CHIL',))): continue
+                    individuals.update(spouse for spouse in self.get_family_members(family, ('HUSB', 'WIFE')) if spouse in self.names)
+
+        # The families with at least 2 extracted members
+        selected: set = set(individuals)
+        for xref, (tag, _, _, _) in self.records.items():
+            if tag != 'FAM': continue
+            members: list[str] = self.get_family_members(xref, ('HUSB', 'WIFE', 'CHIL'))
+            if sum(1 for member in members if member in individuals) >= 2: selected.add(xref)
+
+        # The records referred to by the selected records, and by the records they refer to
+        if self.submitter in self.records: selected.add(self.submitter)
+        pending: list[str] = list(selected)
+        while pending:
+            for pointer in self.records[pending.pop()][3]:
+                if pointer in self.records and pointer not in selected and self.records[pointer][0] in self.LINKED_RECORDS:
+                    selected.add(pointer)
+                    pending.append(pointer)
+
+        return selected
+
+
+
+
+    def get_header(self, encoding: str, selected: set) -> bytes:
+        """Return a new header, with a submitter record if the input has none."""
+        charset: str = self.charset if self.charset and encoding != 'utf-8' else 'UTF-8'
+        submitter: str = self.submitter if self.submitter in selected else None
+
+        lines: list[str] = [
+            "0 HEAD",
+            "1 SOUR GTIT",
+            "1 DATE " + datetime.date.today().strftime("%d %b %Y").upper(),
+            "1 GEDC", "2 VERS 5.5.1", "2 FORM LINEAGE-LINKED",
+            "1 CHAR " + charset,
+            "1 NOTE Extracted from " + self.filepath,
+        ]
+
+        # A submitter is required by the header
+        new_submitter: list[str] = []
+        if submitter is None:
+            submitter = "@SUBM@"
+            i: int = 1
+            while submitter in self.records:
+                submitter = f"@SUBM{i}@"
+                i += 1
+            new_submitter = [f"0 {submitter} SUBM", "1 NAME GTIT"]
+        lines.insert(3, "1 SUBM " + submitter)
+
+        return self.newline.join(line.encode(encoding, 'replace') for line in lines + new_submitter) + self.newline
+
+
+
+    def remove_dangling_pointers(self, data: bytes, encoding: str, selected: set) -> bytes:
+        """Return the lines of a record without the lines (and their sub-lines) pointing to records that are not selected."""
+        lines: list[bytes] = data.splitlines(keepends = True)
+        kept: list[bytes] = []
+        removed_level: int = None       # Level of the removed line whose sub-lines are being removed
+
+        for line in lines:
+            if not line.strip():
+                kept.append(line)
+                continue
+
+            item: Item = gedreader.line_to_item(line.rstrip(b'\r\n'), encoding)
+            if removed_level is not None and item.level > removed_level: continue
+            removed_level = None
+
+            if item.level > 0 and item.is_pointer() and item.value not in selected:
+                removed_level = item.level
+                continue
+            kept.append(line)
+
+        return b''.join(kept)
+
+
+
+    def write(self, output, selected: set) -> int:
+        """Write the selected records in the binary stream output, after a new header, and return their number."""
+        ranges: list[tuple] = sorted((start, end, xref) for xref, (_, start, end, _) in self.records.items() if xref in selected)
+
+        position: int = 0
+        i: int = 0
+        data: bytearray = bytearray()
+        header_written: bool = False
+
+        for encoding, chunk in gedreader.iter_input_chunks(self.filepath):
+            if not header_written:
+                output.write(self.get_header(encoding, selected))
+                header_written = True
+
+            chunk_start: int = position
+            position += len(chunk)
+
+            # Copy the parts of the chunk belonging to selected records
+            while i < len(ranges) and ranges[i][0] < position:
+                start, end, xref = ranges[i]
+                data += chunk[max(start - chunk_start, 0):end - chunk_start]
+                if end > position: break
+
+                record: bytes = bytes(data)
+                if any(pointer not in selected for pointer in self.records[xref][3]):
+                    record = self.remove_dangling_pointers(record, encoding, selected)
+                if not record.endswith((b'\n', b'\r')): record += self.newline
+                output.write(record)
+
+                data = bytearray()
+                i += 1
+
+        if not header_written: output.write(self.get_header('utf-8', selected))
+        output.write(b"0 TRLR" + self.newline)
+        return len(ranges)
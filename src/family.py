@@ -0,0 +1,57 @@
+# This file is used to represent the families (FAM records) of a .GED file.
+# A family is a couple (husband and/or wife) and the children they had together.
+
+from item import Item
+
+
+class Family:
+    """
+    Represent a family.
+    """
+
+    reference: str = None           # The family reference, for example @F12@
+
+    husband_reference: str = None
+    wife_reference: str = None
+    children_references: 'list[str]' = []
+
+    # husband, wife and children are linked by the GEDData parser after the creation of the Family
+    husband: 'Individual' = None
+    wife: 'Individual' = None
+    children: 'list[Individual]' = []
+
+
+
+
+    def __init__(self, item: Item) -> None:
+        """
+        Generate this family with the information contained in the given item.
+        The item must have the 'FAM' identifier.
+        """
+        assert item.identifier == 'FAM', "The item must have the 'FAM' identifier."
+
+        self.reference = item.reference
+
+        # Only keep the reference strings: the individuals are linked later
+        husband_item: Item = item.get_child('HUSB')
+        if husband_item: self.husband_reference = husband_item.value
+
+        wife_item: Item = item.get_child('WIFE')
+        if wife_item: self.wife_reference = wife_item.value
+
+        self.children_references = [child.value for child in item.get_children('CHIL')]
+        self.children = []
+
+
+
+    def get_parents(self) -> 'list[Individual]':
+        """Return the husband and the wife of this family, if known."""
+        return [parent for parent in (self.husband, self.wife) if parent is not None]
+
+
+
+    def get_other_spouse(self, individual: 'Individual') -> 'Individual':
+        """Return the spouse of the given individual in this family, or None."""
+        if individual is self.husband: return self.wife
+        if individual is self.wife: return self.husband
+        return None
@@ -0,0 +1,224 @@
+# This file is used to search the free text of the notes and sources of a .GED file.
+
+import os
+import re
+import json
+import phonetic
+
+
+class TextIndex:
+    """Inverted index of the notes (NOTE records and notes of the records) and sources (SOUR
+    records and citations) of a .GED file, with their CONC/CONT continuations joined. The other
+    fields of the individuals and families (their titles of nobility for example) are not indexed.
+
+    The text of each record is indexed by term: the postings of a term are the numbers of the
+    records whose text contains it, with the positions of the term in the text (to search phrases). Each record is linked to the individuals it is about: an
+    individual to itself, a family to its members, and a note or a source to the individuals and
+    families pointing to it, directly or through other notes and sources.
+
+    The index can be saved next to the .GED file (see save() and load()), so that the next
+    searches don't need to load the .GED file.
+    """
+
+    VERSION: int = 3                    # Version of the saved indexes
+    TEXT_TAGS: 'list[str]' = ["NOTE", "SOUR", "TEXT", "TITL", "AUTH", "PUBL", "PAGE"]   # Tags whose value is indexed
+    LINK_TAGS: 'list[str]' = ["NOTE", "SOUR"]   # Tags of the pointers followed to link the records to the individuals
+
+    records: 'list[str]'                # References of the records with some text
+    texts: 'list[str]'                  # Text of each record
+    individuals: 'list[list[str]]'      # References of the individuals linked to each record
+    postings: dict                      # Term -> [record number, positions of the term in its text] of the records containing it, by increasing number
+    names: dict                         # Reference of each linked individual -> name
+
+
+
+
+    @staticmethod
+    def get_terms(text: str) -> 'list[str]':
+        """Return the terms of a text: its words in upper case, without accents nor punctuation."""
+        return phonetic.normalize(text).split()
+
+
+
+    @staticmethod
+    def get_index_path(filepath: str) -> str:
+        """Return the path of the index saved for the given .GED file."""
+        return filepath + ".idx"
+
+
+
+    @staticmethod
+    def get_signature(filepath: str) -> list:
+        """Return the size and modification time of the file, to detect that a saved index is outdated."""
+        stat: os.stat_result = os.stat(filepath)
+        return [stat.st_size, stat.st_mtime_ns]
+
+
+
+
+    def __init__(self, ged_data = None) -> None:
+        self.records = []
+        self.texts = []
+        self.individuals = []
+        self.postings = {}
+        self.names = {}
+        if ged_data is not None: self.build(ged_data)
+
+
+
+    def build(self, ged_data) -> None:
+        """Index the text of every individual, family, note and source record of the GEDData."""
+        tags: dict = {}                     # Record reference -> tag
+        referrers: dict = {}                # Record reference -> references of the records pointing to it
+        texts: dict = {}
+
+        for tag in ("INDI", "FAM", "NOTE", "SOUR"):
+            for record in ged_data.get_items(tag):
+                if record.reference is None: continue
+                tags[record.reference] = tag
+
+                parts: list[str] = []
+                pointers: list[str] = []
+                self.collect(record, parts, pointers)
+                if parts: texts[record.reference] = '\n'.join(parts)
+                for pointer in pointers: referrers.setdefault(pointer, []).append(record.reference)
+
+        for reference, text in texts.items():
+            number: int = len(self.records)
+            self.records.append(reference)
+            self.texts.append(text)
+            self.individuals.append(self.get_linked_individuals(ged_data, reference, tags, referrers))
+
+            positions: dict = {}            # Term -> its positions in the text
+            for position, term in enumerate(self.get_terms(text)):
+                positions.setdefault(term, []).append(position)
+            for term, term_positions in positions.items():
+                self.postings.setdefault(term, []).append([number, term_positions])
+
+        for indi in ged_data.individuals:
+            self.names[indi.reference] = indi.get_cleared_raw_name()
+        linked: set = {reference for references in self.individuals for reference in references}
+        self.names = {reference: name for reference, name in self.names.items() if reference in linked}
+
+
+
+    def collect(self, record, parts: 'list[str]', pointers: 'list[str]') -> None:
+        """Add the texts of the record and of its items to parts, in the order of the file, and its
+        pointers to notes and sources to pointers.
+
+        In the individuals and families, only the notes and the source citations are indexed: a TITL
+        there is a title of nobility, not the title of a source."""
+        items: list = [(record, record.identifier in self.LINK_TAGS)]
+        while items:
+            item, quoted = items.pop()
+            quoted = quoted or item.identifier in self.LINK_TAGS
+            if item.is_pointer():
+                if item.identifier in self.LINK_TAGS: pointers.append(item.value)
+            elif quoted and item.identifier in self.TEXT_TAGS:
+                text: str = item.get_text()
+                if text.strip(): parts.append(text)
+
+            # The continuations are already part of the text
+            items += [(child, quoted) for child in reversed(item.children) if child.identifier not in ('CONC', 'CONT')]
+
+
+
+    @staticmethod
+    def get_linked_individuals(ged_data, reference: str, tags: dict, referrers: dict) -> 'list[str]':
+        """Return the references of the individuals the record is about."""
+        individuals: dict = {}
+        visited: set = {reference}
+        pending: list[str] = [reference]
+
+        while pending:
+            current: str = pending.pop()
+            if tags.get(current) == "INDI": individuals[current] = None
+            elif tags.get(current) == "FAM":
+                family = ged_data.get_family(current)
+                for member in [family.husband_reference, family.wife_reference] + family.children_references:
+                    if member is not None: individuals[member] = None
+            else:
+                # Notes and sources: follow the records pointing to them
+                for referrer in referrers.get(current, []):
+                    if referrer not in visited:
+                        visited.add(referrer)
+                        pending.append(referrer)
+
+        return [indi for indi in individuals if tags.get(indi) == "INDI"]
+
+
+
+
+    def search(self, query: str) -> 'list[int]':
+        """Return the numbers of the records containing every word of the query, in the order of the file.
+
+        The parts of the query between double quotes are phrases: their words must follow each other.
+        """
+        terms: list[str] = self.get_terms(query)
+        if not terms: return []
+
+        # Term -> {record number: positions}. The postings are intersected starting from the shortest one
+        term_postings: dict = {term: dict(self.postings.get(term, [])) for term in set(terms)}
+        postings: list[dict] = sorted(term_postings.values(), key=len)
+        numbers: list[int] = [number for number in postings[0] if all(number in other for other in postings[1:])]
+
+        for phrase in re.findall(r'"([^"]*)"', query):
+            phrase_terms: list[str] = self.get_terms(phrase)
+            if len(phrase_terms) > 1:
+                numbers = [number for number in numbers if self.contains_phrase(term_postings, phrase_terms, number)]
+
+        return numbers
+
+
+
+    @staticmethod
+    def contains_phrase(term_postings: dict, phrase_terms: 'list[str]', number: int) -> bool:
+        """Return True if the terms of the phrase follow each other in the text of the record, given
+        the positions of each term in the records (see search())."""
+        following: list[set] = [set(term_postings[term][number]) for term in phrase_terms[1:]]
+        return any(all(start + offset in positions for offset, positions in enumerate(following, 1))
+                   for start in term_postings[phrase_terms[0]][number])
+
+
+
+    def find_individuals(self, query: str) -> dict:
+        """Return the references of the individuals linked to the records matching the query (see search()),
+        with the references of these records."""
+        individuals: dict = {}
+        for number in self.search(query):
+            for indi in self.individuals[number]:
+                individuals.setdefault(indi, []).append(self.records[number])
+        return individuals
+
+
+
+
+    def save(self, path: str, filepath: str) -> None:
+        """Save the index of the .GED file filepath in path (as JSON)."""
+        data: dict = {
+            "version": self.VERSION, "source": self.get_signature(filepath),
+            "records": self.records, "texts": self.texts, "individuals": self.individuals,
+            "postings": self.postings, "names": self.names,
+        }
+        with open(path, 'w', encoding='utf-8') as file: json.dump(data, file, ensure_ascii=False)
+
+
+
+    @staticmethod
+    def load(path: str, filepath: str) -> 'TextIndex':
+        """Return the index saved in path, or None if there is none, or if it is not the index of the
+        current version of the .GED file filepath."""
+        try:
+            with open(path, encoding='utf-8') as file: data: dict = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        if data.get("version") != TextIndex.VERSION or data.get("source") != TextIndex.get_signature(filepath): return None
+
+        index: TextIndex = TextIndex()
+        index.records = data["records"]
+        index.texts = data["texts"]
+        index.individuals = data["individuals"]
+        index.postings = data["postings"]
+        index.names = data["names"]
+        return index
@@ -1,128 +1,192 @@
 import re
+import threading
+from types import MappingProxyType
+import gedreader
 from item import Item
 from individual import Individual
+from family import Family
+
+# The indexes (name_index, places, ancestry, graph_arrays, subtree, fulltext) are imported by their
+# get_*() method, so only the modules used by the running mode are loaded.
+
+
+class LoadCancelled(Exception):
+    """Raised by GEDData.parse() when the loading is cancelled. The GEDData must not be used afterwards."""
+    pass
+
+
+
+class AmbiguousIndividualError(Exception):
+    """Raised by find_individual() when several individuals match and the user cannot be asked to choose."""
+
+    individuals: 'list[Individual]'     # The matching individuals
+
+    def __init__(self, search: str, individuals: 'list[Individual]') -> None:
+        super().__init__(f"{len(individuals)} individuals match '{search}'.")
+        self.individuals = individuals
 
 class GEDData:
     """Represent all the informations contained in a .GED file.
 
-    The parsing of the .GED file is done in 3 steps:
-    - Divide the file into items (Families, Individuals, etc.)
+    The parsing of the .GED file is done in these steps:
+    - Divide the file into items (Families, Individuals, etc.). The file is split as bytes,
+      and the values are only decoded when read, using the encoding declared by the file.
     - From the list of items, create a list of Individual objects.
-    - Link the individuals with their parents and children.
+    - Link the individuals with their families, then with their parents and children.
+    - Order the parent/child graph, detect its cycles and number the generations.
 
     Creating on-the-fly the Individual objects was not possible, as it was causing
     problem linking the individuals with their parents and children. We need to have a list
     of every Individuals in the form of objects.
+
+    Every container is created per instance, so multiple GEDData objects can coexist in
+    the same process. Once loaded, a GEDData can be frozen (see freeze()) to be shared
+    between threads: its containers are then read-only and any attribute assignment fails.
     """
 
-    filepath: str = ''                      # File path
-    individuals: 'list[Individual]' = []    # List of every individuals present in the .GED file
+    # Columns of to_columns(): name, NumPy type ('U' is a string as long as the longest reference)
+    COLUMNS: 'list[tuple[str, str]]' = [
+        ("id", "i4"), ("xref", "U"), ("sex", "i1"),
+        ("birth_min", "f4"), ("birth_max", "f4"), ("death_min", "f4"), ("death_max", "f4"),
+        ("father", "i4"), ("mother", "i4"), ("families", "i2"),
+        ("birth_place", "i4"), ("death_place", "i4"),
+    ]
+    SEX_CODES: dict = {"M": 1, "F": 2}      # Codes of the sex column (0 if unknown)
 
-    _items: 'list[Item]' = []               # GEDData items
-    _item_references = {}                   # Reference dictionary for items
-    _individual_references = {}             # Reference dictionary for Individual objects
+    filepath: str                           # File path
+    version: int                            # Incremented each time a file is parsed
+    individuals: 'list[Individual]'         # List of every individuals present in the .GED file
+    families: 'list[Family]'                # List of every families present in the .GED file
 
+    topological_order: 'list[Individual]'   # Individuals ordered so that parents come before their children
+    cycles: 'list[list[str]]'               # References of the individuals involved in each parent/child cycle
+    component_sizes: 'list[int]'            # Number of individuals of each connected component, the largest first
 
+    _items: 'list[Item]'                    # GEDData items
+    _item_references: dict                  # Reference dictionary for items
+    _individual_references: dict            # Reference dictionary for Individual objects
+    _family_references: dict                # Reference dictionary for Family objects
+    _places: dict                           # Place strings, so individuals born at the same place share the same str
 
+    _indexes: dict                          # Indexes built on demand, see get_index()
+    _indexes_lock: threading.Lock
 
-    @staticmethod
-    def divide_into_sub_blocks(block: str):
-        """Take given block and divide it into a hierarchy in the
-        form of a dictionary.
-        """
-        block_lvl: int = int(block[0])
-        sub_blocks = {}
-        first_line = block.split('\n')[0]
-        sub_block: str = ""
+    _frozen: bool
 
-        for line in block.split('\n')[1:]:
 
-            # Skips empty lines
-            if line == '': continue
 
-            line_lvl: int = int(line.split(' ')[0])
 
-            if line_lvl > block_lvl:
-                sub_block += line + '\n'
+    def __init__(self) -> None:
+        self._frozen = False
+        self.version = 0
+        self._indexes_lock = threading.Lock()
+        self.clear()
 
-            else:
-                sub_blocks[first_line] = sub_block
-                sub_block = ""
-                first_line = line
 
-        sub_blocks[first_line] = sub_block
 
-        for key in sub_blocks:
-            if not sub_blocks[key] == '':
-                sub_blocks[key] = GEDData.divide_into_sub_blocks(sub_blocks[key])
+    def clear(self) -> None:
+        """Empty the containers and the indexes, so that another file can be parsed."""
+        self.filepath = ''
+        self.individuals = []
+        self.families = []
+        self.topological_order = []
+        self.cycles = []
+        self.component_sizes = []
+        self._items = []
+        self._item_references = {}
+        self._individual_references = {}
+        self._family_references = {}
+        self._places = {}
+        self._indexes = {}
 
-        return sub_blocks
 
 
-    @staticmethod
-    def hierarchy_to_items(hierarchy) -> 'list[Item]':
-        """
-        Take a generated hierarchy (as a dict, coming from the divide_into_sub_blocks method)
-        and convert it into multiple items.
+    def __setattr__(self, name: str, value) -> None:
+        if getattr(self, '_frozen', False):
+            raise AttributeError(f"Cannot set '{name}': this GEDData is frozen.")
+        super().__setattr__(name, value)
+
 
-        This method works recursively.
+
+    def freeze(self) -> 'GEDData':
+        """Make this GEDData read-only and return it.
+
+        The lists are replaced by tuples and the dictionaries by read-only proxies, so
+        the object can safely be queried from multiple threads without locks.
+        Freezing is definitive: a frozen GEDData cannot parse another file.
+        The indexes (see get_index()) can still be built after freezing.
         """
-        items: list[Item] = []
+        if self._frozen: return self
 
+        self.individuals = tuple(self.individuals)
+        self.families = tuple(self.families)
+        self.topological_order = tuple(self.topological_order)
+        self.cycles = tuple(tuple(cycle) for cycle in self.cycles)
+        self.component_sizes = tuple(self.component_sizes)
+        self._items = tuple(self._items)
+        self._item_references = MappingProxyType(self._item_references)
+        self._individual_references = MappingProxyType(self._individual_references)
+        self._family_references = MappingProxyType(self._family_references)
+        self._places = MappingProxyType(self._places)
+        self._frozen = True
 
-        for key in hierarchy:
-            item: Item = Item()
+        return self
 
-            # Get information about the item from the key
-            item_values: list[str] = key.split(' ')
-            if len(item_values) < 3:
-                item_values += [''] * (3 - len(item_values))
 
-            item.level = int(item_values[0])
 
-            if item_values[1][0] == item_values[1][-1] == '@': # If the first information is a reference, this item wont have a value
-                item.reference = item_values[1]
-                item.identifier = item_values[2]
+    @property
+    def is_frozen(self) -> bool:
+        return self._frozen
 
-            else:                                              # Else, the item has an identifier and a value
-                item.identifier = item_values[1]
-                item.value = ' '.join(item_values[2:])
 
-            # Get the children of the item, if any (children are in the hierarchy[key] dict)
-            if hierarchy[key] != '':
-                item.children = GEDData.hierarchy_to_items(hierarchy[key])
 
-            items.append(item)
 
-        return items
+    @staticmethod
+    def iter_records(filepath: str, progress: 'gedreader.ReadProgress' = None):
+        """Read the .GED file (plain, compressed, or '-' for the standard input) and yield each
+        level 0 record as an Item, with its children.
+
+        The file is read by chunks, so it is never loaded as a whole: only the record being
+        read is kept in memory. References between records are not linked. See gedreader.
+        """
+        return gedreader.iter_records(filepath, progress)
+
 
 
 
     @staticmethod
-    def print_individuals_list(individuals_list: 'list[Individual]') -> None:
-        """Print a formatted list of individuals to the terminal"""
+    def print_individuals_list(individuals_list: 'list[Individual]', sort: bool = True, metrics: 'SubtreeMetrics' = None) -> None:
+        """Print a formatted list of individuals to the terminal.
+        If metrics is given, the size of the tree of descendants of each individual is printed too.
+        """
         # Sort the list of individuals by reference id (reference = @I13@, reference id = 13)
         if len(individuals_list) == 0: return
-        individuals_list.sort(key=lambda x: int(x.id))
+        if sort: individuals_list = sorted(individuals_list, key=lambda x: int(x.id))
 
-        print("%-10s %-50s %-40s %-40s" % ("reference", "name", "birth date", "death date"))
+        header: str = "%-10s %-50s %-40s %-40s" % ("reference", "name", "birth date", "death date")
+        if metrics is not None: header += " %-12s %-12s %-6s" % ("descendants", "living lines", "depth")
+        print(header)
         print()
         
         for individual in individuals_list:
             birth_str: str = individual.birth_date if individual.birth_date is not None else ''
             death_str: str = individual.death_date if individual.death_date is not None else ''
 
-            print("%-10s %-50s %-40s %-40s" % (individual.id, individual.get_cleared_raw_name(), birth_str, death_str))
+            line: str = "%-10s %-50s %-40s %-40s" % (individual.id, individual.get_cleared_raw_name(), birth_str, death_str)
+            if metrics is not None:
+                depth: int = metrics.get_depth(individual)
+                line += " %-12d %-12d %-6s" % (metrics.count_descendants(individual), metrics.count_living_lines(individual), depth if depth is not None else '-')
+            print(line)
         
 
 
 
 
-    def generate_items(self, hierarchy) -> None:
-        """Take the hierarchy and generate the items."""
+    def generate_items(self, records: 'list[Item]') -> None:
+        """Take the level 0 records and reference them."""
 
         # Generate the list of items
-        self._items = GEDData.hierarchy_to_items(hierarchy)
+        self._items = records
 
         # Reference the items
         for item in self._items:
@@ -139,65 +203,275 @@ class GEDData:
 
 
     def generate_individuals(self) -> None:
-        """Generate the individuals from the list of items."""
+        """Generate the individuals and the families from the list of items, then link them."""
 
         for item in self._items:
             if item.identifier == 'INDI':
                 indi: Individual = Individual(item)                     # Create the individual
                 self._individual_references[f"@I{indi.id}@"] = indi     # Reference this individual in the _individual_references dict
                 self.individuals.append(indi)                           # Add this individual to the list of individuals
-        
 
-        # For each individual of the list, link the parents and children
-        for indi in self.individuals:
-            if indi.father_reference:
-                indi.father = self._individual_references[indi.father_reference]
-            if indi.mother_reference:
-                indi.mother = self._individual_references[indi.mother_reference]
+                # Intern the places: the same place is often repeated in thousands of individuals
+                if indi.birth_place: indi.birth_place = self._places.setdefault(indi.birth_place, indi.birth_place)
+                if indi.death_place: indi.death_place = self._places.setdefault(indi.death_place, indi.death_place)
+
+            elif item.identifier == 'FAM':
+                family: Family = Family(item)                           # Create the family
+                self._family_references[family.reference] = family      # Reference this family in the _family_references dict
+                self.families.append(family)                            # Add this family to the list of families
 
-            indi.children = []
-            for child_reference in indi.children_references:
-                indi.children.append(self._individual_references[child_reference])
+
+        # For each family of the list, link the husband, the wife and the children
+        for family in self.families:
+            family.husband = self._individual_references.get(family.husband_reference)
+            family.wife = self._individual_references.get(family.wife_reference)
+            family.children = [self._individual_references[ref] for ref in family.children_references if ref in self._individual_references]
+
+        # For each individual of the list, link the families, then the parents and children
+        for indi in self.individuals:
+            indi.link_families(
+                [self._family_references[ref] for ref in indi.child_family_references if ref in self._family_references],
+                [self._family_references[ref] for ref in indi.spouse_family_references if ref in self._family_references]
+            )
 
 
 
 
     
 
-    def parse(self, filepath: str) -> None:
+    def get_parent_child_graph(self) -> 'tuple[dict, dict]':
+        """Return the parent/child graph built from the families, as 2 dictionaries:
+        - individual -> list of its parents;
+        - individual -> list of its children.
+
+        Every individual is a key of both dictionaries.
+        """
+        parents: dict = {indi: [] for indi in self.individuals}
+        children: dict = {indi: [] for indi in self.individuals}
+
+        for family in self.families:
+            for parent in family.get_parents():
+                for child in family.children:
+                    if parent in parents[child]: continue
+                    parents[child].append(parent)
+                    children[parent].append(child)
+
+        return parents, children
+
+
+
+
+    def generate_components(self) -> None:
+        """Number the connected components of the individuals: the groups of individuals linked,
+        directly or not, by families.
+
+        The members of each family (husband, wife and children) are joined with a union-find,
+        with union by size and path halving, so the pass is almost linear in the number of
+        family links. The components are numbered by decreasing size: component 0 is the largest.
+        """
+        # While joining, the component of each individual is its position
+        for position, indi in enumerate(self.individuals): indi.component = position
+        parents: list[int] = list(range(len(self.individuals)))
+        sizes: list[int] = [1] * len(self.individuals)
+
+        def find(position: int) -> int:
+            while parents[position] != position:
+                parents[position] = parents[parents[position]]
+                position = parents[position]
+            return position
+
+        for family in self.families:
+            members: list[Individual] = [member for member in [family.husband, family.wife] + family.children if member is not None]
+            if not members: continue
+
+            root: int = find(members[0].component)
+            for member in members[1:]:
+                other: int = find(member.component)
+                if other == root: continue
+                if sizes[other] > sizes[root]: root, other = other, root
+                parents[other] = root
+                sizes[root] += sizes[other]
+
+        # Number the components by decreasing size (the sort is stable: equal sizes stay in the order of the file)
+        roots: list[int] = [find(position) for position in range(len(self.individuals))]
+        order: list[int] = sorted(dict.fromkeys(roots), key=lambda root: -sizes[root])
+        numbers: dict = {root: number for number, root in enumerate(order)}
+        for indi, root in zip(self.individuals, roots): indi.component = numbers[root]
+        self.component_sizes = [sizes[root] for root in order]
+
+
+
+    def generate_generations(self) -> None:
+        """Order the parent/child graph and set the generation of every individual.
+
+        The graph is ordered with Kahn's algorithm: founders (individuals without parents) are at
+        generation 0, and every other individual is one generation after its youngest parent.
+        The individuals that can't be ordered are part of a cycle, or descend from one. The cycles
+        themselves are found with Tarjan's algorithm and stored in self.cycles, and the generation
+        of these individuals is set to None.
+
+        Both passes are linear in the number of individuals and parent/child links.
+        """
+        parents, children = self.get_parent_child_graph()
+
+        nb_remaining_parents: dict = {indi: len(parents[indi]) for indi in self.individuals}
+        queue: list[Individual] = [indi for indi in self.individuals if nb_remaining_parents[indi] == 0]
+        for indi in self.individuals: indi.generation = 0
+
+        # Kahn's algorithm: an individual is ordered once all of its parents are
+        self.topological_order = []
+        i: int = 0
+        while i < len(queue):
+            indi: Individual = queue[i]
+            i += 1
+            self.topological_order.append(indi)
+
+            for child in children[indi]:
+                child.generation = max(child.generation, indi.generation + 1)
+                nb_remaining_parents[child] -= 1
+                if nb_remaining_parents[child] == 0: queue.append(child)
+
+        # Every individual not ordered is in a cycle, or descends from one
+        unordered: list[Individual] = [indi for indi in self.individuals if nb_remaining_parents[indi] > 0]
+        for indi in unordered: indi.generation = None
+
+        self.cycles = [[indi.reference for indi in component] for component in GEDData.strongly_connected_components(unordered, children)
+                       if len(component) > 1 or component[0] in children[component[0]]]
+
+
+
+
+    @staticmethod
+    def strongly_connected_components(nodes: list, successors: dict) -> 'list[list]':
+        """Return the strongly connected components of the graph restricted to nodes, using an
+        iterative version of Tarjan's algorithm (so deep graphs don't hit the recursion limit).
+        """
+        in_graph: set = set(nodes)
+        index: dict = {}
+        lowlink: dict = {}
+        on_stack: set = set()
+        stack: list = []
+        components: list = []
+
+        for start in nodes:
+            if start in index: continue
+
+            # Each frame is a node and an iterator over its successors
+            index[start] = lowlink[start] = len(index)
+            stack.append(start)
+            on_stack.add(start)
+            frames: list = [(start, iter(successors[start]))]
+
+            while frames:
+                node, successors_iterator = frames[-1]
+                advanced: bool = False
+
+                for successor in successors_iterator:
+                    if successor not in in_graph: continue
+                    if successor not in index:
+                        index[successor] = lowlink[successor] = len(index)
+                        stack.append(successor)
+                        on_stack.add(successor)
+                        frames.append((successor, iter(successors[successor])))
+                        advanced = True
+                        break
+                    elif successor in on_stack:
+                        lowlink[node] = min(lowlink[node], index[successor])
+
+                if advanced: continue
+
+                # Every successor has been visited: close the node
+                frames.pop()
+                if frames:
+                    parent = frames[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+                if lowlink[node] == index[node]:
+                    component: list = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member is node: break
+                    components.append(component)
+
+        return components
+
+
+
+
+
+    def parse(self, filepath: str, progress = None, cancel: threading.Event = None) -> None:
         """
-        Parse the .GED file.
+        Parse the .GED file. The content of a file parsed before, and its indexes, are replaced.
 
-        For each block of the .GED file, a Item object is created and added to the items list.
-        Each item is a Item object.
+        For each record (level 0 block) of the .GED file, a Item object is created and added to the items list.
+        The encoding is taken from the byte order mark or the '1 CHAR' line of the header
+        (UTF-8, UTF-16, ANSEL, ANSI, etc.).
         
         Args:
-            filepath (str): The path of the .GED file.
+            filepath (str): The path of the .GED file. It can be compressed (gzip, xz, bzip2 or zip),
+                            or '-' to read the standard input.
+            progress: If given, called as progress(bytes_read, total_bytes, records) each time a chunk
+                      of the file has been parsed, and once at the end of the reading. total_bytes is
+                      None if the size of the input is unknown (see gedreader.ReadProgress).
+            cancel (threading.Event): If given, the parsing stops as soon as it is set.
 
         Raise:
             FileNotFoundError: If the filepath is not valid.
             Exception: If the file does not look like a .GED file.
             Warning: If the file does not look valid, but parsing is not stopped.
+            LoadCancelled: If cancel is set before the end of the parsing.
         """
 
+        if self._frozen:
+            raise Exception("Cannot parse a file into a frozen GEDData.")
+
+        # The individuals and the indexes of a file parsed before are replaced
+        self.clear()
         self.filepath = filepath
+        self.version += 1
+
+        # Read the records
+        records: list[Item] = []
+        read_progress: gedreader.ReadProgress = gedreader.ReadProgress()
+        reported_bytes: int = 0
+        record_iterator = GEDData.iter_records(self.filepath, read_progress)
+        try:
+            for record in record_iterator:
+                records.append(record)
+                if cancel is not None and cancel.is_set(): raise LoadCancelled(f"The loading of {self.filepath} was cancelled.")
+
+                if progress is not None and read_progress.bytes_read != reported_bytes:
+                    reported_bytes = read_progress.bytes_read
+                    progress(reported_bytes, read_progress.total_bytes, len(records))
+        except ValueError:
+            raise Exception(f"The file {self.filepath} is not a valid .GED file.")
+        finally:
+            # Stops the reading thread if the parsing was interrupted
+            record_iterator.close()
 
-        # Open the file
-        with open(self.filepath, 'r', encoding = 'utf-8-sig') as f:
-            file: str = f.read()
+        if progress is not None: progress(read_progress.bytes_read, read_progress.total_bytes, len(records))
 
         # Check for the validity of the file
-        if not file.startswith('0 HEAD'):
+        if not records or records[0].identifier != 'HEAD':
             raise Exception(f"The file {self.filepath} is not a valid .GED file.")
 
 
         # Generate the items
-        hierarchy: dict = GEDData.divide_into_sub_blocks(file)   
-        self.generate_items(hierarchy)
+        self.generate_items(records)
 
         # Generate the individuals
+        if cancel is not None and cancel.is_set(): raise LoadCancelled(f"The loading of {self.filepath} was cancelled.")
         self.generate_individuals()
 
+        # Group the individuals linked by families
+        self.generate_components()
+
+        # Check the parent/child graph and number the generations
+        if cancel is not None and cancel.is_set(): raise LoadCancelled(f"The loading of {self.filepath} was cancelled.")
+        self.generate_generations()
+
 
 
 
@@ -212,38 +486,172 @@ class GEDData:
 
     def get_individual(self, indi_id: int) -> Individual:
         """Return the individual with the given id"""
-        for indi in self.individuals:
-            if indi.id == indi_id: return indi
-        return None
+        return self._individual_references.get(f"@I{indi_id}@")
+
+
+
+
+    def are_connected(self, first: Individual, second: Individual) -> bool:
+        """Return True if the two individuals are linked, directly or not, by families (see generate_components())."""
+        return first.component == second.component
+
+
+
+    def get_component(self, number: int) -> 'list[Individual]':
+        """Return the individuals of the given connected component (0 is the largest), in the order of the file."""
+        members: dict = self.get_index("components", GEDData.build_component_index)
+        return members.get(number, [])
+
+
+
+    @staticmethod
+    def build_component_index(ged_data: 'GEDData') -> dict:
+        members: dict = {}
+        for indi in ged_data.individuals: members.setdefault(indi.component, []).append(indi)
+        return members
+
+
+
+    def get_index(self, name: str, builder):
+        """Return the index with the given name, building it with builder(self) the first time.
+
+        Indexes are only built when a query needs them. They are shared by every thread,
+        and built only once even if multiple threads ask for them at the same time.
+        """
+        index = self._indexes.get(name)
+        if index is not None: return index
+
+        with self._indexes_lock:
+            if name not in self._indexes:
+                self._indexes[name] = builder(self)
+            return self._indexes[name]
+
+
+
+
+    def get_family(self, reference: str) -> Family:
+        """Return the family with the given reference (for example @F12@)"""
+        return self._family_references.get(reference)
+
+
+
+    @staticmethod
+    def name_matches(indi: Individual, search: str) -> bool:
+        """Return True if the name of the individual matches the 'search' regex."""
+
+        # Check some variations of the name
+        return (re.search(search, indi._raw_name) is not None
+                or re.search(search, f"{indi.first_name}  {indi.last_name}") is not None
+                or re.search(search, indi.get_cleared_raw_name()) is not None)
 
 
 
     def find_individuals(self, search: str) -> 'list[Individual]':
         """Method to find every individuals that match the 'search' regex."""
+        return [indi for indi in self.individuals if GEDData.name_matches(indi, search)]
 
-        returned_individuals: list = []
 
-        for indi in self.individuals:
-            # Check some variations of the name
-            if re.search(search, indi._raw_name):
-                returned_individuals.append(indi)
-            elif re.search(search, f"{indi.first_name}  {indi.last_name}"):
-                returned_individuals.append(indi)
-            elif re.search(search, indi.get_cleared_raw_name()):
-                returned_individuals.append(indi)
 
-        return returned_individuals
 
+    def get_name_index(self) -> 'NameIndex':
+        """Return the index used for approximate name searches."""
+        from name_index import NameIndex
+        return self.get_index("name", lambda ged_data: NameIndex(ged_data.individuals))
+
+
+
+    def get_place_trie(self) -> 'PlaceTrie':
+        """Return the hierarchy of the birth and death places."""
+        from places import PlaceTrie
+        return self.get_index("places", lambda ged_data: PlaceTrie(ged_data.individuals))
+
+
+
+    def get_ancestor_index(self) -> 'AncestorIndex':
+        """Return the index of the ancestors of every individual."""
+        from ancestry import AncestorIndex
+        return self.get_index("ancestors", AncestorIndex)
+
+
+
+    def get_graph_arrays(self) -> 'GraphArrays':
+        """Return the parent/child graph as NumPy arrays (NumPy must be installed)."""
+        from graph_arrays import GraphArrays
+        return self.get_index("arrays", GraphArrays)
+
+
+
+    def get_subtree_metrics(self) -> 'SubtreeMetrics':
+        """Return the number of descendants, living lines and depth of the tree of descendants of every individual."""
+        from subtree import SubtreeMetrics
+        return self.get_index("subtree", SubtreeMetrics)
+
+
+
+    def get_text_index(self) -> 'TextIndex':
+        """Return the full-text index of the notes and sources."""
+        from fulltext import TextIndex
+        return self.get_index("text", TextIndex)
+
+
+
+
+    def to_columns(self) -> dict:
+        """Return the individuals as NumPy arrays (NumPy must be installed), for vectorized analyses.
+
+        The dict has 2 arrays:
+        - "individuals": a structured array with a row per individual, in the order of self.individuals
+          (its dense id, as in GraphArrays), and the columns of COLUMNS. The years are the bounds
+          of Date.get_year_bounds() (NaN if unknown), the parents are dense ids and the places
+          are positions in "places" (-1 if unknown);
+        - "places": the distinct birth and death places.
+        """
+        from graph_arrays import import_numpy
+        np = import_numpy()
+
+        ids: dict = {indi: i for i, indi in enumerate(self.individuals)}
+        places: dict = {}               # Place -> place id
+        nan: float = float('nan')
+
+        # A single pass over the individuals
+        rows: list[tuple] = []
+        for i, indi in enumerate(self.individuals):
+            birth: tuple = indi.birth_date.get_year_bounds() if indi.birth_date else (None, None)
+            death: tuple = indi.death_date.get_year_bounds() if indi.death_date else (None, None)
+            rows.append((
+                i, indi.reference, self.SEX_CODES.get(indi.sex, 0),
+                *[nan if year is None else year for year in birth + death],
+                ids.get(indi.father, -1), ids.get(indi.mother, -1),
+                len(indi.spouse_families),
+                places.setdefault(indi.birth_place, len(places)) if indi.birth_place else -1,
+                places.setdefault(indi.death_place, len(places)) if indi.death_place else -1,
+            ))
+
+        xref_length: int = max((len(indi.reference) for indi in self.individuals), default=1)
+        dtype: list[tuple] = [(name, f'U{xref_length}' if kind == 'U' else kind) for name, kind in self.COLUMNS]
+        return {
+            "individuals": np.array(rows, dtype=dtype),
+            "places": np.array(list(places), dtype=str),
+        }
+
+
+
+    def find_individuals_fuzzy(self, search: str, k: int = 10) -> 'list[Individual]':
+        """Method to find the k individuals whose name is the closest to 'search', the closest first.
+
+        Spelling variations are accepted (Willem/William, Smyth/Smith). See NameIndex.
+        """
+        return [indi for _, indi in self.get_name_index().search(search, k)]
 
 
 
-    def find_individual(self, search: str) -> Individual:
+    def find_individual(self, search: str, fuzzy: bool = False, interactive: bool = True) -> Individual:
         """Method to find an individual.
         
         - If search is a number, return the individual with the given id.
-        - If search is a str, look for individuals with this name.
+        - If search is a str, look for individuals with this name (approximately if fuzzy is True).
         If multiple individuals are found, this method will prompt the user to
-        choose between the individuals.
+        choose between the individuals, or raise an AmbiguousIndividualError if interactive is False.
         """
 
         try:
@@ -251,10 +659,13 @@ class GEDData:
             return self.get_individual(search)
         except:
             
-            returned_individuals: list[Individual] = self.find_individuals(search)
+            returned_individuals: list[Individual]
+            if fuzzy: returned_individuals = self.get_name_index().best_matches(search)
+            else: returned_individuals = self.find_individuals(search)
 
             if len(returned_individuals) == 0: return None
             if len(returned_individuals) == 1: return returned_individuals[0]
+            if not interactive: raise AmbiguousIndividualError(search, returned_individuals)
 
             print("Multiple individuals found. Please select one in this list:")
             self.print_individuals_list(returned_individuals)
@@ -0,0 +1,393 @@
+# This file is used to read .GED files as a stream of items.
+#
+# The input can be a plain .GED file, a compressed one (.gz, .xz, .bz2 or a .zip archive)
+# or the standard input ('-'). It is read by chunks of constant size in a background thread,
+# so reading and decompressing overlap with the parsing, and split into lines as bytes: the
+# values are only decoded when they are accessed, using the encoding declared by the file.
+
+import io
+import os
+import re
+import sys
+import queue
+import codecs
+import contextlib
+import threading
+from item import Item
+
+
+# Codec to use for each value of the '1 CHAR' line of the header
+ENCODINGS: dict = {
+    'UTF-8': 'utf-8', 'UTF8': 'utf-8', 'UNICODE': 'utf-16', 'UTF-16': 'utf-16',
+    'ANSEL': 'ansel', 'ANSI': 'cp1252', 'WINDOWS-1252': 'cp1252', 'ISO-8859-1': 'latin-1',
+    'ASCII': 'cp1252', 'IBMPC': 'cp437', 'IBM WINDOWS': 'cp1252', 'MACINTOSH': 'mac_roman',
+}
+
+CHUNK_SIZE: int = 1 << 16       # Size of the chunks read from the input
+PREFETCH_CHUNKS: int = 8        # Maximum number of chunks read in advance by the background thread
+STOP_TIMEOUT: float = 1.0       # Time given to the background thread to stop, in seconds
+
+STDIN_PATH: str = '-'
+
+
+
+
+class ReadProgress:
+    """Progress of the reading of an input, updated while its chunks are read (see iter_input_chunks())."""
+
+    bytes_read: int = 0             # Number of bytes read from the input (decompressed for compressed inputs)
+    total_bytes: int = None         # Size of the input, None if unknown (compressed inputs and standard input)
+
+
+
+
+@contextlib.contextmanager
+def open_input(filepath: str, progress: ReadProgress = None):
+    """Open the input for reading, as a binary stream (to use in a with statement).
+
+    '-' is the standard input. Compressed inputs are recognized by their first bytes (not by
+    their extension) and decompressed on the fly. For a .zip archive, the first .ged file of
+    the archive is read (or the first file if none ends with .ged).
+    If progress is given, its total_bytes is set when the size of the input is known.
+    """
+    is_stdin: bool = filepath == STDIN_PATH
+
+    # The standard input is read through its own reader: a reading thread blocked on it (see
+    # read_chunks()) then can't block the interpreter at exit, which closes sys.stdin
+    raw = open(os.dup(sys.stdin.fileno()), 'rb') if is_stdin else open(filepath, 'rb')
+
+    try:
+        if not hasattr(raw, 'peek'): raw = io.BufferedReader(raw)
+        magic: bytes = raw.peek(6)[:6]
+
+        # The decompression modules are only imported for compressed inputs
+        if magic.startswith(b'\x1f\x8b'):
+            import gzip
+            stream = gzip.GzipFile(fileobj = raw, mode = 'rb')
+        elif magic.startswith(b'\xfd7zXZ\x00'):
+            import lzma
+            stream = lzma.LZMAFile(raw, mode = 'rb')
+        elif magic.startswith(b'BZh'):
+            import bz2
+            stream = bz2.BZ2File(raw, mode = 'rb')
+
+        elif magic.startswith(b'PK\x03\x04'):
+            import zipfile
+            # Zip archives need to be seekable: a piped archive is read in memory
+            if not raw.seekable(): raw = io.BytesIO(raw.read())
+            archive = zipfile.ZipFile(raw)
+            names: list[str] = [name for name in archive.namelist() if not name.endswith('/')]
+            ged_names: list[str] = [name for name in names if name.lower().endswith('.ged')]
+            if not names: raise Exception(f"The archive {filepath} is empty.")
+            stream = archive.open((ged_names or names)[0])
+
+        else:
+            stream = raw
+            if progress is not None and not is_stdin: progress.total_bytes = os.fstat(raw.fileno()).st_size
+
+        # The standard input is left open: a reading thread may still be blocked on it (see read_chunks())
+        if is_stdin: yield stream
+        else:
+            with stream: yield stream
+
+    finally:
+        if not is_stdin: raw.close()
+
+
+
+
+def read_chunks(stream):
+    """Yield the content of the binary stream by chunks of at most CHUNK_SIZE bytes.
+
+    The chunks are read (and decompressed) by a background thread, at most PREFETCH_CHUNKS
+    in advance, so the memory used stays constant. Errors raised while reading are raised
+    again in the calling thread.
+
+    If the chunks are not all consumed, the thread is stopped at its next chunk. A thread blocked
+    reading a pipe (the standard input) is not waited for more than STOP_TIMEOUT: as a daemon, it
+    does not keep the program alive, and it ends without putting anything once its read returns.
+    """
+    chunks: queue.Queue = queue.Queue(maxsize = PREFETCH_CHUNKS)
+    stop: threading.Event = threading.Event()
+
+    def put(element) -> bool:
+        # Wait for room in the queue, unless the reading has been stopped
+        while not stop.is_set():
+            try:
+                chunks.put(element, timeout = 0.1)
+                return True
+            except queue.Full: pass
+        return False
+
+    def read() -> None:
+        try:
+            while True:
+                chunk: bytes = stream.read(CHUNK_SIZE)
+                if not chunk: break
+                if not put(chunk): return
+            put(None)
+        except BaseException as e:
+            put(e)
+
+    reader: threading.Thread = threading.Thread(target = read, daemon = True)
+    reader.start()
+
+    try:
+        while True:
+            chunk = chunks.get()
+            if chunk is None: return
+            if isinstance(chunk, BaseException): raise chunk
+            yield chunk
+    finally:
+        stop.set()
+        reader.join(timeout = STOP_TIMEOUT)
+
+
+
+
+def detect_encoding(header: bytes) -> str:
+    """Return the name of the codec to use for a .GED file, given its first bytes.
+
+    The byte order mark is used if there is one. Otherwise, the encoding is the one declared
+    by the '1 CHAR' line of the header. UTF-8 is used if nothing is declared.
+    """
+    if header.startswith(codecs.BOM_UTF8): return 'utf-8'
+    if header.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)): return 'utf-16'
+    if header.startswith(b'0\x00'): return 'utf-16-le'
+    if header.startswith(b'\x000'): return 'utf-16-be'
+
+    match = re.search(rb'[\r\n]\s*1 CHAR ([^\r\n]*)', header)
+    if match is None: return 'utf-8'
+
+    declared: str = match.group(1).strip().decode('ascii', 'replace').upper()
+    return ENCODINGS.get(declared, 'utf-8')
+
+
+
+
+def convert_chunks(chunks, encoding: str):
+    """Yield the chunks ready to be split into lines.
+
+    UTF-16 content is converted to UTF-8, so that the lines can be split on single bytes.
+    A UTF-8 byte order mark is removed.
+    """
+    if encoding.startswith('utf-16'):
+        decoder = codecs.getincrementaldecoder(encoding)(errors = 'replace')
+        for chunk in chunks:
+            yield decoder.decode(chunk).encode('utf-8')
+        yield decoder.decode(b'', final = True).encode('utf-8')
+        return
+
+    first: bool = True
+    for chunk in chunks:
+        if first and chunk.startswith(codecs.BOM_UTF8): chunk = chunk[len(codecs.BOM_UTF8):]
+        first = False
+        yield chunk
+
+
+
+
+def iter_lines(chunks):
+    """Yield the non-empty lines, without their line terminator, of a sequence of byte chunks.
+    Lines can end with LF, CRLF or CR.
+    """
+    remainder: bytes = b''
+    for chunk in chunks:
+        lines: list[bytes] = (remainder + chunk).replace(b'\r', b'\n').split(b'\n')
+        remainder = lines.pop()
+        for line in lines:
+            if line.strip(): yield line
+
+    if remainder.strip(): yield remainder
+
+
+
+
+def line_to_item(line: bytes, encoding: str = 'utf-8') -> Item:
+    """Create an Item, without children, from a single line of a .GED file.
+
+    The line is split in bytes: the level, reference and identifier are ASCII and decoded
+    right away, but the value is only decoded if it is accessed (see Item.value).
+    """
+    item: Item = Item()
+
+    parts: list[bytes] = line.lstrip().split(b' ', 2)
+    item.level = int(parts[0])
+
+    # If the second part is a reference, the identifier is the third part
+    if len(parts) > 2 and parts[1][:1] == parts[1][-1:] == b'@':
+        item.reference = parts[1].decode('ascii', 'replace')
+        parts = parts[2].split(b' ', 1)
+    else:
+        parts = parts[1:]
+
+    item.identifier = sys.intern(parts[0].decode('ascii', 'replace')) if parts else ''
+    item.set_raw_value(parts[1] if len(parts) > 1 else b'', encoding)
+
+    return item
+
+
+
+
+def iter_input_chunks(filepath: str, progress: ReadProgress = None):
+    """Open the input and yield (encoding, chunk) for each of its chunks, ready to be split into lines.
+
+    The encoding is the one to use to decode the values of the lines (UTF-16 inputs are
+    converted to UTF-8). If progress is given, it is updated as the chunks are yielded.
+    """
+    with open_input(filepath, progress) as stream:
+        chunks = read_chunks(stream)
+        try:
+            first_chunk: bytes = next(chunks, b'')
+            encoding: str = detect_encoding(first_chunk)
+            line_encoding: str = 'utf-8' if encoding.startswith('utf-16') else encoding
+
+            raw_chunks = _prepend(first_chunk, chunks)
+            if progress is not None: raw_chunks = _count_bytes(raw_chunks, progress)
+
+            for chunk in convert_chunks(raw_chunks, encoding):
+                yield line_encoding, chunk
+        finally:
+            chunks.close()
+
+
+
+
+def iter_input_lines(filepath: str, progress: ReadProgress = None):
+    """Open the input and yield (encoding, line) for each of its non-empty lines, as bytes (see iter_input_chunks())."""
+    chunks = iter_input_chunks(filepath, progress)
+    try:
+        encoding, first_chunk = next(chunks, ('utf-8', b''))
+        for line in iter_lines(_prepend(first_chunk, (chunk for _, chunk in chunks))):
+            yield encoding, line
+    finally:
+        chunks.close()
+
+
+
+
+def iter_records(filepath: str, progress: ReadProgress = None):
+    """Read the input and yield each level 0 record as an Item, with its children.
+
+    Only the record being read is kept in memory. References between records are not linked.
+    If progress is given, it is updated as the input is read (see ReadProgress).
+    """
+    lines = iter_input_lines(filepath, progress)
+    try:
+        yield from iter_lines_records(lines)
+    finally:
+        lines.close()
+
+
+
+
+def iter_lines_records(lines):
+    """Yield each level 0 record of the (encoding, line) pairs as an Item, with its children."""
+    stack: list[Item] = []
+
+    for encoding, line in lines:
+        item: Item = line_to_item(line, encoding)
+
+        if item.level == 0:
+            if stack: yield stack[0]
+            stack = [item]
+            continue
+
+        # Find the parent of this item: the last opened item with a lower level
+        while stack and stack[-1].level >= item.level: stack.pop()
+        if stack: stack[-1].add_child(item)
+        stack.append(item)
+
+    if stack: yield stack[0]
+
+
+
+
+def iter_lines_with_offsets(chunks):
+    """Like iter_lines(), but yield (offset, line): the offset of the line in the whole content."""
+    remainder: bytes = b''
+    position: int = 0           # Offset of the remainder
+    for chunk in chunks:
+        lines: list[bytes] = (remainder + chunk).replace(b'\r', b'\n').split(b'\n')
+        remainder = lines.pop()
+        for line in lines:
+            if line.strip(): yield position, line
+            position += len(line) + 1
+
+    if remainder.strip(): yield position, remainder
+
+
+
+
+def iter_numbered_lines(chunks):
+    """Like iter_lines(), but yield (number, line): the number of the line in the content, from 1.
+    A CRLF counts as a single line terminator, even if split between 2 chunks.
+    """
+    remainder: bytes = b''
+    number: int = 1             # Number of the remainder
+    for chunk in chunks:
+        data: bytes = remainder + chunk
+
+        # Keep a final CR with the remainder: it may be followed by a LF in the next chunk
+        held: bytes = b'\r' if data.endswith(b'\r') else b''
+        if held: data = data[:-1]
+
+        lines: list[bytes] = data.replace(b'\r\n', b'\n').replace(b'\r', b'\n').split(b'\n')
+        remainder = lines.pop() + held
+        for line in lines:
+            if line.strip(): yield number, line
+            number += 1
+
+    remainder = remainder.rstrip(b'\r')
+    if remainder.strip(): yield number, remainder
+
+
+
+
+def iter_record_spans(filepath: str):
+    """Read the input and yield (record, start, end) for each level 0 record, with its children.
+
+    start and end are the offsets of the record in the content of iter_input_chunks() (after
+    decompression, and after the conversion of UTF-16 inputs to UTF-8): the bytes between them
+    are the lines of the record, with their line terminators, so they can be copied as they are.
+    """
+    encodings: list[str] = []
+    size: int = 0
+
+    def chunks():
+        nonlocal size
+        for encoding, chunk in iter_input_chunks(filepath):
+            if not encodings: encodings.append(encoding)
+            size += len(chunk)
+            yield chunk
+
+    stack: list[Item] = []
+    start: int = 0
+
+    for offset, line in iter_lines_with_offsets(chunks()):
+        item: Item = line_to_item(line, encodings[0])
+
+        if item.level == 0:
+            if stack: yield stack[0], start, offset
+            stack = [item]
+            start = offset
+            continue
+
+        while stack and stack[-1].level >= item.level: stack.pop()
+        if stack: stack[-1].add_child(item)
+        stack.append(item)
+
+    if stack: yield stack[0], start, size
+
+
+
+
+def _prepend(first, iterator):
+    yield first
+    yield from iterator
+
+
+def _count_bytes(chunks, progress: ReadProgress):
+    for chunk in chunks:
+        progress.bytes_read += len(chunk)
+        yield chunk
@@ -0,0 +1,332 @@
+# This file is used to store the content of a .GED file in a SQLite database, so that large
+# files can be queried without loading every individual in memory.
+
+import re
+import sqlite3
+from item import Item
+from geddata import GEDData, AmbiguousIndividualError
+from individual import Individual
+from name_index import NameIndex
+
+
+class GEDStore:
+    """Represent a SQLite database built from a .GED file.
+
+    The database contains 4 tables:
+    - individuals: one row per INDI record, with the name, sex, birth and death information.
+    - families: one row per FAM record, with the references of the husband and the wife.
+    - events: one row per dated/placed event (BIRT, DEAT, MARR, etc.) of an individual or a family.
+    - edges: one row per parent/child link, coming from the HUSB, WIFE and CHIL lines of the families.
+
+    The individuals returned by this class are Individual objects, so they can be printed and drawn
+    like the ones from a GEDData. They are only linked to their parents and children by load_tree().
+    """
+
+    SCHEMA: str = """
+        CREATE TABLE IF NOT EXISTS individuals (
+            xref TEXT PRIMARY KEY,
+            id INTEGER,
+            raw_name TEXT,
+            cleared_name TEXT,
+            sex TEXT,
+            birth_date TEXT,
+            birth_year INTEGER,
+            birth_place TEXT,
+            death_date TEXT,
+            death_year INTEGER,
+            death_place TEXT
+        );
+        CREATE TABLE IF NOT EXISTS families (
+            xref TEXT PRIMARY KEY,
+            husband_xref TEXT,
+            wife_xref TEXT
+        );
+        CREATE TABLE IF NOT EXISTS events (
+            owner_xref TEXT,
+            tag TEXT,
+            date TEXT,
+            year INTEGER,
+            place TEXT
+        );
+        CREATE TABLE IF NOT EXISTS edges (
+            family_xref TEXT,
+            parent_xref TEXT,
+            child_xref TEXT,
+            role TEXT
+        );
+        CREATE INDEX IF NOT EXISTS individuals_id ON individuals (id);
+        CREATE INDEX IF NOT EXISTS individuals_name ON individuals (cleared_name);
+        CREATE INDEX IF NOT EXISTS individuals_birth_year ON individuals (birth_year);
+        CREATE INDEX IF NOT EXISTS individuals_death_year ON individuals (death_year);
+        CREATE INDEX IF NOT EXISTS events_owner ON events (owner_xref);
+        CREATE INDEX IF NOT EXISTS events_year ON events (year);
+        CREATE INDEX IF NOT EXISTS edges_parent ON edges (parent_xref);
+        CREATE INDEX IF NOT EXISTS edges_child ON edges (child_xref);
+    """
+
+    TABLES: 'list[str]' = ["individuals", "families", "events", "edges"]
+
+    INDIVIDUAL_COLUMNS: str = "id, raw_name, sex, birth_date, birth_place, death_date, death_place"
+
+    BATCH_SIZE: int = 500               # Number of rows inserted, or references looked up, at once
+
+    filepath: str                       # Path of the database
+    version: int = 0                    # Incremented each time a file is imported
+    _connection: sqlite3.Connection
+    _name_index: NameIndex = None
+
+
+
+
+    @staticmethod
+    def get_year(date_str: str) -> int:
+        """Return the first year found in a .GED date string, or None."""
+        if not date_str: return None
+        match = re.search(r'\b(\d{3,4})\b', date_str)
+        return int(match.group(1)) if match else None
+
+
+
+    @staticmethod
+    def _name_matches(pattern: str, raw_name: str) -> bool:
+        """NAME_MATCHES function given to SQLite: check the same variations of the name as GEDData.name_matches()."""
+        return raw_name is not None and GEDData.name_matches(Individual.from_values(0, raw_name), pattern)
+
+
+
+
+    def __init__(self, filepath: str) -> None:
+        self.filepath = filepath
+        self._connection = sqlite3.connect(filepath)
+        self._connection.create_function("NAME_MATCHES", 2, GEDStore._name_matches, deterministic=True)
+        self._connection.executescript(self.SCHEMA)
+
+
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+
+
+    def import_ged_file(self, ged_path: str) -> int:
+        """Stream the given .GED file into the database, replacing its previous content.
+
+        The file is read one record at a time (see GEDData.iter_records), so the whole
+        file is never held in memory. Returns the number of imported individuals.
+        """
+        cursor: sqlite3.Cursor = self._connection.cursor()
+        for table in self.TABLES: cursor.execute(f"DELETE FROM {table}")
+
+        rows: dict = {table: [] for table in self.TABLES}
+        nb_individuals: int = 0
+
+        for record in GEDData.iter_records(ged_path):
+            if record.identifier == 'INDI':
+                self._add_individual_rows(record, rows)
+                nb_individuals += 1
+            elif record.identifier == 'FAM':
+                self._add_family_rows(record, rows)
+
+            # Flush the rows regularly to keep the memory usage bounded
+            if sum(len(r) for r in rows.values()) >= self.BATCH_SIZE:
+                self._flush_rows(cursor, rows)
+
+        self._flush_rows(cursor, rows)
+        self._connection.commit()
+        self.version += 1
+
+        return nb_individuals
+
+
+
+    def _add_individual_rows(self, record: Item, rows: dict) -> None:
+        """Append the rows generated by an INDI record."""
+        raw_name: str = record.get_value('NAME') or ''
+        birth_date = birth_place = death_date = death_place = None
+
+        for event in record.children:
+            date: str = event.get_value('DATE')
+            place: str = event.get_value('PLAC')
+            if date is None and place is None: continue
+
+            rows["events"].append((record.reference, event.identifier, date, self.get_year(date), place))
+
+            if event.identifier == 'BIRT' and birth_date is None and birth_place is None:
+                birth_date, birth_place = date, place
+            elif event.identifier == 'DEAT' and death_date is None and death_place is None:
+                death_date, death_place = date, place
+
+        rows["individuals"].append((
+            record.reference,
+            int(record.reference.replace('@', '')[1:]),
+            raw_name,
+            raw_name.replace('/', '').replace('_', ' '),
+            record.get_value('SEX'),
+            birth_date, self.get_year(birth_date), birth_place,
+            death_date, self.get_year(death_date), death_place
+        ))
+
+
+
+    def _add_family_rows(self, record: Item, rows: dict) -> None:
+        """Append the rows generated by a FAM record."""
+        # Use the raw values, as get_value() would look for the (unlinked) referenced items
+        husband: str = record.get_child('HUSB').value if record.get_child('HUSB') else None
+        wife: str = record.get_child('WIFE').value if record.get_child('WIFE') else None
+
+        rows["families"].append((record.reference, husband, wife))
+
+        for event in record.children:
+            date: str = event.get_value('DATE')
+            place: str = event.get_value('PLAC')
+            if date is None and place is None: continue
+            rows["events"].append((record.reference, event.identifier, date, self.get_year(date), place))
+
+        for child in record.get_children('CHIL'):
+            if husband: rows["edges"].append((record.reference, husband, child.value, 'HUSB'))
+            if wife: rows["edges"].append((record.reference, wife, child.value, 'WIFE'))
+
+
+
+    def _flush_rows(self, cursor: sqlite3.Cursor, rows: dict) -> None:
+        """Insert the pending rows in the database and empty the rows dict."""
+        for table, table_rows in rows.items():
+            if not table_rows: continue
+            placeholders: str = ', '.join(['?'] * len(table_rows[0]))
+            cursor.executemany(f"INSERT OR REPLACE INTO {table} VALUES ({placeholders})", table_rows)
+            table_rows.clear()
+
+
+
+
+    def _individuals_from_rows(self, rows: list) -> 'list[Individual]':
+        return [Individual.from_values(*row) for row in rows]
+
+
+
+    @property
+    def individuals(self) -> 'list[Individual]':
+        """Every individual of the database, sorted by id."""
+        rows = self._connection.execute(f"SELECT {self.INDIVIDUAL_COLUMNS} FROM individuals ORDER BY id")
+        return self._individuals_from_rows(rows.fetchall())
+
+
+
+    def get_individual(self, indi_id: int) -> Individual:
+        """Return the individual with the given id"""
+        row = self._connection.execute(f"SELECT {self.INDIVIDUAL_COLUMNS} FROM individuals WHERE id = ?", (indi_id,)).fetchone()
+        return Individual.from_values(*row) if row else None
+
+
+
+    def find_individuals(self, search: str) -> 'list[Individual]':
+        """Method to find every individuals that match the 'search' regex."""
+        rows = self._connection.execute(
+            f"SELECT {self.INDIVIDUAL_COLUMNS} FROM individuals WHERE NAME_MATCHES(?, raw_name) ORDER BY id",
+            (search,)
+        )
+        return self._individuals_from_rows(rows.fetchall())
+
+
+
+    def get_name_index(self) -> NameIndex:
+        """Return the index used for approximate name searches, built from every individual the first time."""
+        if self._name_index is None: self._name_index = NameIndex(self.individuals)
+        return self._name_index
+
+
+
+    def find_individuals_fuzzy(self, search: str, k: int = 10) -> 'list[Individual]':
+        """Method to find the k individuals whose name is the closest to 'search', the closest first."""
+        return [indi for _, indi in self.get_name_index().search(search, k)]
+
+
+
+    def find_individual(self, search: str, fuzzy: bool = False, interactive: bool = True) -> Individual:
+        """Method to find an individual.
+
+        - If search is a number, return the individual with the given id.
+        - If search is a str, look for individuals with this name (approximately if fuzzy is True).
+        If multiple individuals are found, this method will prompt the user to
+        choose between the individuals, or raise an AmbiguousIndividualError if interactive is False.
+        """
+        try:
+            return self.get_individual(int(search))
+        except ValueError:
+            returned_individuals: list[Individual]
+            if fuzzy: returned_individuals = self.get_name_index().best_matches(search)
+            else: returned_individuals = self.find_individuals(search)
+
+            if len(returned_individuals) == 0: return None
+            if len(returned_individuals) == 1: return returned_individuals[0]
+            if not interactive: raise AmbiguousIndividualError(search, returned_individuals)
+
+            print("Multiple individuals found. Please select one in this list:")
+            GEDData.print_individuals_list(returned_individuals)
+
+            possible_values: list[str] = [str(x.id) for x in returned_individuals]
+
+            chosen_value: str = None
+            while chosen_value not in possible_values:
+                chosen_value = input("Reference: ")
+
+            return self.get_individual(int(chosen_value))
+
+
+
+
+    def load_tree(self, root: Individual, depth: int) -> Individual:
+        """Load the ancestors (depth > 0) or the descendants (depth < 0) of root up to the
+        given depth, link them together and return the linked root.
+
+        The generations are computed by a recursive query, then the individuals and the
+        links between them are fetched in batches.
+        """
+        root_xref: str = f"@I{root.id}@"
+
+        if depth >= 0: join, selected = "e.child_xref = t.xref", "e.parent_xref"
+        else: join, selected = "e.parent_xref = t.xref", "e.child_xref"
+
+        query: str = f"""
+            WITH RECURSIVE tree(xref, generation) AS (
+                SELECT ?, 0
+                UNION
+                SELECT {selected}, t.generation + 1 FROM edges e JOIN tree t ON {join}
+                WHERE t.generation < ?
+            )
+            SELECT DISTINCT xref FROM tree
+        """
+        xrefs: list[str] = [row[0] for row in self._connection.execute(query, (root_xref, abs(depth)))]
+
+        # Fetch the individuals
+        individuals: dict = {}
+        for batch in self._batches(xrefs):
+            placeholders: str = ', '.join(['?'] * len(batch))
+            rows = self._connection.execute(
+                f"SELECT xref, {self.INDIVIDUAL_COLUMNS} FROM individuals WHERE xref IN ({placeholders})", batch
+            )
+            for row in rows: individuals[row[0]] = Individual.from_values(*row[1:])
+
+        # Link the individuals, using only the edges between two loaded individuals
+        for batch in self._batches(xrefs):
+            placeholders: str = ', '.join(['?'] * len(batch))
+            rows = self._connection.execute(
+                f"SELECT parent_xref, child_xref, role FROM edges WHERE child_xref IN ({placeholders}) ORDER BY rowid", batch
+            )
+            for parent_xref, child_xref, role in rows:
+                parent: Individual = individuals.get(parent_xref)
+                child: Individual = individuals.get(child_xref)
+                if parent is None or child is None: continue
+
+                if role == 'HUSB' and child.father is None: child.father = parent
+                elif role == 'WIFE' and child.mother is None: child.mother = parent
+                if child not in parent.children: parent.children.append(child)
+
+        return individuals.get(root_xref, root)
+
+
+
+    def _batches(self, values: list):
+        for i in range(0, len(values), self.BATCH_SIZE):
+            yield values[i:i + self.BATCH_SIZE]
@@ -0,0 +1,189 @@
+# This file is used to analyse the whole parent/child graph at once, with NumPy arrays instead
+# of following the father/mother/children attributes of every individual.
+#
+# NumPy is optional: it is only imported when the arrays are built (see GEDData.get_graph_arrays(), and
+# Extractor.get_generations() which walks the graph of the xrefs of a file with them).
+
+from individual import Individual
+
+
+
+
+def import_numpy():
+    """Return the numpy module, or raise an Exception explaining how to install it."""
+    try:
+        import numpy
+    except ImportError:
+        raise Exception("This feature needs NumPy. You can install it with 'pip install numpy'.")
+    return numpy
+
+
+
+def has_numpy() -> bool:
+    """Return True if NumPy is installed (without importing it)."""
+    import importlib.util
+    return importlib.util.find_spec("numpy") is not None
+
+
+
+
+class GraphArrays:
+    """Parent/child graph stored as CSR (compressed sparse row) arrays over dense ids.
+
+    Each individual gets a dense id (its position in GEDData.individuals). The parents of the
+    individual i are parents_idx[parents_indptr[i]:parents_indptr[i + 1]], and its children
+    are stored the same way in children_indptr and children_idx.
+
+    A whole generation (a frontier) is expanded at once: the slices of every individual of the
+    frontier are gathered with a single indexing operation, and duplicates are removed with
+    numpy.unique, so multi-generation walks cost a few array operations per generation.
+    """
+
+    individuals: 'list[Individual]'     # Individuals by dense id
+    ids: dict                           # Individual -> dense id
+    parents_indptr: object              # numpy array of n + 1 offsets in parents_idx
+    parents_idx: object                 # numpy array of the dense ids of the parents
+    children_indptr: object             # numpy array of n + 1 offsets in children_idx
+    children_idx: object                # numpy array of the dense ids of the children
+    generations: object                 # numpy array of the generation of each individual (-1 if in a cycle)
+
+
+
+
+    def __init__(self, ged_data) -> None:
+        np = import_numpy()
+
+        parents, children = ged_data.get_parent_child_graph()
+        self.build(ged_data.individuals, parents, children)
+
+        self.generations = np.fromiter((-1 if indi.generation is None else indi.generation for indi in self.individuals),
+                                       dtype=np.int64, count=len(self.individuals))
+
+
+
+    @classmethod
+    def from_graph(cls, nodes: list, parents: dict, children: dict) -> 'GraphArrays':
+        """Create the arrays of another parent/child graph than the individuals of a GEDData (the
+        xrefs of a file for example). parents and children map each node to the list of its
+        parents and children. The generations are not computed (None)."""
+        arrays: GraphArrays = cls.__new__(cls)
+        arrays.build(nodes, parents, children)
+        arrays.generations = None
+        return arrays
+
+
+
+    def build(self, nodes: list, parents: dict, children: dict) -> None:
+        self.individuals = list(nodes)
+        self.ids = {indi: i for i, indi in enumerate(self.individuals)}
+        self.parents_indptr, self.parents_idx = self.to_csr([parents[indi] for indi in self.individuals])
+        self.children_indptr, self.children_idx = self.to_csr([children[indi] for indi in self.individuals])
+
+
+
+    def to_csr(self, neighbours: 'list[list[Individual]]') -> tuple:
+        """Return the (indptr, idx) arrays of the given lists of individuals."""
+        np = import_numpy()
+
+        lengths = np.fromiter((len(row) for row in neighbours), dtype=np.int64, count=len(neighbours))
+        indptr = np.zeros(len(neighbours) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+
+        idx = np.fromiter((self.ids[indi] for row in neighbours for indi in row), dtype=np.int64, count=int(indptr[-1]))
+        return indptr, idx
+
+
+
+    def get_ids(self, individuals: 'list[Individual]'):
+        """Return the dense ids of the individuals, as a numpy array."""
+        np = import_numpy()
+        return np.fromiter((self.ids[indi] for indi in individuals), dtype=np.int64, count=len(individuals))
+
+
+
+    def to_individuals(self, ids) -> 'list[Individual]':
+        """Return the individuals of an array of dense ids."""
+        return [self.individuals[i] for i in ids.tolist()]
+
+
+
+
+    @staticmethod
+    def gather(indptr, idx, frontier):
+        """Return the neighbours of every individual of the frontier (with duplicates), in one operation."""
+        np = import_numpy()
+
+        starts = indptr[frontier]
+        lengths = indptr[frontier + 1] - starts
+        total: int = int(lengths.sum())
+        if total == 0: return np.empty(0, dtype=np.int64)
+
+        # Position of each neighbour in idx: the start of its row, plus its rank in the row
+        offsets = np.cumsum(lengths) - lengths
+        positions = np.repeat(starts - offsets, lengths) + np.arange(total)
+        return idx[positions]
+
+
+
+    def get_frontiers(self, individuals: 'list[Individual]', generations: int = None, upward: bool = True) -> list:
+        """Return the successive generations of ancestors (or descendants if upward is False) of the
+        individuals, up to the given number of generations (every generation if None).
+
+        Each generation is a sorted numpy array of dense ids. An individual is only part of the
+        first generation where it is found.
+        """
+        np = import_numpy()
+        indptr, idx = (self.parents_indptr, self.parents_idx) if upward else (self.children_indptr, self.children_idx)
+
+        visited = np.zeros(len(self.individuals), dtype=bool)
+        frontier = np.unique(self.get_ids(individuals))
+        visited[frontier] = True
+
+        frontiers: list = []
+        while len(frontier) > 0 and (generations is None or len(frontiers) < generations):
+            frontier = np.unique(self.gather(indptr, idx, frontier))
+            frontier = frontier[~visited[frontier]]
+            visited[frontier] = True
+            if len(frontier) > 0: frontiers.append(frontier)
+
+        return frontiers
+
+
+
+    def get_ancestors(self, indi: Individual, generations: int = None) -> 'list[Individual]':
+        """Return the distinct ancestors of the individual, up to the given number of generations (every generation if None)."""
+        return [ancestor for frontier in self.get_frontiers([indi], generations, True) for ancestor in self.to_individuals(frontier)]
+
+
+
+    def get_descendants(self, indi: Individual, generations: int = None) -> 'list[Individual]':
+        """Return the distinct descendants of the individual, up to the given number of generations (every generation if None)."""
+        return [descendant for frontier in self.get_frontiers([indi], generations, False) for descendant in self.to_individuals(frontier)]
+
+
+
+    def count_descendants(self, individuals: 'list[Individual]', generations: int = None) -> int:
+        """Return the number of distinct descendants of the individuals, up to the given number of generations (every generation if None)."""
+        return sum(len(frontier) for frontier in self.get_frontiers(individuals, generations, False))
+
+
+
+    def count_children(self):
+        """Return the number of children of every individual, as a numpy array indexed by dense id."""
+        np = import_numpy()
+        return np.diff(self.children_indptr)
+
+
+
+    def frontier_histogram(self, individuals: 'list[Individual]', generations: int = None, upward: bool = True) -> 'list[int]':
+        """Return the number of new ancestors (or descendants) found at each generation from the individuals."""
+        return [len(frontier) for frontier in self.get_frontiers(individuals, generations, upward)]
+
+
+
+    def generation_histogram(self):
+        """Return the number of individuals of each generation, as a numpy array indexed by generation
+        (the individuals of the parent/child cycles are not counted).
+        """
+        np = import_numpy()
+        return np.bincount(self.generations[self.generations >= 0])
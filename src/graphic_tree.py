@@ -2,7 +2,9 @@
 
 import os
 import re
+import threading
 from enum import Enum
+from collections import OrderedDict
 from individual import Individual
 
 
@@ -74,6 +76,10 @@ class LineTransition:
     # the dict will be {0: [2, 3]}
     transition_dict: dict
 
+    # Positions of the source and target points. If None, the points are evenly spaced in the width
+    source_points: 'list[int]' = None
+    target_points: 'list[int]' = None
+
 
 
 
@@ -151,8 +157,8 @@ class LineTransition:
         """
 
         # Compute the position of the source points and the target_points
-        source_points_position: list[int] = self.get_spaced_points(self.nb_source_points, self.width)
-        target_points_position: list[int] = self.get_spaced_points(self.nb_target_points, self.width)
+        source_points_position: list[int] = self.source_points if self.source_points is not None else self.get_spaced_points(self.nb_source_points, self.width)
+        target_points_position: list[int] = self.target_points if self.target_points is not None else self.get_spaced_points(self.nb_target_points, self.width)
         
         nb_lines: int = self.DEFAULT_TRANSITION_HEIGHT
 
@@ -251,8 +257,8 @@ class LineTransition:
         """
 
         # Compute the position of the source points and the target_points
-        source_points_position: list[int] = self.get_spaced_points(self.nb_source_points, self.width)
-        target_points_position: list[int] = self.get_spaced_points(self.nb_target_points, self.width)
+        source_points_position: list[int] = self.source_points if self.source_points is not None else self.get_spaced_points(self.nb_source_points, self.width)
+        target_points_position: list[int] = self.target_points if self.target_points is not None else self.get_spaced_points(self.nb_target_points, self.width)
         
         # the lines are represented as lists of characters, because strings can't be modified
         lines: list[list[str]] = [[" "] * self.width for _ in range(nb_lines)]
@@ -347,10 +353,86 @@ class LineTransition:
 
 
 
+class LRUCache:
+    """Bounded cache, dropping the least recently used values when full. Counts its hits and misses."""
+
+    maxsize: int
+    hits: int
+    misses: int
+    _values: OrderedDict
+
+
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._values = OrderedDict()
+        self._lock = threading.Lock()
+
+
+
+    def get(self, key):
+        """Return the value stored for key, or None."""
+        with self._lock:
+            if key in self._values:
+                self._values.move_to_end(key)
+                self.hits += 1
+                return self._values[key]
+            self.misses += 1
+            return None
+
+
+
+    def put(self, key, value) -> None:
+        with self._lock:
+            self._values[key] = value
+            self._values.move_to_end(key)
+            while len(self._values) > self.maxsize:
+                self._values.popitem(last = False)
+
+
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._values), "maxsize": self.maxsize}
+
+
+
+
+
+
+
+
 class GraphicTree:
     """Class used to store and compute data related to the graphic representation in terminal of the genealogical tree.
+
+    The drawn charts, and the individuals and lines of each generation, are kept in LRU caches, so
+    drawing the same tree again (or the same tree with another depth) does not compute it again, and
+    draw() reuses the generations computed by fit(). Every key holds the direction of the tree and
+    the version of the dataset (see set_dataset()), and draw() checks that the dataset did not change.
+
+    If subtree metrics are given (see subtree.py), the charts of descendants give each branch a
+    width proportional to its number of descendants, instead of spacing every generation evenly.
     """
 
+    DEFAULT_CACHE_SIZE: int = 128
+    PEDIGREE_COLUMN_WIDTH: int = 6          # Width of a generation in the sideways pedigrees
+    LABEL_STYLES: 'list[str]' = ["full", "initials", "ids"]     # From the most to the least detailed, see get_label()
+    PARTICLES: 'list[str]' = ["of", "de", "du", "da", "di", "von", "van", "der", "den", "la", "le"]     # Left out of the initials
+    STYLE: str = "vertical"
+
+    chart_cache: LRUCache                   # (dataset version, root reference, downward, depth, width, style, label styles) -> chart
+    lines_cache: LRUCache                   # (kind, dataset version, root reference, downward, generation, width, style, ...) -> lines or generation
+    dataset: object                         # GEDData or GEDStore of the drawn individuals (see set_dataset())
+    dataset_version: tuple                  # Identifies the dataset the cached charts come from
+    metrics: 'SubtreeMetrics'               # Sizes of the branches, for proportional widths (None otherwise)
+
     @staticmethod
     def terminal_width() -> int:
         """Return the width of the terminal."""
@@ -381,29 +463,77 @@ class GraphicTree:
             for j, c in enumerate(w):
                 # Replace '_' by a space
                 if c == '_': c = ' '
-                line[centers[i] - offset + j] = c
+                # Labels too wide for the line are cut (see fit() to avoid it)
+                if 0 <= centers[i] - offset + j < width: line[centers[i] - offset + j] = c
 
         return ''.join(line)
 
 
 
     @staticmethod
-    def name_line(individuals: 'list[Individual]', width: int, centers: 'list[int]') -> str:
+    def get_initials(words: 'list[str]') -> 'list[str]':
+        """Return the words replaced by their initials, except the regnal numbers: "George III" becomes "G. III".
+        The particles (see PARTICLES) and the words that don't start with a letter, like "(Sophia)", are left out."""
+        return [word if re.fullmatch(r'[IVXLCDM]+', word) else word[0] + '.' for word in words
+                if word[0].isalpha() and word not in GraphicTree.PARTICLES]
+
+
+
+    @staticmethod
+    def cut(line: str, max_length: int) -> str:
+        """Return the line cut to max_length, ending with a '.' (without the spaces and punctuation before it)."""
+        line = line[:max_length - 1].rstrip(' .-,') if max_length > 1 else ''
+        return line + '.' if line else ''
+
+
+
+    @staticmethod
+    def get_label_length(centers: 'list[int]', width: int) -> int:
+        """Return the length of the longest labels that can be placed at the centers without overlapping."""
+        if len(centers) < 2: return width
+        return min(abs(second - first) for first, second in zip(centers, centers[1:])) - 1
+
+
+
+    @staticmethod
+    def get_label(indi: Individual, label_style: str = "full", max_length: int = None) -> 'list[str]':
+        """Return the 3 lines of the label of an individual in a chart, in the given style (see LABEL_STYLES):
+        first names, last name and birth/death years ("full"), or the reference id only ("ids").
+
+        With "initials", the first names are replaced by their initials, and so are the words of the
+        second line but the last one. The lines longer than max_length are then cut (ending with a
+        '.'), except the years, which are left out if they are too long.
+        """
+        if label_style == "ids": return [str(indi.id), "", ""]
+
+        name: dict = indi.get_name_disposition()
+        lines: list[str] = [name['top'], name['bottom'], indi.get_tree_date_str()]
+        if label_style != "initials": return lines
+
+        top_words: list[str] = lines[0].replace('_', ' ').split()
+        bottom_words: list[str] = lines[1].replace('_', ' ').split()
+        lines[0] = ' '.join(GraphicTree.get_initials(top_words))
+        lines[1] = ' '.join(GraphicTree.get_initials(bottom_words[:-1]) + bottom_words[-1:])
+
+        if max_length is not None:
+            lines[:2] = [line if len(line) <= max_length else GraphicTree.cut(line, max_length) for line in lines[:2]]
+            if len(lines[2]) > max_length: lines[2] = ''
+        return lines
+
+
+
+    @staticmethod
+    def name_line(individuals: 'list[Individual]', width: int, centers: 'list[int]', label_style: str = "full") -> str:
         """Return a 3 line string displaying firstname, lastname and birth/death years
         of each person in names, evenly spaced.
         """
         assert len(individuals) == len(centers), f"The number of individuals {len(individuals)} and the number of centers {len(centers)} must be the same."
 
-        # Generate the name dict
-        names: list[dict] = [indi.get_name_disposition() for indi in individuals]
-        # Generate the years list
-        year_list: list[str] = [indi.get_tree_date_str() for indi in individuals]
-
-        first_names: list[str] = []
-        last_names: list[str] = []
-        for n in names:
-            first_names.append(n['top'])
-            last_names.append(n['bottom'])
+        max_length: int = GraphicTree.get_label_length(centers, width)
+        labels: list[list[str]] = [GraphicTree.get_label(indi, label_style, max_length) for indi in individuals]
+        first_names: list[str] = [label[0] for label in labels]
+        last_names: list[str] = [label[1] for label in labels]
+        year_list: list[str] = [label[2] for label in labels]
 
         res: str = GraphicTree.words_line(first_names, width, centers)
         res += '\n' + GraphicTree.words_line(last_names, width, centers)
@@ -423,55 +553,320 @@ class GraphicTree:
 
 
 
-    def draw(self, root: Individual, depth: int = 2) -> str:
+    def __init__(self, cache_size: int = DEFAULT_CACHE_SIZE, metrics: 'SubtreeMetrics' = None) -> None:
+        self.chart_cache = LRUCache(cache_size)
+        self.lines_cache = LRUCache(cache_size * 8)
+        self.dataset = None
+        self.dataset_version = None
+        self.metrics = metrics
+        if metrics is not None: self.STYLE = "proportional"
+
+
+
+    def set_dataset(self, dataset) -> None:
+        """Set the dataset the drawn individuals come from (a GEDData or a GEDStore).
+
+        The caches are emptied if the dataset is not the one previously set, or if it changed since.
+        """
+        version: tuple = (id(dataset), getattr(dataset, 'version', 0))
+        if version != self.dataset_version: self.invalidate()
+        self.dataset = dataset
+        self.dataset_version = version
+
+
+
+    def check_dataset(self) -> None:
+        """Empty the caches if the dataset changed since set_dataset() (a file parsed or imported again)."""
+        if self.dataset is not None: self.set_dataset(self.dataset)
+
+
+
+    def invalidate(self) -> None:
+        """Empty the caches."""
+        self.chart_cache.clear()
+        self.lines_cache.clear()
+
+
+
+    def cache_stats(self) -> dict:
+        """Return the hits, misses and size of the cache of charts and of the cache of lines."""
+        return {"charts": self.chart_cache.stats(), "lines": self.lines_cache.stats()}
+
+
+
+
+    def get_proportional_centers(self, root: Individual, generation: int, width: int) -> 'list[int]':
+        """Return the centers of the descendants of root at the given generation (<= 0), in the order
+        of root.get_descendants(generation).
+
+        The width of each individual is shared between its children: half of it evenly, so every
+        child keeps some room for its label, and half in proportion to their number of descendants
+        (plus themselves), so the largest branches get the most room.
+        """
+        segments: list[tuple] = [(root, 0, width)]
+        for _ in range(-generation):
+            next_segments: list[tuple] = []
+            for indi, start, end in segments:
+                weights: list[int] = [1 + self.metrics.count_descendants(child) for child in indi.children]
+                position: float = start
+                for child, weight in zip(indi.children, weights):
+                    size: float = (end - start) * (0.5 / len(weights) + 0.5 * weight / sum(weights))
+                    next_segments.append((child, position, position + size))
+                    position += size
+            segments = next_segments
+
+        # Keep the labels in the width: a small branch at the border may be narrower than its label
+        centers: list[int] = []
+        for indi, start, end in segments:
+            half: int = max(len(line) for line in self.get_label(indi)) // 2
+            centers.append(min(max(int((start + end) / 2), half), width - half - 1))
+        return centers
+
+
+
+
+    def get_centers(self, root: Individual, generation: int, individuals: 'list[Individual]', width: int, downward: bool) -> 'list[int]':
+        """Return the centers of the individuals of the given generation of the tree of root."""
+        if self.metrics is not None and generation <= 0 and downward:
+            return self.get_proportional_centers(root, generation, width)
+        return LineTransition.get_spaced_points(len(individuals), width)
+
+
+
+    def get_generation(self, root: Individual, generation: int, width: int, downward: bool) -> 'tuple[list[Individual], list[int]]':
+        """Return the individuals of the given generation of the tree of root, and their centers. Cached,
+        so fit() and draw() compute them only once."""
+        key: tuple = ("generation", self.dataset_version, root.reference, downward, generation, width, self.STYLE)
+        cached: tuple = self.lines_cache.get(key)
+        if cached is not None: return cached
+
+        individuals: list[Individual] = root.get_ancestors(generation) if generation >= 0 else root.get_descendants(generation)
+        cached = (individuals, self.get_centers(root, generation, individuals, width, downward))
+        self.lines_cache.put(key, cached)
+        return cached
+
+
+
+    def labels_fit(self, root: Individual, generation: int, width: int, label_style: str, downward: bool) -> bool:
+        """Return True if the labels of the given generation of the tree of root fit in the width without
+        overlapping, in the given style. Only the lengths of the labels are computed, nothing is drawn."""
+        individuals, centers = self.get_generation(root, generation, width, downward)
+        max_length: int = self.get_label_length(centers, width)
+        labels: list[list[str]] = [self.get_label(indi, label_style, max_length) for indi in individuals]
+
+        # A label cut down to nothing would leave the individual out of the chart
+        if not all(any(label) for label in labels): return False
+
+        # Each line of the labels is placed like in words_line(), with at least a space between 2 words
+        for line in range(3):
+            free: int = 0                       # First position available on the line
+            for center, label in zip(centers, labels):
+                if label[line] == "": continue
+                start: int = center - len(label[line]) // 2
+                if start < free: return False
+                free = start + len(label[line]) + 1
+            if free - 1 > width: return False
+
+        return True
+
+
+
+    def fit(self, root: Individual, depth: int, width: int = None) -> 'tuple[int, list[str]]':
+        """Return the depth and the label style of each generation to use to draw the tree of root in
+        the width, without drawing it (see draw()).
+
+        Each generation gets the most detailed style of LABEL_STYLES whose labels fit. If the labels of
+        a generation don't fit in any style, the tree is drawn up to the generation before. The root
+        is always drawn, its label being cut if the width is too small.
+        """
+        if width is None: width = self.terminal_width()
+
+        step: int = 1 if depth >= 0 else -1
+        label_styles: list[str] = []
+        for generation in range(0, depth + step, step):
+            label_style: str = next((style for style in self.LABEL_STYLES if self.labels_fit(root, generation, width, style, depth < 0)), None)
+            if label_style is None: break
+            label_styles.append(label_style)
+
+        if not label_styles: return 0, [self.LABEL_STYLES[-1]]
+        return (len(label_styles) - 1) * step, label_styles
+
+
+
+
+    def get_generation_lines(self, root: Individual, generation: int, width: int, with_transition: bool, downward: bool, label_style: str = "full") -> 'tuple[str, str]':
+        """Return the name line of the given generation of the tree of root, and the lines of the
+        transition to the next generation (if with_transition is True, None otherwise).
+
+        The next generation is generation - 1 (children) if downward, generation + 1 (parents) otherwise.
+        Both are cached, so charts of different depths share the lines of their common generations.
+        """
+        names_key: tuple = ("names", self.dataset_version, root.reference, downward, generation, width, self.STYLE, label_style)
+        transition_key: tuple = ("transition", self.dataset_version, root.reference, downward, generation, width, self.STYLE, label_style)
+
+        names: str = self.lines_cache.get(names_key)
+        transition: str = self.lines_cache.get(transition_key) if with_transition else None
+        if names is not None and (transition is not None or not with_transition):
+            return names, transition
+
+        # The individuals and the centers of this name line
+        individuals_list, centers = self.get_generation(root, generation, width, downward)
+        proportional: bool = self.metrics is not None and generation <= 0 and downward
+
+        if names is None:
+            names = self.name_line(individuals_list, width, centers, label_style)
+            self.lines_cache.put(names_key, names)
+
+        if with_transition and transition is None:
+            line_transition: LineTransition = LineTransition()
+            line_transition.width = width
+            if downward:
+                line_transition.generate_child_transition(individuals_list)
+                if proportional:
+                    # The targets are the children, each at the position of its first appearance
+                    children, children_centers = self.get_generation(root, generation - 1, width, downward)
+                    positions: dict = {}
+                    for child, center in zip(children, children_centers): positions.setdefault(child, center)
+                    line_transition.source_points = centers
+                    line_transition.target_points = [positions[child] for child in dict.fromkeys(children)]
+                transition = line_transition.draw_lines_downward()
+            else:
+                line_transition.generate_parent_transition(individuals_list)
+                transition = line_transition.draw_lines_upward()
+            self.lines_cache.put(transition_key, transition)
+
+        return names, transition
+
+
+
+
+    def draw(self, root: Individual, depth: int = 2, width: int = None, label_styles: 'list[str]' = None) -> str:
         """Return a string representing a graphic tree starting from the root and up to the depth generation.
 
         If depth > 0, it will represent the ancestors of the root.
         If depth < 0, it will represent the descendants of the root.
+        The width defaults to the width of the terminal. label_styles gives the style of the labels of
+        each generation, from the root (full labels if None): use fit() to get the depth and the label
+        styles with which the labels don't overlap.
+
+        The charts are cached by (dataset version, root, direction, depth, width, style, label styles): the
+        caches are emptied first if the dataset changed (see set_dataset() and invalidate()).
         """
-        width: int = self.terminal_width()
-        
+        if width is None: width = self.terminal_width()
+        if label_styles is None: label_styles = [self.LABEL_STYLES[0]] * (abs(depth) + 1)
+        self.check_dataset()
+
+        chart_key: tuple = (self.dataset_version, root.reference, depth < 0, depth, width, self.STYLE, tuple(label_styles))
+        chart: str = self.chart_cache.get(chart_key)
+        if chart is not None: return chart
+
         lines: list[str] = []
 
         # If upward
         if depth >= 0:
             for d in range(0, depth + 1):
-                # Compute the individuals and the centers of this name line
-                individuals_list: list[Individual] = root.get_ancestors(d)
-                centers: list[int] = LineTransition.get_spaced_points(len(individuals_list), width)
+                # Generate the transition only if there is still a name line on top
+                names, transition = self.get_generation_lines(root, d, width, d < depth, False, label_styles[d])
+                lines.append(names)
+                if transition is not None: lines.append(transition)
 
-                lines.append(self.name_line(individuals_list, width, centers))
+            lines.reverse()
+            chart = '\n'.join(lines)
 
-                if d < depth:
-                    # Generate the LineTransition only if there is still a name line on top
-                    line_transition: LineTransition = LineTransition()
-                    line_transition.width = width
-                    line_transition.generate_parent_transition(individuals_list)
-                    lines.append(line_transition.draw_lines_upward())
+        # If downward
+        else:
+            for d in range(0, depth - 1, -1):
+                # Generate the transition only if there is still a name line under
+                names, transition = self.get_generation_lines(root, d, width, d > depth, True, label_styles[-d])
+                lines.append(names)
+                if transition is not None: lines.append(transition)
 
+            # Remove the empty lines
+            chart = '\n'.join([line for line in lines if line != ''])
 
-            # Draw the lines
-            lines.reverse()
-            print('\n'.join(lines))
+        self.chart_cache.put(chart_key, chart)
+        return chart
 
-    
 
-        # If downward
-        elif depth < 0:
-            for d in range(0, depth - 1, -1):
-                # Compute the individuals and the centers of this name line
-                individuals_list: list[Individual] = root.get_descendants(d)
-                centers: list[int] = LineTransition.get_spaced_points(len(individuals_list), width)
 
-                lines.append(self.name_line(individuals_list, width, centers))
 
-                if d > depth:
-                    # Generate the LineTransition only if there is still a name line on top
-                    line_transition: LineTransition = LineTransition()
-                    line_transition.width = width
-                    line_transition.generate_child_transition(individuals_list)
-                    lines.append(line_transition.draw_lines_downward())
+    @staticmethod
+    def pedigree_label(indi: Individual) -> str:
+        """Return the label of an individual in a sideways pedigree: its name, reference and years."""
+        dates: str = indi.get_tree_date_str()
+        return f"{indi.get_cleared_raw_name()} ({indi.id}{', ' + dates if dates else ''})"
+
+
+
+    def iter_pedigree_lines(self, root: Individual, depth: int):
+        """Yield, line by line, a sideways chart of the ancestors of root up to depth generations.
+
+        Each generation is a column of PEDIGREE_COLUMN_WIDTH characters, and each ancestor a row:
+        the fathers above their child, the mothers below. The chart grows by one line per ancestor
+        instead of doubling its width at each generation, so deep charts remain readable.
+
+        The ancestors found twice (pedigree collapse) are only expanded the first time.
+        """
+        expanded: set = set()
+
+        # path: the sides taken from root ('F' for the father, 'M' for the mother)
+        def visit(indi: Individual, path: str):
+            parents: list[tuple] = [(parent, side) for parent, side in ((indi.father, 'F'), (indi.mother, 'M')) if parent is not None]
+            if len(path) >= depth: parents = []
+            repeated: bool = indi in expanded and parents != []
+            if repeated: parents = []
+            expanded.add(indi)
 
+            for parent, side in parents:
+                if side == 'F': yield from visit(parent, path + side)
 
-            # Draw the lines without the empty ones
-            print('\n'.join([line for line in lines if line != '']))
\ No newline at end of file
+            # The vertical line of a generation crosses the rows between a parent and its child
+            prefix: str = ''.join('  ' + (LINE_SYMBOLS.VER.value if path[i] != path[i + 1] else ' ') + ' ' * (self.PEDIGREE_COLUMN_WIDTH - 3)
+                                  for i in range(len(path) - 1))
+            if path:
+                corner: str = LINE_SYMBOLS.DIAG_R.value if path[-1] == 'F' else LINE_SYMBOLS.DIAG_R_B.value
+                prefix += '  ' + corner + LINE_SYMBOLS.HOR.value * (self.PEDIGREE_COLUMN_WIDTH - 4) + ' '
+            yield prefix + self.pedigree_label(indi) + (" (see above)" if repeated else "")
+
+            for parent, side in parents:
+                if side == 'M': yield from visit(parent, path + side)
+
+        yield from visit(root, '')
+
+
+
+
+    def draw_relationship(self, relationship, width: int = None) -> str:
+        """Return a string representing the path between two related individuals (see relationship.py):
+        their common ancestor at the top, then the line down to each of them, side by side.
+        """
+        if width is None: width = self.terminal_width()
+
+        # The columns go from the common ancestor down to each individual
+        columns: list[list[Individual]] = [relationship.first_path[::-1], relationship.second_path[::-1]]
+        columns = [column for column in columns if len(column) > 1] or columns[:1]
+        centers: list[int] = LineTransition.get_spaced_points(len(columns), width)
+
+        lines: list[str] = [self.name_line([columns[0][0]], width, LineTransition.get_spaced_points(1, width))]
+
+        # From the ancestor to the top of each column
+        line_transition: LineTransition = LineTransition()
+        line_transition.width = width
+        line_transition.nb_source_points = 1
+        line_transition.nb_target_points = len(columns)
+        line_transition.transition_dict = {0: [i for i in range(len(columns)) if len(columns[i]) > 1]}
+        lines.append(line_transition.draw_lines_downward())
+
+        for generation in range(1, max(len(column) for column in columns)):
+            # Draw the individuals of this generation, and a vertical line above the next ones
+            present: list[int] = [i for i in range(len(columns)) if generation < len(columns[i])]
+            lines.append(self.name_line([columns[i][generation] for i in present], width, [centers[i] for i in present]))
+
+            line_transition = LineTransition()
+            line_transition.width = width
+            line_transition.nb_source_points = line_transition.nb_target_points = len(columns)
+            line_transition.transition_dict = {i: [i] if generation + 1 < len(columns[i]) else [] for i in range(len(columns))}
+            lines.append(line_transition.draw_lines_downward())
+
+        # Remove the empty lines
+        return '\n'.join([line for line in lines if line != ''])
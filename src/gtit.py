@@ -1,83 +1,372 @@
 #!/bin/python3
 
-import re
-import os
+import sys
 import argparse
-from sys import exit, get_coroutine_origin_tracking_depth
-from geddata import GEDData
-from item import Item
-from individual import Individual
-from graphic_tree import *
+from sys import exit
 
+# The modules of each mode are imported by the functions using them, so a small query
+# does not pay for the loading of the whole program (see startup_benchmark.py).
 
 
-AVAILABLE_MODES = ["list", "stats", "tree"]
 
+VERSION = "1.0.0-beta"
 
+AVAILABLE_MODES = ["list", "stats", "tree", "import", "dedupe", "relate", "extract", "validate", "search", "export", "diff"]
+EXPORT_FORMATS = ["npz"]
 
 
 
 
-def list(ged_data: GEDData, regex: str) -> None:
+
+
+def list(ged_data: 'GEDData', regex: str, fuzzy: bool = False, top: int = 10, query: 'Query' = None, metrics: bool = False, component: int = None) -> None:
     """Print a list of individuals from the GEDData.
-    
-    TODO: Docstring
+
+    If fuzzy is True, regex is not a regular expression but an approximate name: the top closest
+    individuals are printed, the closest first. Otherwise, the individuals matching the regular
+    expression and the compiled filter expression, or every individual, are printed, sorted by
+    reference id. If component is given, only the individuals of this connected component are printed.
+    If metrics is True, the size of the tree of descendants of each individual is printed too.
     """
+    from geddata import GEDData
+
     individual_list: 'list[Individual]'
+    subtree_metrics: 'SubtreeMetrics' = ged_data.get_subtree_metrics() if metrics else None
+
+    if fuzzy and regex is not None:
+        individual_list = ged_data.find_individuals_fuzzy(regex, top)
+        if component is not None: individual_list = [indi for indi in individual_list if indi.component == component]
+        GEDData.print_individuals_list(individual_list, sort=False, metrics=subtree_metrics)
+        return
+
+    if query is not None:
+        individual_list = query.filter(ged_data)
+        if regex is not None: individual_list = [indi for indi in individual_list if GEDData.name_matches(indi, regex)]
     
     # Get a list of every individual, with regex or not
-    if regex is not None: individual_list = ged_data.find_individuals(regex)
+    elif regex is not None: individual_list = ged_data.find_individuals(regex)
+    elif component is not None: individual_list = ged_data.get_component(component)
     else: individual_list = ged_data.individuals
 
+    if component is not None: individual_list = [indi for indi in individual_list if indi.component == component]
+
     # Sort the list of individuals by reference id (reference = @I13@, reference id = 13)
-    individual_list.sort(key=lambda x: int(x.id))
+    individual_list = sorted(individual_list, key=lambda x: int(x.id))
     
-    ged_data.print_individuals_list(individual_list)
+    GEDData.print_individuals_list(individual_list, metrics=subtree_metrics)
+
+
+
+
+
 
 
+def stats(ged_data: 'GEDData', implex: bool = False) -> None:
+    """Print statistics about the GEDData. With implex, also print the individuals with the largest pedigree collapse."""
 
+    print("%-30s %d" % ("individuals", len(ged_data.individuals)))
+    print("%-30s %d" % ("families", len(ged_data.families)))
+    print("%-30s %d" % ("founders", len([indi for indi in ged_data.individuals if indi.generation == 0])))
+    print("%-30s %d" % ("parent/child cycles", len(ged_data.cycles)))
+    print("%-30s %d" % ("connected components", len(ged_data.component_sizes)))
+    print("%-30s %d" % ("isolated individuals", ged_data.component_sizes.count(1)))
 
+    # Places with the most births, at the largest level (countries, usually)
+    countries: list = sorted(ged_data.get_place_trie().root.children.values(), key=lambda node: node.count_births(), reverse=True)
+    if countries:
+        print()
+        print("%-40s %-10s" % ("birth place", "individuals"))
+        for node in countries[:10]:
+            print("%-40s %-10d" % (node.name, node.count_births()))
 
+    # Number of individuals per generation
+    generations: dict = {}
+    for indi in ged_data.individuals:
+        if indi.generation is not None: generations[indi.generation] = generations.get(indi.generation, 0) + 1
 
+    print()
+    print("%-10s %-10s" % ("generation", "individuals"))
+    for generation in sorted(generations):
+        print("%-10d %-10d" % (generation, generations[generation]))
+
+    # Largest groups of individuals linked by families (see list --component)
+    print()
+    print("%-10s %-10s" % ("component", "individuals"))
+    for number, size in enumerate(ged_data.component_sizes[:10]):
+        print("%-10d %-10d" % (number, size))
+
+    if implex: implex_stats(ged_data)
+
+
+
+def implex_stats(ged_data: 'GEDData', top: int = 10, generations: int = 10) -> None:
+    """Print the number of individuals with a pedigree collapse within the given number of generations,
+    and the individuals with the largest one."""
+
+    index: 'AncestorIndex' = ged_data.get_ancestor_index()
+    implexes: list = [(index.get_implex(indi, generations), indi) for indi in ged_data.individuals]
+    collapsed: list = [(implex, indi) for implex, indi in implexes if implex]
+    collapsed.sort(key=lambda result: (-result[0], result[1].id))
+
+    print()
+    print("%-30s %d" % (f"pedigree collapse ({generations} gen.)", len(collapsed)))
+    if not collapsed: return
+
+    print()
+    print("%-7s %-10s %-50s %-10s %-10s" % ("implex", "reference", "name", "ancestors", "generation"))
+    for implex, indi in collapsed[:top]:
+        print("%-7.3f %-10s %-50s %-10d %-10s" % (implex, indi.id, indi.get_cleared_raw_name(), index.count_ancestors(indi, generations), indi.generation))
 
-def tree(ged_data: GEDData, name: str, depth: int) -> None:
-    """Draw a tree from the GEDData."""
 
-    root: list[Individual] = ged_data.find_individual(name)
+
+
+
+
+
+def dedupe(ged_data: 'GEDData', threshold: float, jobs: int) -> None:
+    """Print the pairs of individuals that are probably duplicates, the most similar first."""
+    from dedupe import DuplicateFinder
+
+    finder: DuplicateFinder = DuplicateFinder(threshold, jobs)
+    pairs: list[tuple] = finder.find_duplicates(ged_data.individuals)
+
+    if len(pairs) == 0:
+        print("No duplicate found.")
+        return
+
+    print("%-7s %-10s %-40s %-10s %-40s" % ("score", "reference", "name", "reference", "name"))
+    print()
+
+    for score, reference_a, reference_b in pairs:
+        indi_a: Individual = ged_data.get_individual(int(reference_a.replace('@', '')[1:]))
+        indi_b: Individual = ged_data.get_individual(int(reference_b.replace('@', '')[1:]))
+        print("%-7.3f %-10s %-40s %-10s %-40s" % (score, indi_a.id, indi_a.get_cleared_raw_name(), indi_b.id, indi_b.get_cleared_raw_name()))
+
+
+
+
+
+
+
+def tree(ged_data: 'GEDData', name: str, depth: int, fuzzy: bool = False, proportional: bool = False, horizontal: bool = False) -> None:
+    """Draw a tree from the GEDData. If proportional is True, the branches of the descendants get a width
+    proportional to their number of descendants. If horizontal is True, the ancestors are drawn sideways,
+    one line per ancestor, and the lines are printed as soon as they are drawn."""
+    from graphic_tree import GraphicTree
+
+    root: list[Individual] = ged_data.find_individual(name, fuzzy)
 
     if root == None:
         print("Could not find the individual with the name '" + name + "'.")
-        print(f"You can list the individuals with the 'gtit.py list -i {ged_data.filepath}' mode.")
+        print(f"You can list the individuals with the 'gtit.py list {ged_data.filepath}' mode.")
         exit(1)
 
 
-    used_depth: int = depth
+    # Individuals coming from a database (GEDStore) are not linked: load the part of the tree to draw
+    if hasattr(ged_data, 'load_tree'): root = ged_data.load_tree(root, depth)
+
+    graphic_tree: GraphicTree = GraphicTree(metrics = ged_data.get_subtree_metrics() if proportional else None)
+    graphic_tree.set_dataset(ged_data)
+
+    if horizontal:
+        for line in graphic_tree.iter_pedigree_lines(root, depth): print(line)
+        return
+
+    # Shorten the labels, or reduce the depth, before drawing if the tree is too wide for the terminal
+    used_depth, label_styles = graphic_tree.fit(root, depth)
+    if used_depth != depth:
+        print(f"Warning: the tree is too wide to be drawn with a depth of {depth}, it is drawn with a depth of {used_depth}.")
+        if depth > 0: print("Use the --horizontal option to draw deep trees of ancestors.")
+        print()
+
+    print(graphic_tree.draw(root, used_depth, label_styles=label_styles))
+
+
+
+
+
+
+def relate(ged_data: 'GEDData', first_name: str, second_name: str, fuzzy: bool = False) -> None:
+    """Print how two individuals are related, and draw the path between them."""
+    from relationship import Relationship
+    from graphic_tree import GraphicTree
+
+    individuals: list[Individual] = []
+    for name in (first_name, second_name):
+        indi: Individual = ged_data.find_individual(name, fuzzy)
+        if indi == None:
+            print("Could not find the individual with the name '" + name + "'.")
+            print(f"You can list the individuals with the 'gtit.py list {ged_data.filepath}' mode.")
+            exit(1)
+        individuals.append(indi)
+
+    first, second = individuals
+    if not ged_data.are_connected(first, second):
+        print(f"{first.get_cleared_raw_name()} and {second.get_cleared_raw_name()} are not linked by any family.")
+        return
+
+    relationship: Relationship = Relationship.find(first, second)
+
+    if relationship is None:
+        print(f"{first.get_cleared_raw_name()} and {second.get_cleared_raw_name()} have no common ancestor.")
+        return
+
+    print(f"{first.get_cleared_raw_name()} is the {relationship.get_name()} of {second.get_cleared_raw_name()}.")
+    print("Closest common ancestors: " + ", ".join(f"{indi.get_cleared_raw_name()} ({indi.id})" for indi in relationship.ancestors))
+    print()
+
     graphic_tree: GraphicTree = GraphicTree()
+    graphic_tree.set_dataset(ged_data)
+    print(graphic_tree.draw_relationship(relationship))
 
-    
-    #while used_depth >= 0:
-        #try:
-    graphic_tree.draw(root, used_depth)
-            #break
 
-        #except: used_depth -= 1
 
 
-    if used_depth == -1:
-        print("Could not draw the tree. Verify your arguments.")
+
+
+def extract(path: str, name: str, depth: int, both: bool, output_path: str) -> None:
+    """Write the ancestors and/or descendants of an individual in a new .GED file ('-' for the standard output)."""
+    from extract import Extractor
+
+    # Messages are not printed if the new file is written on the standard output
+    verbose: bool = output_path != '-'
+    if verbose: print("Scanning GED file...")
+
+    extractor: Extractor = Extractor(path)
+    extractor.scan()
+
+    roots: list[str] = extractor.find_individuals(name)
+    if len(roots) == 0:
+        print("Could not find the individual with the name '" + name + "'.")
+        print(f"You can list the individuals with the 'gtit.py list {path}' mode.")
         exit(1)
 
+    if len(roots) > 1:
+        print("Multiple individuals found. Please use the reference of one of them:")
+        for root in roots: print("%-10s %s" % (root.strip('@').lstrip('I'), extractor.names[root]))
+        exit(1)
+
+    selected: set = extractor.get_closure(roots[0], depth, both)
+
+    if verbose:
+        with open(output_path, 'wb') as output: nb_records: int = extractor.write(output, selected)
+        print(f"{nb_records} records written in {output_path}.")
+    else:
+        extractor.write(sys.stdout.buffer, selected)
+
+
+
+
+
+
+def validate(path: str) -> bool:
+    """Print the issues of a .GED file, one JSON object per line, and a summary on the standard error.
+    Return True if the file has no error."""
+    import json
+    from validate import Validator
+
+    validator: Validator = Validator(path)
+    for issue in validator.validate(): print(json.dumps(issue, ensure_ascii=False))
+
+    print(f"{validator.nb_lines} lines checked: {validator.nb_errors} errors, {validator.nb_warnings} warnings.", file=sys.stderr)
+    return validator.nb_errors == 0
+
+
+
+
+
+
+def search(path: str, query: str, use_index_file: bool = False) -> None:
+    """Print the individuals linked to the notes and sources containing every word of the query.
+
+    If use_index_file is True, the index saved next to the .GED file is used if it is up to date,
+    so the .GED file is not loaded. Otherwise, the index is built and saved for the next searches.
+    """
+    from fulltext import TextIndex
+
+    index_path: str = TextIndex.get_index_path(path)
+    index: TextIndex = TextIndex.load(index_path, path) if use_index_file else None
+
+    if index is None:
+        ged_data: 'GEDData' = load_ged_file(path)
+        index = ged_data.get_text_index()
+        if use_index_file:
+            index.save(index_path, path)
+            print(f"Index saved in {index_path}.")
+            print()
+
+    results: dict = index.find_individuals(query)
+    if len(results) == 0:
+        print("No individual found.")
+        return
+
+    print("%-10s %-50s %s" % ("reference", "name", "records"))
+    for reference, records in sorted(results.items(), key=lambda result: int(result[0].strip('@')[1:])):
+        print("%-10s %-50s %s" % (reference.strip('@')[1:], index.names.get(reference, ''), ", ".join(records)))
+
+
+
+
+
+
+def export(ged_data: 'GEDData', output_path: str, format: str = "npz") -> None:
+    """Write the individuals in a file for other tools. The only format is 'npz': the NumPy arrays
+    of GEDData.to_columns(), in a NumPy .npz archive."""
+    from graph_arrays import import_numpy
+    np = import_numpy()
+
+    # np.savez() adds the extension if it is missing: print the name of the file actually written
+    if not output_path.endswith(".npz"): output_path += ".npz"
 
+    columns: dict = ged_data.to_columns()
+    np.savez(output_path, **columns)
+    print(f"{len(columns['individuals'])} individuals exported in {output_path}.")
 
 
 
 
-def load_ged_file(path: str) -> GEDData:
+
+
+def diff(old_path: str, new_path: str) -> bool:
+    """Print the records added, removed and changed between two versions of a .GED file, with the
+    fields that changed. Return True if the files have the same records."""
+    from diff import GEDDiff
+
+    print("Comparing GED files...")
+    ged_diff: GEDDiff = GEDDiff(old_path, new_path)
+    ged_diff.compare()
+    print(f"{len(ged_diff.added)} added, {len(ged_diff.removed)} removed, {len(ged_diff.changed)} changed records.")
+    print()
+
+    for sign, records in (('+', ged_diff.added), ('-', ged_diff.removed)):
+        for record in records:
+            print("%s %-10s %-5s %s" % (sign, record.reference, record.identifier, GEDDiff.get_label(record)))
+
+    for old, new, differences in ged_diff.changed:
+        print("%s %-10s %-5s %s" % ('~', new.reference, new.identifier, GEDDiff.get_label(new)))
+        for field, old_value, new_value in differences:
+            if old_value is None and new_value is None: print(f"      {field}")
+            else: print("      %-10s %s" % (field, GEDDiff.describe(field, old_value, new_value)))
+
+    return not (ged_diff.added or ged_diff.removed or ged_diff.changed)
+
+
+
+
+
+
+def load_ged_file(path: str) -> 'GEDData':
     """Load a GED file and return a GEDData object."""
+    from geddata import GEDData
 
     print("Loading GED file...")
     ged_data: GEDData = GEDData()
     ged_data.parse(path)
+    ged_data.freeze()
+
+    # Warn about the parent/child cycles, as the individuals involved have no generation
+    for cycle in ged_data.cycles:
+        print("Warning: parent/child cycle between " + ", ".join(cycle))
     print()
 
     return ged_data
@@ -85,18 +374,66 @@ def load_ged_file(path: str) -> GEDData:
 
 
 
+def load_data(args) -> 'GEDData':
+    """Return the data to query: the database given with --db if any, the .GED file otherwise."""
+    if args.db is not None:
+        from gedstore import GEDStore
+        return GEDStore(args.db)
+
+    if args.path is None:
+        print("No file specified. Please specify the path of a .GED file, or a database using the --db option.")
+        exit(1)
+
+    return load_ged_file(args.path)
+
+
+
+
+def import_ged_file(path: str, db_path: str) -> None:
+    """Import a GED file in a SQLite database."""
+    from gedstore import GEDStore
+
+    print("Importing GED file...")
+    store: GEDStore = GEDStore(db_path)
+    nb_individuals: int = store.import_ged_file(path)
+    store.close()
+    print(f"{nb_individuals} individuals imported in {db_path}.")
+
+
+
+
 
 
 
 def main():
-    parser = argparse.ArgumentParser()
+    parser = argparse.ArgumentParser(prog="gtit")
     # Add the arguments
     parser.add_argument("mode", help="The mode of the program. Available modes: " + ", ".join(AVAILABLE_MODES))
     parser.add_argument("-n", "--name", help="A Regular expression to filter the name of the individuals.", default=None)
     parser.add_argument("-d", "--depth", help="The depth of the tree to draw. Negative means downward, positive means upward. Must be an integer. Default: 2", type=int, default=2)
-    parser.add_argument("path", help="Path to the .GED file")
-
-    args = parser.parse_args()
+    parser.add_argument("-a", "--first", help="The first individual of the relate mode (a name, as with -n, or a reference).", default=None)
+    parser.add_argument("-b", "--second", help="The second individual of the relate mode (a name, as with -n, or a reference).", default=None)
+    parser.add_argument("-w", "--where", help="A filter expression for the list mode, for example: 'sex = F and born < 1800 and place ~ \"London\" and has_children'.", default=None)
+    parser.add_argument("--fuzzy", help="Search the name given with -n approximately (spelling variations) instead of using it as a regular expression.", action="store_true")
+    parser.add_argument("-k", "--top", help="The number of individuals listed by a fuzzy search. Default: 10", type=int, default=10)
+    parser.add_argument("-t", "--threshold", help="The minimum similarity, between 0 and 1, of the pairs listed by the dedupe mode. Default: 0.85", type=float, default=0.85)
+    parser.add_argument("-j", "--jobs", help="The number of processes used to compare large blocks of individuals in the dedupe mode. Default: 1", type=int, default=1)
+    parser.add_argument("--component", help="In the list mode, only list the individuals of the given connected component (0 is the largest, see the stats mode).", type=int, default=None)
+    parser.add_argument("--metrics", help="In the list mode, also print the number of descendants, living lines and generations of descendants of each individual.", action="store_true")
+    parser.add_argument("--proportional", help="In the tree mode, with a negative depth, give each branch a width proportional to its number of descendants.", action="store_true")
+    parser.add_argument("--horizontal", help="In the tree mode, draw the ancestors sideways, one generation per column and one ancestor per line. Suited to deep trees.", action="store_true")
+    parser.add_argument("--both", help="In the extract mode, extract both the ancestors and the descendants, up to abs(depth) generations.", action="store_true")
+    parser.add_argument("-o", "--output", help="In the extract mode, the path of the .GED file to write ('-' for the standard output). In the export mode, the path of the file to write.", default=None)
+    parser.add_argument("-f", "--format", help="The format of the file written by the export mode: npz (NumPy arrays). Default: npz", choices=EXPORT_FORMATS, default="npz")
+    parser.add_argument("-q", "--query", help="The words searched in the notes and sources by the search mode. Words between double quotes must follow each other.", default=None)
+    parser.add_argument("--index", help="In the search mode, use the index saved next to the .GED file (path.idx), or create it.", action="store_true")
+    parser.add_argument("--implex", help="In the stats mode, also print the pedigree collapse of the individuals.", action="store_true")
+    parser.add_argument("--db", help="Path to a SQLite database created with the 'import' mode. Used instead of the .GED file if given.", default=None)
+    parser.add_argument("path", help="Path to the .GED file", nargs='?', default=None)
+    parser.add_argument("new_path", help="In the diff mode, the path of the new version of the .GED file (path being the old one).", nargs='?', default=None)
+    parser.add_argument("-V", "--version", help="Print the version of the program and exit.", action="version", version="%(prog)s " + VERSION)
+
+    args = parser.parse_intermixed_args()
 
 
     # Check if the mode is valid
@@ -108,8 +445,42 @@ def main():
     # Act depending on the mode
     if args.mode == "list":
 
-        ged_data: GEDData = load_ged_file(args.path)
-        list(ged_data, args.name)
+        # Compile the filter expression before loading the .GED file
+        query: 'Query' = None
+        if args.where is not None:
+            from query import Query, QueryError
+            if args.db is not None:
+                print("The --where option needs a .GED file.")
+                exit(1)
+            try: query = Query(args.where)
+            except QueryError as e:
+                print(e)
+                exit(1)
+
+        if (args.metrics or args.component is not None) and args.db is not None:
+            print("The --metrics and --component options need a .GED file.")
+            exit(1)
+
+        ged_data: 'GEDData' = load_data(args)
+        list(ged_data, args.name, args.fuzzy, args.top, query, args.metrics, args.component)
+        exit(0)
+
+
+    elif args.mode == "stats":
+
+        if args.db is not None or args.path is None:
+            print("The stats mode needs the path of a .GED file.")
+            exit(1)
+
+        ged_data: 'GEDData' = load_ged_file(args.path)
+        stats(ged_data, args.implex)
+        exit(0)
+
+
+    elif args.mode == "dedupe":
+
+        ged_data: 'GEDData' = load_data(args)
+        dedupe(ged_data, args.threshold, args.jobs)
         exit(0)
 
 
@@ -120,8 +491,120 @@ def main():
             print("No root specified. Please specify the name of the root individual using the -n/--name option.")
             exit(1)
 
-        ged_data: GEDData = load_ged_file(args.path)
-        tree(ged_data, args.name, args.depth)
+        if args.proportional and args.db is not None:
+            print("The --proportional option needs a .GED file.")
+            exit(1)
+
+        if args.horizontal and (args.depth < 0 or args.proportional):
+            print("The --horizontal option draws the ancestors: it needs a positive depth, without --proportional.")
+            exit(1)
+
+        ged_data: 'GEDData' = load_data(args)
+        tree(ged_data, args.name, args.depth, args.fuzzy, args.proportional, args.horizontal)
+        exit(0)
+
+
+    elif args.mode == "relate":
+
+        # Check arguments before loading the .GED file
+        if args.first is None or args.second is None:
+            print("The relate mode needs 2 individuals. Please specify them using the -a and -b options.")
+            exit(1)
+
+        if args.db is not None or args.path is None:
+            print("The relate mode needs the path of a .GED file.")
+            exit(1)
+
+        ged_data: 'GEDData' = load_ged_file(args.path)
+        relate(ged_data, args.first, args.second, args.fuzzy)
+        exit(0)
+
+
+    elif args.mode == "extract":
+
+        if args.name is None or args.output is None:
+            print("The extract mode needs the root individual (-n option) and the path of the new file (-o option).")
+            exit(1)
+
+        if args.path is None or args.path == '-':
+            print("The extract mode needs the path of a .GED file, as the file is read twice.")
+            exit(1)
+
+        extract(args.path, args.name, args.depth, args.both, args.output)
+        exit(0)
+
+
+    elif args.mode == "validate":
+
+        if args.path is None:
+            print("No file specified. Please specify the path of a .GED file.")
+            exit(1)
+
+        # The exit code tells if the file can be loaded
+        exit(0 if validate(args.path) else 1)
+
+
+    elif args.mode == "search":
+
+        if args.query is None:
+            print("The search mode needs the words to search. Please specify them using the -q option.")
+            exit(1)
+
+        if args.db is not None or args.path is None:
+            print("The search mode needs the path of a .GED file.")
+            exit(1)
+
+        if args.index and args.path == '-':
+            print("The --index option can't be used with the standard input.")
+            exit(1)
+
+        search(args.path, args.query, args.index)
+        exit(0)
+
+
+    elif args.mode == "export":
+
+        if args.output is None:
+            print("The export mode needs the path of the file to write. Please specify it using the -o option.")
+            exit(1)
+
+        if args.db is not None:
+            print("The export mode needs a .GED file.")
+            exit(1)
+
+        # Check that NumPy is installed before loading the .GED file
+        from graph_arrays import import_numpy
+        try: import_numpy()
+        except Exception as e:
+            print(e)
+            exit(1)
+
+        ged_data: 'GEDData' = load_data(args)
+        export(ged_data, args.output, args.format)
+        exit(0)
+
+
+    elif args.mode == "diff":
+
+        if args.path is None or args.new_path is None:
+            print("The diff mode needs the paths of the old and of the new .GED files.")
+            exit(1)
+
+        if args.path == '-':
+            print("The old .GED file can't be the standard input, as it is read twice.")
+            exit(1)
+
+        # Like diff, the exit code tells if the files differ
+        exit(0 if diff(args.path, args.new_path) else 1)
+
+
+    elif args.mode == "import":
+
+        if args.path is None or args.db is None:
+            print("The import mode needs the path of the .GED file and the path of the database (--db option).")
+            exit(1)
+
+        import_ged_file(args.path, args.db)
         exit(0)
         
 
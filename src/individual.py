@@ -15,7 +15,9 @@ class Individual:
 
 
     id: int = 0
-    generation: int = 0
+    reference: str = None           # The individual reference, for example @I12@
+    generation: int = 0             # Generation relative to the founders (0), set by GEDData. None if in a cycle.
+    component: int = None           # Connected component (individuals linked by families), set by GEDData
 
     _raw_name: str = None
     first_name: str = None # In the form first name /last name/
@@ -31,16 +33,18 @@ class Individual:
     death_date: Date = None
     death_place: str = None
 
-    # father_reference, mother_reference and children_references are used after the creation of the Individual
-    # by the geddata parser to link it to the other individual objects.
+    # child_family_references and spouse_family_references are used after the creation of the Individual
+    # by the geddata parser to link it to its families, then to its parents and children.
 
-    father_reference: str = None
-    mother_reference: str = None
+    child_family_references: 'list[str]' = []      # FAMC: families where this individual is a child
+    spouse_family_references: 'list[str]' = []     # FAMS: families where this individual is a husband or a wife
+
+    child_families: 'list[Family]' = []
+    spouse_families: 'list[Family]' = []
 
     father: 'Individual' = None
     mother: 'Individual' = None
 
-    children_references: 'list[str]' = []
     children: 'list[Individual]' = []
 
 
@@ -74,6 +78,7 @@ class Individual:
 
 
         self.id = int(item.reference.replace('@', '')[1:])
+        self.reference = item.reference
 
         self._raw_name = item.get_value('NAME')
         self.first_name, self.last_name = Individual.separate_names(self._raw_name)
@@ -93,29 +98,159 @@ class Individual:
             self.death_place = death_item.get_value('PLAC')
 
 
-        # Look for a family where this individual is the child
-        family_item = item.get_value('FAMC')
-        if family_item:
-            try: self.father_reference = family_item.get_child('HUSB').value # Get the reference string to the father
-            except: pass
-            try: self.mother_reference = family_item.get_child('WIFE').value # Get the reference string to the mother
-            except: pass
+        # Only keep the references to the families: they are linked by the GEDData parser
+        self.child_family_references = [family.value for family in item.get_children('FAMC')]
+        self.spouse_family_references = [family.value for family in item.get_children('FAMS')]
+        self.child_families = []
+        self.spouse_families = []
+
+
+
+    @classmethod
+    def from_values(cls, id: int, raw_name: str, sex: str = None,
+                    birth_date: str = None, birth_place: str = None,
+                    death_date: str = None, death_place: str = None) -> 'Individual':
+        """Create an individual from already extracted values instead of an INDI item.
+
+        Used when the individuals do not come from a parsed .GED file (a database for example).
+        The parents and children are not linked.
+        """
+        indi: Individual = cls.__new__(cls)
+
+        indi.id = id
+        indi.reference = f"@I{id}@"
+        indi._raw_name = raw_name or ''
+
+        # A name without slashes (or no name) is read as first names only
+        if '/' in indi._raw_name: indi.first_name, indi.last_name = Individual.separate_names(indi._raw_name)
+        else: indi.first_name, indi.last_name = indi._raw_name, ''
+        indi.sex = sex
+
+        if birth_date is not None or birth_place is not None:
+            indi.birth_date = Date(birth_date)
+            indi.birth_place = birth_place
+
+        if death_date is not None or death_place is not None:
+            indi.death_date = Date(death_date)
+            indi.death_place = death_place
+
+        indi.child_family_references = []
+        indi.spouse_family_references = []
+        indi.child_families = []
+        indi.spouse_families = []
+        indi.children = []
+
+        return indi
+
+
+
+
+    def link_families(self, child_families: 'list[Family]', spouse_families: 'list[Family]') -> None:
+        """Link this individual to its families, then to its parents and children.
+
+        The parents are the husband and the wife of the first family where this individual is a child.
+        The children are the children of every family where this individual is a husband or a wife.
+        """
+        self.child_families = child_families
+        self.spouse_families = spouse_families
+
+        if child_families:
+            self.father = child_families[0].husband
+            self.mother = child_families[0].wife
+
+        self.children = []
+        for family in spouse_families:
+            self.children += family.children
+
+
+
+
+    def get_parents(self) -> 'list[Individual]':
+        """Return every parent of this individual, from every family where it is a child."""
+        parents: list[Individual] = []
+        for family in self.child_families:
+            for parent in family.get_parents():
+                if parent not in parents: parents.append(parent)
+        return parents
+
+
+
+    def get_spouses(self) -> 'list[Individual]':
+        """Return the spouses of this individual, in the order of its families."""
+        spouses: list[Individual] = []
+        for family in self.spouse_families:
+            spouse: Individual = family.get_other_spouse(self)
+            if spouse is not None and spouse not in spouses: spouses.append(spouse)
+        return spouses
+
+
+
+    def get_siblings(self) -> 'list[Individual]':
+        """Return the full siblings of this individual: the other children of its families."""
+        siblings: list[Individual] = []
+        for family in self.child_families:
+            for child in family.children:
+                if child is not self and child not in siblings: siblings.append(child)
+        return siblings
+
+
+
+    def get_half_siblings(self) -> 'list[Individual]':
+        """Return the half siblings of this individual: the children its parents had in other families."""
+        half_siblings: list[Individual] = []
+        siblings: list[Individual] = self.get_siblings()
+
+        for parent in self.get_parents():
+            for family in parent.spouse_families:
+                if family in self.child_families: continue
+                for child in family.children:
+                    if child is not self and child not in siblings and child not in half_siblings:
+                        half_siblings.append(child)
+
+        return half_siblings
+
+
+
+    def get_step_parents(self) -> 'list[Individual]':
+        """Return the step parents of this individual: the spouses of its parents that are not its parents."""
+        parents: list[Individual] = self.get_parents()
+        step_parents: list[Individual] = []
+
+        for parent in parents:
+            for spouse in parent.get_spouses():
+                if spouse not in parents and spouse not in step_parents: step_parents.append(spouse)
+
+        return step_parents
+
+
+
+    def get_step_children(self) -> 'list[Individual]':
+        """Return the step children of this individual: the children of its spouses that are not its children."""
+        step_children: list[Individual] = []
+
+        for spouse in self.get_spouses():
+            for family in spouse.spouse_families:
+                if self in family.get_parents(): continue
+                for child in family.children:
+                    if child not in self.children and child not in step_children: step_children.append(child)
+
+        return step_children
+
+
 
+    def get_step_siblings(self) -> 'list[Individual]':
+        """Return the step siblings of this individual: the children of its step parents that share no parent with it."""
+        parents: list[Individual] = self.get_parents()
+        step_siblings: list[Individual] = []
 
-        # Look for families where this individual is the father or the mother
-        family_items_references: 'list[str]' = item.get_children('FAMS')
-        family_items: 'list[Item]' = []
-        for family_item_reference in family_items_references:
-            family_items.append(family_item_reference.get_value())
+        for step_parent in self.get_step_parents():
+            for child in step_parent.children:
+                if child is self or child in step_siblings: continue
+                if any(parent in parents for parent in child.get_parents()): continue
+                step_siblings.append(child)
 
+        return step_siblings
 
-        self.children_references = []
-        # For each family, add the children reference to this individual
-        for family_item in family_items:
-            # Add each child reference to this individual
-            children_items_references: 'list[str]' = family_item.get_children('CHIL')
-            for child_item_reference in children_items_references:
-                self.children_references.append(child_item_reference.value)
 
 
 
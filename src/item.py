@@ -1,3 +1,6 @@
+import ansel    # Registers the 'ansel' codec used to decode the values
+
+
 class Item:
 
 
@@ -7,11 +10,60 @@ class Item:
     level: int = None               # The item level in the tree
     identifier: str = None          # The item identifier
     reference: str = None           # The item reference value, if any
-    value: str = None               # The item value, if any
     children: 'list[Item]' = []     # List of this item's children
 
     _referenced_item: 'Item' = None # The item referenced by the value, if any
 
+    # The value is kept as read in the file, and only decoded the first time it is accessed
+    _raw_value: bytes = None
+    _encoding: str = 'utf-8'
+    _value: str = None
+
+
+
+    def __init__(self) -> None:
+        self.children = []
+
+
+
+    @property
+    def value(self) -> str:
+        """The item value, if any. Decoded from the file encoding on first access."""
+        if self._value is None and self._raw_value is not None:
+            self._value = self._raw_value.decode(self._encoding, 'replace')
+        return self._value
+
+
+    @value.setter
+    def value(self, value: str) -> None:
+        self._value = value
+        self._raw_value = None
+
+
+    def set_raw_value(self, raw_value: bytes, encoding: str) -> None:
+        """Set the value as read in the file. It will be decoded when accessed."""
+        self._raw_value = raw_value
+        self._encoding = encoding
+        self._value = None
+
+
+    def is_pointer(self) -> bool:
+        """Return True if the value is a reference to another item (like @F12@), without decoding it."""
+        if self._raw_value is not None:
+            return len(self._raw_value) > 2 and self._raw_value[:1] == self._raw_value[-1:] == b'@'
+        return self._value is not None and len(self._value) > 2 and self._value[0] == self._value[-1] == '@'
+
+
+    def get_text(self) -> str:
+        """Return the value with the values of its CONT and CONC children (the continuation lines of
+        long texts) joined: CONT starts a new line, CONC continues the same line.
+        """
+        parts: list[str] = [self.value or '']
+        for child in self.children:
+            if child.identifier == 'CONT': parts += ['\n', child.value or '']
+            elif child.identifier == 'CONC': parts.append(child.value or '')
+        return ''.join(parts)
+
 
     def __str__(self) -> str:
         if self.identifier == 'INDI':
@@ -26,8 +78,7 @@ class Item:
     def link_references(self, ref_dict: dict) -> None:
         """Link the references for itself and every of its children"""
 
-        for key in ref_dict:
-            if key == self.value: self._referenced_item = ref_dict[key]
+        if self.is_pointer(): self._referenced_item = ref_dict.get(self.value)
 
         for child in self.children:
             child.link_references(ref_dict)
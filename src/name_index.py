@@ -0,0 +1,139 @@
+# This file is used to search individuals by approximate name (Willem/William, Smyth/Smith, etc.).
+
+import phonetic
+from individual import Individual
+
+
+class BKTree:
+    """Burkhard-Keller tree of words, used to find the words within a given edit distance of a
+    word without computing the distance with every word.
+
+    Each node is a word and its children are stored by their distance to this word. Thanks to the
+    triangle inequality, only the children whose distance is within [d - radius, d + radius]
+    need to be visited.
+    """
+
+    _root: tuple = None     # (word, {distance: child node})
+
+
+
+
+    def add(self, word: str) -> None:
+        """Add a word to the tree. Adding a word twice does nothing."""
+        if self._root is None:
+            self._root = (word, {})
+            return
+
+        node: tuple = self._root
+        while True:
+            distance: int = phonetic.levenshtein(word, node[0])
+            if distance == 0: return
+            child: tuple = node[1].get(distance)
+            if child is None:
+                node[1][distance] = (word, {})
+                return
+            node = child
+
+
+
+    def search(self, word: str, radius: int) -> 'list[tuple[int, str]]':
+        """Return the (distance, word) of every word within radius of the given word."""
+        if self._root is None: return []
+
+        found: list[tuple[int, str]] = []
+        nodes: list[tuple] = [self._root]
+
+        while nodes:
+            node_word, children = nodes.pop()
+            distance: int = phonetic.levenshtein(word, node_word)
+            if distance <= radius: found.append((distance, node_word))
+
+            for child_distance, child in children.items():
+                if distance - radius <= child_distance <= distance + radius: nodes.append(child)
+
+        return found
+
+
+
+
+class NameIndex:
+    """Index of the words of the individuals' names.
+
+    Every distinct (normalized) word is stored in a BK-tree and in a Soundex index, with the
+    list of the individuals whose name contains it. A search looks for the words close to each
+    word of the query, by edit distance or by sound, and ranks the individuals by the sum of
+    the distances of their best matching words.
+    """
+
+    _tree: BKTree
+    _postings: dict         # word -> list of individuals having this word in their name
+    _soundex: dict          # Soundex code -> set of words
+
+
+
+
+    @staticmethod
+    def get_radius(word: str) -> int:
+        """Maximum edit distance accepted for a word of the query: about 1 error every 3 letters."""
+        return max(1, len(word) // 3)
+
+
+
+
+    def __init__(self, individuals: 'list[Individual]') -> None:
+        self._tree = BKTree()
+        self._postings = {}
+        self._soundex = {}
+
+        for indi in individuals:
+            for word in set(phonetic.normalize(indi._raw_name).split()):
+                if word not in self._postings:
+                    self._postings[word] = []
+                    self._tree.add(word)
+                    self._soundex.setdefault(phonetic.soundex(word), set()).add(word)
+                self._postings[word].append(indi)
+
+
+
+    def get_close_words(self, word: str) -> dict:
+        """Return the words close to the given one, by edit distance or by sound, with their distance."""
+        close_words: dict = {w: d for d, w in self._tree.search(word, self.get_radius(word))}
+
+        # Words sounding the same are accepted even if they are further away
+        for w in self._soundex.get(phonetic.soundex(word), ()):
+            if w not in close_words: close_words[w] = phonetic.levenshtein(word, w)
+
+        return close_words
+
+
+
+    def search(self, query: str, k: int = 10) -> 'list[tuple[int, Individual]]':
+        """Return the (score, individual) of the k individuals whose name is the closest to the query,
+        the best first (every matching individual if k is None).
+
+        The score is the sum, for each word of the query, of the distance to the closest word
+        of the name (or the length of the word if no close word is in the name).
+        """
+        query_words: list[str] = phonetic.normalize(query).split()
+        if not query_words: return []
+
+        # best_distances[individual][i] is the distance of the closest word to the i-th query word
+        best_distances: dict = {}
+        for i, word in enumerate(query_words):
+            for close_word, distance in self.get_close_words(word).items():
+                for indi in self._postings[close_word]:
+                    distances: list[int] = best_distances.setdefault(indi, [len(w) for w in query_words])
+                    distances[i] = min(distances[i], distance)
+
+        results: list[tuple[int, Individual]] = [(sum(distances), indi) for indi, distances in best_distances.items()]
+        results.sort(key=lambda result: (result[0], result[1].id))
+
+        return results[:k] if k is not None else results
+
+
+
+    def best_matches(self, query: str) -> 'list[Individual]':
+        """Return every individual sharing the best score for the query (see search())."""
+        results: list[tuple[int, Individual]] = self.search(query, k=None)
+        if not results: return []
+        return [indi for score, indi in results if score == results[0][0]]
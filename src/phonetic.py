@@ -0,0 +1,67 @@
+# This file contains helpers used to compare names whose spelling varies (Smith/Smyth, etc.).
+
+import unicodedata
+
+
+SOUNDEX_CODES: dict = {
+    **dict.fromkeys("BFPV", '1'),
+    **dict.fromkeys("CGJKQSXZ", '2'),
+    **dict.fromkeys("DT", '3'),
+    'L': '4',
+    **dict.fromkeys("MN", '5'),
+    'R': '6',
+}
+
+
+
+
+def normalize(name: str) -> str:
+    """Return the name in upper case, without accents, '/', '_' or any character other than
+    letters, digits and single spaces between words.
+    """
+    if not name: return ''
+    name = unicodedata.normalize('NFKD', name)
+    name = ''.join(c for c in name if not unicodedata.combining(c))
+    name = name.replace('/', ' ').replace('_', ' ').upper()
+    name = ''.join(c if c.isalnum() else ' ' for c in name)
+    return ' '.join(name.split())
+
+
+
+
+def soundex(word: str) -> str:
+    """Return the American Soundex code of the word (for example R163 for Robert and Rupert).
+
+    Returns an empty string if the word contains no letter.
+    """
+    word = ''.join(c for c in normalize(word) if c.isalpha())
+    if not word: return ''
+
+    code: str = word[0]
+    previous: str = SOUNDEX_CODES.get(word[0], '')
+
+    for c in word[1:]:
+        digit: str = SOUNDEX_CODES.get(c, '')
+        if digit and digit != previous: code += digit
+        # H and W don't separate letters with the same code, vowels do
+        if c not in "HW": previous = digit
+        if len(code) == 4: break
+
+    return code.ljust(4, '0')
+
+
+
+
+def levenshtein(a: str, b: str) -> int:
+    """Return the edit distance between a and b (insertions, deletions and substitutions)."""
+    if len(a) < len(b): a, b = b, a
+    if not b: return len(a)
+
+    previous_row: list[int] = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        row: list[int] = [i]
+        for j, cb in enumerate(b, 1):
+            row.append(min(previous_row[j] + 1, row[j - 1] + 1, previous_row[j - 1] + (ca != cb)))
+        previous_row = row
+
+    return previous_row[-1]
@@ -0,0 +1,182 @@
+# This file is used to organize the places of a .GED file in a hierarchy.
+# In a .GED file, a place is a comma-separated list of jurisdictions, from the smallest to the
+# largest, for example "Munich, Bavaria, Germany".
+
+from individual import Individual
+
+
+class PlaceNode:
+    """A jurisdiction of the place hierarchy (Germany, then Bavaria, then Munich, etc.)."""
+
+    name: str                           # Name as written in the file
+    parent: 'PlaceNode'
+    children: dict                      # Normalized name -> PlaceNode
+    births: 'list[Individual]'          # Individuals born exactly at this place (not in a sub-place)
+    deaths: 'list[Individual]'          # Individuals dead exactly at this place
+
+
+
+    def __init__(self, name: str, parent: 'PlaceNode') -> None:
+        self.name = name
+        self.parent = parent
+        self.children = {}
+        self.births = []
+        self.deaths = []
+
+
+
+    def get_full_name(self) -> str:
+        """Return the place as written in a .GED file: from the smallest jurisdiction to the largest."""
+        names: list[str] = []
+        node: PlaceNode = self
+        while node is not None and node.parent is not None:
+            names.append(node.name)
+            node = node.parent
+        return ', '.join(names)
+
+
+
+    def get_parents(self):
+        """Yield the jurisdictions containing this node, from the smallest to the largest."""
+        node: PlaceNode = self.parent
+        while node is not None:
+            yield node
+            node = node.parent
+
+
+
+    def walk(self):
+        """Yield this node and every node under it."""
+        nodes: list[PlaceNode] = [self]
+        while nodes:
+            node: PlaceNode = nodes.pop()
+            yield node
+            nodes += node.children.values()
+
+
+
+    def get_births(self) -> 'list[Individual]':
+        """Return the individuals born at this place or anywhere inside it."""
+        return [indi for node in self.walk() for indi in node.births]
+
+
+
+    def get_deaths(self) -> 'list[Individual]':
+        """Return the individuals dead at this place or anywhere inside it."""
+        return [indi for node in self.walk() for indi in node.deaths]
+
+
+
+    def count_births(self) -> int:
+        return sum(len(node.births) for node in self.walk())
+
+
+
+
+class PlaceTrie:
+    """Hierarchy of every birth and death place of a list of individuals.
+
+    The places are split on commas and stored from the largest jurisdiction (the root's
+    children) to the smallest, so everything located in a region is under the node of
+    this region. Nodes can also be found by name, at any level, so "Bavaria" finds the
+    node of "Bavaria, Germany".
+    """
+
+    root: PlaceNode
+    _nodes_by_name: dict                # Normalized name -> list of nodes with this name
+
+
+
+
+    @staticmethod
+    def split(place: str) -> 'list[str]':
+        """Return the jurisdictions of the place, from the largest to the smallest, as written in the file."""
+        if not place: return []
+        return [part.strip() for part in reversed(place.split(',')) if part.strip()]
+
+
+
+    @staticmethod
+    def normalize(name: str) -> str:
+        return ' '.join(name.lower().split())
+
+
+
+
+    def __init__(self, individuals: 'list[Individual]') -> None:
+        self.root = PlaceNode('', None)
+        self._nodes_by_name = {}
+
+        for indi in individuals:
+            if indi.birth_place: self.get_node(indi.birth_place, create = True).births.append(indi)
+            if indi.death_place: self.get_node(indi.death_place, create = True).deaths.append(indi)
+
+
+
+    def get_node(self, place: str, create: bool = False) -> PlaceNode:
+        """Return the node of the place, following the full hierarchy from the largest jurisdiction.
+        If create is True, the missing nodes are created. Otherwise, None is returned if the place is unknown.
+        """
+        node: PlaceNode = self.root
+        for name in self.split(place):
+            key: str = self.normalize(name)
+            child: PlaceNode = node.children.get(key)
+
+            if child is None:
+                if not create: return None
+                child = PlaceNode(name, node)
+                node.children[key] = child
+                self._nodes_by_name.setdefault(key, []).append(child)
+
+            node = child
+
+        return node
+
+
+
+    def find_regions(self, region: str) -> 'list[PlaceNode]':
+        """Return the nodes matching the region, at any level of the hierarchy.
+
+        The region can be a single name ("Bavaria") or a partial hierarchy ("Bavaria, Germany"):
+        the nodes named like its largest jurisdiction are searched, then the rest of the
+        hierarchy is followed from them. The nodes inside another matching node are not returned,
+        so every place is in at most one of the returned regions.
+        """
+        names: list[str] = [self.normalize(name) for name in self.split(region)]
+        if not names: return []
+
+        regions: list[PlaceNode] = []
+        for node in self._nodes_by_name.get(names[0], []):
+            for name in names[1:]:
+                node = node.children.get(name)
+                if node is None: break
+            if node is not None: regions.append(node)
+
+        # A match inside another match ("York, York, England") is already part of it
+        matches: set = set(regions)
+        return [node for node in regions if not any(parent in matches for parent in node.get_parents())]
+
+
+
+    def get_births_in(self, region: str) -> 'list[Individual]':
+        """Return the individuals born anywhere in the region (see find_regions())."""
+        return [indi for node in self.find_regions(region) for indi in node.get_births()]
+
+
+
+    def get_deaths_in(self, region: str) -> 'list[Individual]':
+        """Return the individuals dead anywhere in the region (see find_regions())."""
+        return [indi for node in self.find_regions(region) for indi in node.get_deaths()]
+
+
+
+    @staticmethod
+    def is_in(place: str, region: str) -> bool:
+        """Return True if the place is located in the region, with the same rules as find_regions()."""
+        place_names: list[str] = [PlaceTrie.normalize(name) for name in PlaceTrie.split(place)]
+        region_names: list[str] = [PlaceTrie.normalize(name) for name in PlaceTrie.split(region)]
+        if not region_names: return False
+
+        for start in range(len(place_names) - len(region_names) + 1):
+            if place_names[start:start + len(region_names)] == region_names: return True
+        return False
@@ -0,0 +1,393 @@
+# This file is used to filter individuals with an expression such as:
+#     sex = F and born < 1800 and place ~ "London" and has_children
+#
+# The expression is compiled once into a predicate. When the expression is a conjunction
+# ('and'), the indexes of the GEDData (years, sex, trigrams of names and places) are used to
+# select a small list of candidates, and only these candidates are tested by the predicate.
+
+import re
+from bisect import bisect_left, bisect_right
+from individual import Individual
+from places import PlaceTrie
+
+
+class QueryError(Exception):
+    """Raised when a filter expression is not valid."""
+    pass
+
+
+
+
+class Query:
+    """A compiled filter expression.
+
+    Syntax:
+        expression := condition [ (and | or) condition ]...     ('and' has priority over 'or')
+        condition  := not condition | ( expression ) | field operator value | flag
+        operator   := = | != | < | <= | > | >= | ~  (~ is a case-insensitive regular expression search)
+        value      := number | word | "quoted string"
+
+    Fields are listed in FIELDS and flags in FLAGS. A condition on an unknown value (a year
+    of birth that is not in the file for example) is False.
+    """
+
+    # Field name -> function returning the value of the field for an individual (None if unknown)
+    FIELDS: dict = {
+        "id": lambda indi: indi.id,
+        "name": lambda indi: indi.get_cleared_raw_name(),
+        "first_name": lambda indi: indi.first_name,
+        "last_name": lambda indi: indi.last_name,
+        "sex": lambda indi: indi.sex,
+        "born": lambda indi: indi.birth_date.get_year() if indi.birth_date else None,
+        "died": lambda indi: indi.death_date.get_year() if indi.death_date else None,
+        "birth_place": lambda indi: indi.birth_place,
+        "death_place": lambda indi: indi.death_place,
+        "place": lambda indi: [place for place in (indi.birth_place, indi.death_place) if place],
+        "born_in": lambda indi: indi.birth_place,
+        "died_in": lambda indi: indi.death_place,
+        "generation": lambda indi: indi.generation,
+        "component": lambda indi: indi.component,
+        "children": lambda indi: len(indi.children),
+    }
+
+    NUMERIC_FIELDS: 'list[str]' = ["id", "born", "died", "generation", "component", "children"]
+
+    # Fields compared with a region: 'born_in = Bavaria' matches every place located in Bavaria
+    REGION_FIELDS: 'list[str]' = ["born_in", "died_in"]
+
+    FLAGS: dict = {
+        "has_children": lambda indi: len(indi.children) > 0,
+        "has_parents": lambda indi: indi.father is not None or indi.mother is not None,
+        "has_spouse": lambda indi: len(indi.spouse_families) > 0,
+        "has_birth": lambda indi: indi.birth_date is not None,
+        "has_death": lambda indi: indi.death_date is not None,
+    }
+
+    TOKEN_REGEX = re.compile(r'\s*(?:(?P<string>"(?:[^"\\]|\\.)*")|(?P<operator><=|>=|!=|=|<|>|~)|(?P<parenthesis>[()])|(?P<word>[^\s()<>=!~"]+))')
+
+    expression: str
+    predicate = None            # Function taking an individual and returning True if it matches
+    conditions: 'list[tuple]'   # Conditions (field, operator, value) joined by 'and' at the top level
+
+    _tokens: 'list[tuple[str, str]]'
+    _position: int
+
+
+
+
+    def __init__(self, expression: str) -> None:
+        """Compile the expression. Raise a QueryError if it is not valid."""
+        self.expression = expression
+        self._tokens = self.tokenize(expression)
+        self._position = 0
+        self.conditions = []
+
+        if not self._tokens: raise QueryError("Empty filter expression.")
+
+        tree: tuple = self._parse_or()
+        if self._position < len(self._tokens):
+            raise QueryError(f"Unexpected '{self._tokens[self._position][1]}' in the filter expression.")
+
+        self.predicate = self._compile(tree)
+
+        # Keep the conditions of the top level conjunction: they can be used to select candidates
+        top_level: list[tuple] = tree[1] if tree[0] == "and" else [tree]
+        self.conditions = [node[1:] for node in top_level if node[0] == "compare"]
+
+
+
+
+    @staticmethod
+    def tokenize(expression: str) -> 'list[tuple[str, str]]':
+        """Return the list of (kind, text) tokens of the expression."""
+        tokens: list[tuple[str, str]] = []
+        position: int = 0
+        expression = expression.rstrip()
+
+        while position < len(expression):
+            match = Query.TOKEN_REGEX.match(expression, position)
+            if match is None: raise QueryError(f"Invalid character '{expression[position:].strip()[0]}' in the filter expression.")
+
+            kind: str = match.lastgroup
+            text: str = match.group(kind)
+            if kind == "string": text = re.sub(r'\\(.)', r'\1', text[1:-1])
+            tokens.append((kind, text))
+            position = match.end()
+
+        return tokens
+
+
+
+
+    def _peek(self) -> 'tuple[str, str]':
+        return self._tokens[self._position] if self._position < len(self._tokens) else (None, None)
+
+
+
+    def _next(self) -> 'tuple[str, str]':
+        token: tuple[str, str] = self._peek()
+        if token[0] is None: raise QueryError("Unexpected end of the filter expression.")
+        self._position += 1
+        return token
+
+
+
+    def _parse_or(self) -> tuple:
+        nodes: list[tuple] = [self._parse_and()]
+        while self._peek() == ("word", "or"):
+            self._next()
+            nodes.append(self._parse_and())
+        return nodes[0] if len(nodes) == 1 else ("or", nodes)
+
+
+
+    def _parse_and(self) -> tuple:
+        nodes: list[tuple] = [self._parse_not()]
+        while self._peek() == ("word", "and"):
+            self._next()
+            nodes.append(self._parse_not())
+        return nodes[0] if len(nodes) == 1 else ("and", nodes)
+
+
+
+    def _parse_not(self) -> tuple:
+        if self._peek() == ("word", "not"):
+            self._next()
+            return ("not", self._parse_not())
+        return self._parse_condition()
+
+
+
+    def _parse_condition(self) -> tuple:
+        kind, text = self._next()
+
+        if (kind, text) == ("parenthesis", "("):
+            node: tuple = self._parse_or()
+            if self._next() != ("parenthesis", ")"): raise QueryError("Missing ')' in the filter expression.")
+            return node
+
+        if kind != "word": raise QueryError(f"Unexpected '{text}' in the filter expression.")
+
+        if text in self.FLAGS: return ("flag", text)
+        if text not in self.FIELDS:
+            raise QueryError(f"Unknown field '{text}'. Available fields: {', '.join(self.FIELDS)}. Available flags: {', '.join(self.FLAGS)}.")
+
+        operator_kind, operator = self._next()
+        if operator_kind != "operator": raise QueryError(f"Expected an operator after '{text}', got '{operator}'.")
+
+        value_kind, value = self._next()
+        if value_kind not in ("word", "string"): raise QueryError(f"Expected a value after '{text} {operator}', got '{value}'.")
+
+        if text in self.REGION_FIELDS and operator not in ("=", "!="):
+            raise QueryError(f"The field '{text}' can only be used with = and !=.")
+
+        if text in self.NUMERIC_FIELDS and operator != "~":
+            try: value = int(value)
+            except ValueError: raise QueryError(f"The field '{text}' needs a number, got '{value}'.")
+
+        if operator == "~":
+            try: re.compile(value)
+            except re.error as e: raise QueryError(f"Invalid regular expression '{value}': {e}")
+
+        return ("compare", text, operator, value)
+
+
+
+
+    def _compile(self, node: tuple):
+        """Return the function evaluating the given node of the expression tree."""
+        kind: str = node[0]
+
+        if kind == "and":
+            predicates: list = [self._compile(child) for child in node[1]]
+            return lambda indi: all(predicate(indi) for predicate in predicates)
+
+        if kind == "or":
+            predicates: list = [self._compile(child) for child in node[1]]
+            return lambda indi: any(predicate(indi) for predicate in predicates)
+
+        if kind == "not":
+            predicate = self._compile(node[1])
+            return lambda indi: not predicate(indi)
+
+        if kind == "flag":
+            return self.FLAGS[node[1]]
+
+        _, field, operator, value = node
+        get_value = self.FIELDS[field]
+
+        if field in self.REGION_FIELDS:
+            if operator == "=": test = lambda place: PlaceTrie.is_in(place, value)
+            else: test = lambda place: not PlaceTrie.is_in(place, value)
+        else:
+            test = self._compile_test(operator, value, field in self.NUMERIC_FIELDS)
+
+        def compare(indi: Individual) -> bool:
+            field_value = get_value(indi)
+            if field_value is None: return False
+            # Fields with multiple values (place) match if any of their values match
+            if isinstance(field_value, list): return any(test(v) for v in field_value)
+            return test(field_value)
+
+        return compare
+
+
+
+    @staticmethod
+    def _compile_test(operator: str, value, numeric: bool):
+        """Return the function comparing a field value with the value of the condition."""
+        if operator == "~":
+            regex = re.compile(value, re.IGNORECASE)
+            return lambda field_value: regex.search(str(field_value)) is not None
+
+        if not numeric:
+            # Strings are compared without case
+            value = value.lower()
+            normalize = lambda field_value: str(field_value).lower()
+        else:
+            normalize = lambda field_value: field_value
+
+        if operator == "=": return lambda field_value: normalize(field_value) == value
+        if operator == "!=": return lambda field_value: normalize(field_value) != value
+        if operator == "<": return lambda field_value: normalize(field_value) < value
+        if operator == "<=": return lambda field_value: normalize(field_value) <= value
+        if operator == ">": return lambda field_value: normalize(field_value) > value
+        return lambda field_value: normalize(field_value) >= value
+
+
+
+
+    def filter(self, ged_data):
+        """Yield, lazily, the individuals of ged_data matching the expression (in no particular order).
+
+        If ged_data has indexes (see GEDData.get_index()), the condition of the top level
+        conjunction selecting the fewest candidates is used to avoid testing every individual.
+        """
+        candidates = None
+        if hasattr(ged_data, "get_index"):
+            for condition in self.conditions:
+                condition_candidates = QueryIndexes.get_candidates(ged_data, *condition)
+                if condition_candidates is not None and (candidates is None or len(condition_candidates) < len(candidates)):
+                    candidates = condition_candidates
+
+        if candidates is None: candidates = ged_data.individuals
+
+        return (indi for indi in candidates if self.predicate(indi))
+
+
+
+
+class QueryIndexes:
+    """Indexes used by Query to select the candidates of a condition, built on demand by the GEDData.
+
+    - years: the individuals sorted by year of birth (or death), searched by bisection;
+    - sex: the individuals of each sex;
+    - places: the hierarchy of places (see PlaceTrie), for regions;
+    - trigrams: for names and places, the individuals whose value contains each 3-letter sequence.
+      The individuals containing a text are among the ones containing all of its trigrams.
+
+    Every method returns a superset of the individuals matching the condition, or None if the
+    condition can't use an index.
+    """
+
+    YEAR_FIELDS: dict = {"born": "birth_date", "died": "death_date"}
+    TEXT_FIELDS: 'list[str]' = ["name", "place", "birth_place", "death_place"]
+    REGEX_SPECIAL_CHARACTERS: str = r'.^$*+?{}[]\|()'
+
+
+
+
+    @staticmethod
+    def get_candidates(ged_data, field: str, operator: str, value) -> list:
+        if field in QueryIndexes.YEAR_FIELDS and operator in ("=", "<", "<=", ">", ">="):
+            return QueryIndexes.get_year_candidates(ged_data, field, operator, value)
+
+        if field in Query.REGION_FIELDS and operator == "=":
+            trie: PlaceTrie = ged_data.get_place_trie()
+            return trie.get_births_in(value) if field == "born_in" else trie.get_deaths_in(value)
+
+        if field == "sex" and operator == "=":
+            return ged_data.get_index("query:sex", QueryIndexes.build_sex_index).get(value.upper(), [])
+
+        if field == "component" and operator == "=":
+            return ged_data.get_component(value)
+
+        if field in QueryIndexes.TEXT_FIELDS and operator in ("=", "~"):
+            # A regular expression can only use the index if it is a plain text
+            if operator == "~" and any(c in QueryIndexes.REGEX_SPECIAL_CHARACTERS for c in value): return None
+            return QueryIndexes.get_text_candidates(ged_data, field, value)
+
+        return None
+
+
+
+    @staticmethod
+    def get_year_candidates(ged_data, field: str, operator: str, value: int) -> list:
+        years, individuals = ged_data.get_index(f"query:{field}", lambda data: QueryIndexes.build_year_index(data, field))
+
+        if operator == "=": return individuals[bisect_left(years, value):bisect_right(years, value)]
+        if operator == "<": return individuals[:bisect_left(years, value)]
+        if operator == "<=": return individuals[:bisect_right(years, value)]
+        if operator == ">": return individuals[bisect_right(years, value):]
+        return individuals[bisect_left(years, value):]
+
+
+
+    @staticmethod
+    def get_text_candidates(ged_data, field: str, text: str) -> list:
+        text = text.lower()
+        if len(text) < 3: return None
+
+        trigrams: dict = ged_data.get_index(f"query:{field}", lambda data: QueryIndexes.build_trigram_index(data, field))
+
+        positions: set = None
+        for i in range(len(text) - 2):
+            trigram_positions: set = trigrams.get(text[i:i + 3], set())
+            positions = trigram_positions if positions is None else positions & trigram_positions
+            if not positions: return []
+
+        return [ged_data.individuals[position] for position in sorted(positions)]
+
+
+
+
+    @staticmethod
+    def build_year_index(ged_data, field: str) -> 'tuple[list[int], list[Individual]]':
+        """Return the years, sorted, and the individuals in the same order."""
+        dated: list[tuple[int, int]] = []
+        for position, indi in enumerate(ged_data.individuals):
+            date = getattr(indi, QueryIndexes.YEAR_FIELDS[field])
+            year: int = date.get_year() if date else None
+            if year is not None: dated.append((year, position))
+
+        dated.sort()
+        return [year for year, _ in dated], [ged_data.individuals[position] for _, position in dated]
+
+
+
+    @staticmethod
+    def build_sex_index(ged_data) -> dict:
+        index: dict = {}
+        for indi in ged_data.individuals:
+            if indi.sex: index.setdefault(indi.sex.upper(), []).append(indi)
+        return index
+
+
+
+    @staticmethod
+    def build_trigram_index(ged_data, field: str) -> dict:
+        """Return, for each trigram, the set of the positions of the individuals containing it."""
+        get_value = Query.FIELDS[field]
+        index: dict = {}
+
+        for position, indi in enumerate(ged_data.individuals):
+            values = get_value(indi)
+            if values is None: continue
+            if not isinstance(values, list): values = [values]
+
+            for value in values:
+                value = value.lower()
+                for i in range(len(value) - 2):
+                    index.setdefault(value[i:i + 3], set()).add(position)
+
+        return index
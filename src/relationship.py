@@ -0,0 +1,175 @@
+# This file is used to find how two individuals are related (siblings, second cousins once removed, etc.).
+
+from individual import Individual
+
+
+ORDINALS: 'list[str]' = ["", "first", "second", "third", "fourth", "fifth", "sixth", "seventh", "eighth", "ninth", "tenth"]
+TIMES: 'list[str]' = ["", "once", "twice", "thrice"]
+
+
+
+
+def numbered(n: int) -> str:
+    """Return '1st', '2nd', '3rd', '4th', etc."""
+    suffix: str = "th" if 10 <= n % 100 <= 20 else {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
+    return f"{n}{suffix}"
+
+
+
+def ordinal(n: int) -> str:
+    """Return 'first', 'second', etc. for small numbers, '11th', '12th', etc. otherwise."""
+    return ORDINALS[n] if n < len(ORDINALS) else numbered(n)
+
+
+
+def times(n: int) -> str:
+    """Return 'once', 'twice', etc. for small numbers, '4 times', etc. otherwise."""
+    return TIMES[n] if n < len(TIMES) else f"{n} times"
+
+
+
+def greats(n: int) -> str:
+    """Return the prefix for n generations above 'grand': '', 'great-', '2nd great-', etc."""
+    if n == 0: return ""
+    if n == 1: return "great-"
+    return f"{numbered(n)} great-"
+
+
+
+
+class Relationship:
+    """Blood relationship between two individuals, through their closest common ancestors.
+
+    first_path goes from the first individual up to the common ancestor (both included), and
+    second_path from the second individual up to the same ancestor. Their lengths give the
+    relationship: 2 and 2 are siblings, 3 and 3 first cousins, 3 and 4 first cousins once removed...
+    """
+
+    first: Individual
+    second: Individual
+    ancestors: 'list[Individual]'       # Closest common ancestors (usually a couple)
+    first_path: 'list[Individual]'      # From first to ancestors[0]
+    second_path: 'list[Individual]'     # From second to ancestors[0]
+
+
+
+
+    @staticmethod
+    def get_parents(indi: Individual) -> 'list[Individual]':
+        return [parent for parent in (indi.father, indi.mother) if parent is not None]
+
+
+
+    @staticmethod
+    def find(first: Individual, second: Individual) -> 'Relationship':
+        """Return the relationship between the two individuals, or None if they have no common ancestor.
+
+        Both individuals' ancestors are searched at the same time, generation by generation (the
+        smallest frontier first), until the searches meet. The search stops as soon as no closer
+        common ancestor can be found, so only the generations between the two individuals and
+        their closest common ancestors are visited.
+        """
+        # Individuals of different connected components can't have a common ancestor
+        if None not in (first.component, second.component) and first.component != second.component: return None
+
+        # Distance from each individual, and the child through which each ancestor was reached
+        distances: list[dict] = [{first: 0}, {second: 0}]
+        children: list[dict] = [{first: None}, {second: None}]
+        frontiers: list[list[Individual]] = [[first], [second]]
+        levels: list[int] = [0, 0]
+
+        # Closest meeting found (the individuals can be ancestors of each other)
+        best: int = 0 if first is second else None
+        while True:
+            # A common ancestor not found yet is at least one generation after the last level of a side
+            finished_levels: list[float] = [levels[side] if frontiers[side] else float('inf') for side in (0, 1)]
+            if best is not None and best <= min(finished_levels): break
+            if not frontiers[0] and not frontiers[1]: break
+
+            side: int = 0 if frontiers[0] and (not frontiers[1] or len(frontiers[0]) <= len(frontiers[1])) else 1
+            other: int = 1 - side
+
+            next_frontier: list[Individual] = []
+            for indi in frontiers[side]:
+                for parent in Relationship.get_parents(indi):
+                    if parent in distances[side]: continue
+                    distances[side][parent] = levels[side] + 1
+                    children[side][parent] = indi
+                    next_frontier.append(parent)
+
+                    if parent in distances[other]:
+                        total: int = distances[side][parent] + distances[other][parent]
+                        if best is None or total < best: best = total
+
+            frontiers[side] = next_frontier
+            levels[side] += 1
+
+        if best is None: return None
+
+        common: list[Individual] = [indi for indi, distance in distances[0].items()
+                                    if indi in distances[1] and distance + distances[1][indi] == best]
+        common.sort(key=lambda indi: (distances[0][indi], indi.id))
+
+        # Keep the common ancestors of the same generations as the first one (the couple, usually)
+        relationship: Relationship = Relationship()
+        relationship.first = first
+        relationship.second = second
+        relationship.ancestors = [indi for indi in common if distances[0][indi] == distances[0][common[0]]]
+        relationship.first_path = Relationship.get_path(common[0], children[0])
+        relationship.second_path = Relationship.get_path(common[0], children[1])
+        return relationship
+
+
+
+    @staticmethod
+    def get_path(ancestor: Individual, children: dict) -> 'list[Individual]':
+        """Return the path from the start of a search up to the ancestor, following the children found by the search."""
+        path: list[Individual] = [ancestor]
+        while children[path[-1]] is not None: path.append(children[path[-1]])
+        path.reverse()
+        return path
+
+
+
+
+    def is_half(self) -> bool:
+        """Return True if the individuals only share one of the ancestors of the closest generation, through
+        children this ancestor had in different families. If the other parent is just unknown (the
+        children are in the same family), the relationship is not half."""
+        if len(self.ancestors) != 1 or len(self.first_path) < 2 or len(self.second_path) < 2: return False
+
+        # Families of the ancestor through which each path goes
+        ancestor: Individual = self.ancestors[0]
+        families: list[set] = [{family for family in path[-2].child_families if ancestor in (family.husband, family.wife)}
+                               for path in (self.first_path, self.second_path)]
+        return all(families) and families[0].isdisjoint(families[1])
+
+
+
+    def get_name(self) -> str:
+        """Return the relationship of the first individual to the second one, for example 'first cousin once removed'."""
+        up: int = len(self.first_path) - 1          # Generations between the first individual and the ancestor
+        down: int = len(self.second_path) - 1       # Generations between the second individual and the ancestor
+        sex: str = self.first.sex
+        gendered = lambda male, female, neutral: male if sex == "M" else female if sex == "F" else neutral
+        half: str = "half-" if self.is_half() else ""
+
+        if up == 0 and down == 0: return "same individual"
+
+        # Direct line
+        if up == 0:
+            if down == 1: return gendered("father", "mother", "parent")
+            return greats(down - 2) + gendered("grandfather", "grandmother", "grandparent")
+        if down == 0:
+            if up == 1: return gendered("son", "daughter", "child")
+            return greats(up - 2) + gendered("grandson", "granddaughter", "grandchild")
+
+        if up == 1 and down == 1: return half + gendered("brother", "sister", "sibling")
+
+        # Siblings of an ancestor, and descendants of a sibling
+        if up == 1: return half + greats(down - 2) + gendered("uncle", "aunt", "uncle/aunt")
+        if down == 1: return half + greats(up - 2) + gendered("nephew", "niece", "nephew/niece")
+
+        name: str = f"{half}{ordinal(min(up, down) - 1)} cousin"
+        if up != down: name += f" {times(abs(up - down))} removed"
+        return name
@@ -0,0 +1,127 @@
+# This file is used to compute, once for every individual, the size of the tree of its descendants.
+
+import datetime
+from individual import Individual
+
+
+class SubtreeMetrics:
+    """Metrics of the descendants of every individual.
+
+    The metrics are computed in a single pass: the individuals are visited in reverse topological
+    order (children before their parents), so the metrics of an individual are computed from the
+    ones of its children:
+
+    - descendants: the number of descendants, counted once per line of descent (the sum, for each
+      child, of 1 and of its descendants);
+    - living lines: the number of children who are alive or have a living descendant;
+    - depth: the number of generations of descendants (0 without children).
+
+    A descendant reached by several lines (cousin marriages) is counted once per line, so the
+    number of descendants is an upper bound of the distinct descendants, exact without pedigree
+    collapse. The distinct descendants can't be summed from the children: they are only counted,
+    by a traversal, when asked (see count_descendants()).
+
+    The individuals of the parent/child cycles, and their descendants, are computed before the
+    others, until nothing changes. Their depth is None, as it is infinite, and their number of
+    descendants is the number of distinct descendants.
+    """
+
+    MAX_AGE: int = 110                  # Individuals born earlier than MAX_AGE years ago are considered dead
+
+    _numbers: dict                      # Individual -> number
+    _children: 'list[list[int]]'        # Numbers of the children of each individual
+    _lines: 'list[int]'                 # Number of descendants, counted once per line of descent
+    _distinct: dict                     # Number -> number of distinct descendants, for the individuals already counted
+    _living_lines: 'list[int]'          # Number of children alive or with a living descendant
+    _depths: list                       # Number of generations of descendants (None in a cycle)
+
+
+
+
+    @staticmethod
+    def is_living(indi: Individual) -> bool:
+        """Return True if the individual may be alive: no death record, and not born too long ago."""
+        if indi.death_date is not None: return False
+        birth_year: int = indi.birth_date.get_year() if indi.birth_date is not None else None
+        return birth_year is None or birth_year > datetime.date.today().year - SubtreeMetrics.MAX_AGE
+
+
+
+
+    def __init__(self, ged_data) -> None:
+        ordered: set = set(ged_data.topological_order)
+        individuals: list[Individual] = list(ged_data.topological_order) + [indi for indi in ged_data.individuals if indi not in ordered]
+        self._numbers = {indi: number for number, indi in enumerate(individuals)}
+
+        _, children = ged_data.get_parent_child_graph()
+        children_numbers: list[list[int]] = [[self._numbers[child] for child in children[indi]] for indi in individuals]
+        living: list[bool] = [self.is_living(indi) for indi in individuals]
+        self._children = children_numbers
+        self._distinct = {}
+
+        has_living: list[bool] = [False] * len(individuals)     # Alive, or with a living descendant
+        self._depths = [None] * len(individuals)
+        self._lines = [0] * len(individuals)
+
+        def visit(number: int) -> None:
+            has_living[number] = living[number] or any(has_living[child] for child in children_numbers[number])
+
+        # The individuals that can't be ordered only have unordered descendants: repeat until nothing changes.
+        # A cycle has infinitely many lines of descent, so their distinct descendants are counted instead
+        unordered: range = range(len(ged_data.topological_order), len(individuals))
+        for number in unordered: self._lines[number] = self.count_distinct(number)
+        changed: bool = True
+        while changed:
+            changed = False
+            for number in unordered:
+                previous: bool = has_living[number]
+                visit(number)
+                if has_living[number] != previous: changed = True
+
+        # Children come after their parents in the topological order: a single pass backwards is enough
+        for number in reversed(range(len(ged_data.topological_order))):
+            visit(number)
+            self._lines[number] = sum(1 + self._lines[child] for child in children_numbers[number])
+            depths: list = [self._depths[child] for child in children_numbers[number]]
+            if None not in depths: self._depths[number] = 1 + max(depths) if depths else 0
+
+        self._living_lines = [sum(1 for child in children_numbers[number] if has_living[child]) for number in range(len(individuals))]
+
+
+
+    def count_descendants(self, indi: Individual, exact: bool = False) -> int:
+        """Return the number of descendants of the individual, counted once per line of descent (an
+        upper bound with pedigree collapse, see SubtreeMetrics). With exact, return the number of
+        distinct descendants (itself included if it is in a cycle), counted by a traversal."""
+        number: int = self._numbers[indi]
+        return self.count_distinct(number) if exact else self._lines[number]
+
+
+
+    def count_distinct(self, number: int) -> int:
+        """Return the number of distinct descendants of the individual with the given number, and keep it."""
+        count: int = self._distinct.get(number)
+        if count is not None: return count
+
+        descendants: set = set()
+        pending: list[int] = [number]
+        while pending:
+            for child in self._children[pending.pop()]:
+                if child not in descendants:
+                    descendants.add(child)
+                    pending.append(child)
+
+        self._distinct[number] = len(descendants)
+        return len(descendants)
+
+
+
+    def count_living_lines(self, indi: Individual) -> int:
+        """Return the number of children of the individual who are alive or have a living descendant."""
+        return self._living_lines[self._numbers[indi]]
+
+
+
+    def get_depth(self, indi: Individual) -> int:
+        """Return the number of generations of descendants of the individual (None if infinite, in a cycle)."""
+        return self._depths[self._numbers[indi]]
@@ -0,0 +1,214 @@
+# This file is used to check a .GED file before loading it, in a single streaming pass.
+
+import re
+import gedreader
+from date import Date
+
+
+# GEDCOM 5.5.1 dates. Spaces are normalized before matching
+DAY: str = r'\d{1,2}'
+MONTH: str = r'(?:' + '|'.join(Date.MONTHS_TOKENS) + r')'
+YEAR: str = r'\d{1,4}(?:/\d{2})?(?: B\.C\.)?'
+SINGLE_DATE: str = (rf'(?:@#D(?:GREGORIAN|JULIAN)@ )?(?:(?:{DAY} )?{MONTH} )?{YEAR}'
+                    rf'|@#D(?:HEBREW|FRENCH R)@ (?:(?:{DAY} )?[A-Z]{{3,4}} )?\d{{1,4}}')
+DATE_REGEX: re.Pattern = re.compile(rf'(?:{SINGLE_DATE})'
+                                    rf'|(?:ABT|CAL|EST|BEF|AFT|TO) (?:{SINGLE_DATE})'
+                                    rf'|FROM (?:{SINGLE_DATE})(?: TO (?:{SINGLE_DATE}))?'
+                                    rf'|BET (?:{SINGLE_DATE}) AND (?:{SINGLE_DATE})'
+                                    rf'|INT (?:{SINGLE_DATE}) \(.*\)'
+                                    rf'|\(.*\)')
+
+LINE_REGEX: re.Pattern = re.compile(rb'\s*(\d+) +(?:(@[^@]+@) +)?([A-Za-z0-9_]+)(?: (.*))?')
+POINTER_REGEX: re.Pattern = re.compile(rb'@[^@#][^@]*@')
+INDIVIDUAL_REFERENCE_REGEX: re.Pattern = re.compile(r'@[A-Za-z]\d+@')     # The individuals are numbered by their reference
+
+# Records that must have a reference
+REFERENCED_RECORDS: 'list[str]' = ["INDI", "FAM", "SOUR", "REPO", "NOTE", "OBJE", "SUBM", "SUBN"]
+
+# Type of the record each pointer must point to
+POINTER_TYPES: dict = {"FAMC": "FAM", "FAMS": "FAM", "HUSB": "INDI", "WIFE": "INDI", "CHIL": "INDI"}
+
+MAX_LINE_LENGTH: int = 255
+
+
+
+
+class Validator:
+    """Check the structure, pointers, dates and encoding of a .GED file, line by line.
+
+    The file is read once, as a stream: only the type of each reference and the pointers to
+    records not defined yet are kept in memory, so the memory used depends on the number of
+    records, not on the size of the file. validate() yields the issues as dicts:
+
+        {"line": 12, "severity": "error", "code": "dangling-pointer", "message": "..."}
+
+    Errors are the issues that break the loading of the file (or its meaning), warnings the
+    ones that don't follow the GEDCOM standard but can be read anyway.
+    """
+
+    filepath: str
+    nb_errors: int
+    nb_warnings: int
+    nb_lines: int
+
+    _types: dict                # Reference -> tag of its record
+    _definitions: dict          # Reference -> line of its definition
+    _pending: dict              # Reference not defined yet -> list of (line, expected tag) of the pointers to it
+
+
+
+
+    def __init__(self, filepath: str) -> None:
+        self.filepath = filepath
+        self.nb_errors = 0
+        self.nb_warnings = 0
+        self.nb_lines = 0
+        self._types = {}
+        self._definitions = {}
+        self._pending = {}
+
+
+
+    def issue(self, line: int, severity: str, code: str, message: str) -> dict:
+        if severity == "error": self.nb_errors += 1
+        else: self.nb_warnings += 1
+        return {"line": line, "severity": severity, "code": code, "message": message}
+
+
+
+
+    def validate(self):
+        """Read the file and yield every issue found, in the order of the lines (dangling pointers last)."""
+        encoding: str = None
+        previous_level: int = -1
+        record_tag: str = None          # Tag of the current level 0 record
+        record_line: int = None         # Line of the current level 0 record
+        has_name: bool = False          # True if the current record has a NAME
+        first_record: bool = True
+        trailer_line: int = None        # Line of the TRLR record
+
+        def chunks():
+            nonlocal encoding
+            for line_encoding, chunk in gedreader.iter_input_chunks(self.filepath):
+                encoding = line_encoding
+                yield chunk
+
+        last_line: int = 0
+        for number, line in gedreader.iter_numbered_lines(chunks()):
+            self.nb_lines += 1
+            last_line = number
+
+            match = LINE_REGEX.fullmatch(line)
+            if match is None:
+                yield self.issue(number, "error", "malformed-line", "The line is not 'level [@reference@] tag [value]'.")
+                continue
+
+            level: int = int(match.group(1))
+            reference: bytes = match.group(2)
+            tag: str = match.group(3).decode('ascii')
+            value: bytes = match.group(4) or b''
+
+            # Structure
+            if level > previous_level + 1:
+                yield self.issue(number, "error", "level-jump", f"Level {level} after a line of level {previous_level}.")
+            previous_level = level
+
+            if len(line) > MAX_LINE_LENGTH:
+                yield self.issue(number, "warning", "line-too-long", f"The line is longer than {MAX_LINE_LENGTH} bytes.")
+
+            if level == 0:
+                if first_record and tag != "HEAD":
+                    yield self.issue(number, "error", "missing-header", "The file does not start with a HEAD record.")
+                if trailer_line is not None:
+                    yield self.issue(number, "warning", "after-trailer", f"Record after the TRLR record of line {trailer_line}.")
+                if tag == "TRLR" and trailer_line is None: trailer_line = number
+
+                if record_tag == "INDI" and not has_name: yield self.missing_name(record_line)
+
+                first_record = False
+                record_tag = tag
+                record_line = number
+                has_name = False
+
+                if reference is not None:
+                    reference_str: str = reference.decode('ascii', 'replace')
+                    yield from self.define(number, reference_str, tag)
+                    if tag == "INDI" and INDIVIDUAL_REFERENCE_REGEX.fullmatch(reference_str) is None:
+                        yield self.issue(number, "error", "invalid-reference", f"The reference {reference_str} of an individual is not a letter and a number, like @I12@.")
+                elif tag in REFERENCED_RECORDS:
+                    yield self.issue(number, "error", "missing-reference", f"The {tag} record has no reference.")
+
+            # Encoding (only the lines with non-ASCII bytes can be invalid)
+            if not line.isascii():
+                try: value_str: str = value.decode(encoding)
+                except UnicodeDecodeError:
+                    yield self.issue(number, "error", "encoding", f"The line can't be decoded as {encoding}.")
+                    value_str = value.decode(encoding, 'replace')
+            else:
+                value_str: str = value.decode('ascii')
+
+            if tag == "NAME" and record_tag == "INDI" and level == 1: has_name = True
+
+            # Values
+            if POINTER_REGEX.fullmatch(value): yield from self.check_pointer(number, value.decode('ascii', 'replace'), tag)
+            elif tag == "DATE": yield from self.check_date(number, value_str)
+            elif tag == "NAME" and record_tag == "INDI" and level == 1 and '/' not in value_str:
+                yield self.issue(number, "error", "name-without-surname", "The name has no surname between slashes.")
+            elif tag == "CHAR" and record_tag == "HEAD" and value_str.strip().upper() not in gedreader.ENCODINGS:
+                yield self.issue(number, "warning", "unknown-charset", f"Unknown character set '{value_str.strip()}', read as UTF-8.")
+
+        if record_tag == "INDI" and not has_name: yield self.missing_name(record_line)
+
+        if self.nb_lines == 0:
+            yield self.issue(0, "error", "empty-file", "The file is empty.")
+        elif trailer_line is None:
+            yield self.issue(last_line, "error", "missing-trailer", "The file does not end with a TRLR record.")
+
+        for reference, pointers in self._pending.items():
+            for number, _ in pointers:
+                yield self.issue(number, "error", "dangling-pointer", f"{reference} is not defined.")
+
+
+
+
+    def define(self, line: int, reference: str, tag: str):
+        """Register the definition of a record, and check the pointers to it found before."""
+        if reference in self._types:
+            yield self.issue(line, "error", "duplicate-reference", f"{reference} is already defined line {self._definitions[reference]}.")
+            return
+
+        self._types[reference] = tag
+        self._definitions[reference] = line
+        for pointer_line, pointer_tag in self._pending.pop(reference, []):
+            yield from self.check_pointer_type(pointer_line, reference, pointer_tag)
+
+
+
+    def missing_name(self, line: int) -> dict:
+        return self.issue(line, "error", "missing-name", "The individual has no NAME.")
+
+
+
+    def check_pointer(self, line: int, reference: str, tag: str):
+        """Check the type of the record pointed to, or wait for its definition."""
+        if reference in self._types: yield from self.check_pointer_type(line, reference, tag)
+        else: self._pending.setdefault(reference, []).append((line, tag))
+
+
+
+    def check_pointer_type(self, line: int, reference: str, tag: str):
+        expected: str = POINTER_TYPES.get(tag)
+        if expected is not None and self._types[reference] != expected:
+            yield self.issue(line, "error", "pointer-type", f"{tag} must point to a {expected} record, {reference} is a {self._types[reference]} record.")
+
+
+
+    def check_date(self, line: int, value: str):
+        """Check that the date can be read by Date, and that it follows the GEDCOM syntax."""
+        try: Date(value)
+        except ValueError:
+            yield self.issue(line, "error", "invalid-date", f"The date '{value.strip()}' can't be read.")
+            return
+
+        if DATE_REGEX.fullmatch(' '.join(value.split())) is None:
+            yield self.issue(line, "warning", "date-syntax", f"The date '{value.strip()}' does not follow the GEDCOM syntax.")
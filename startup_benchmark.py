@@ -0,0 +1,105 @@
+#!/bin/python3
+# This file is used to measure the startup time of gtit: the time between the launch of the
+# program and the first result line it writes, for the source and the bundled (build.sh) versions.
+#
+# Usage: python startup_benchmark.py [-r RUNS] [--imports]
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+
+
+ROOT: str = os.path.dirname(os.path.abspath(__file__))
+EXAMPLE: str = os.path.join(ROOT, "example", "royal92.ged")
+
+SOURCE: 'list[str]' = [sys.executable, os.path.join(ROOT, "src", "gtit.py")]
+BUNDLE: 'list[str]' = [os.path.join(ROOT, "dist", "gtit", "gtit")]
+
+# Arguments of each measured command: the no-op path, then small queries
+COMMANDS: 'list[list[str]]' = [
+    ["--version"],
+    ["list", "-n", "^Victoria", EXAMPLE],
+    ["tree", "-n", "1", "-d", "2", EXAMPLE],
+    ["validate", EXAMPLE],
+]
+
+# The lines written before the results (they don't tell that the mode has done its work)
+STATUS_LINES: 'tuple[str]' = ("Loading GED file...", "Warning: parent/child cycle")
+
+
+
+
+def measure(command: 'list[str]') -> tuple:
+    """Run the command and return (time to the first result line, total time), in seconds.
+
+    The status and empty lines are skipped (see STATUS_LINES). If the command writes no result,
+    the first result time is the total time, until the process exits.
+    """
+    # Unbuffered, each line is received when it is written, not when the output buffer is full
+    environment: dict = dict(os.environ, PYTHONUNBUFFERED="1")
+
+    start: float = time.perf_counter()
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, env=environment)
+    first_output: float = None
+    for line in process.stdout:
+        if line.strip() and not line.decode("utf-8", "replace").startswith(STATUS_LINES):
+            first_output = time.perf_counter() - start
+            break
+    process.stdout.read()
+    process.wait()
+
+    total: float = time.perf_counter() - start
+    return first_output if first_output is not None else total, total
+
+
+
+def print_imports(arguments: 'list[str]', top: int = 15) -> None:
+    """Print the modules that take the longest to import for the given arguments (see python -X importtime)."""
+    result = subprocess.run([sys.executable, "-X", "importtime"] + SOURCE[1:] + arguments, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    imports: list[tuple] = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line: continue
+        _, self_time, cumulative, name = [field.strip() for field in line.replace("import time:", "|").split("|")]
+        imports.append((int(cumulative), int(self_time), name))
+
+    print("%-10s %-10s %s" % ("cumul. ms", "self ms", "module"))
+    for cumulative, self_time, name in sorted(imports, reverse=True)[:top]:
+        print("%-10.1f %-10.1f %s" % (cumulative / 1000, self_time / 1000, name))
+
+
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-r", "--runs", help="The number of runs of each command. Default: 10", type=int, default=10)
+    parser.add_argument("--imports", help="Also print the slowest imports of each command of the source version.", action="store_true")
+    args = parser.parse_args()
+
+    builds: list[tuple] = [("source", SOURCE)]
+    if os.path.exists(BUNDLE[0]): builds.append(("bundle", BUNDLE))
+    else: print(f"No bundle found in {os.path.dirname(BUNDLE[0])} (run build.sh first), only the source version is measured.\n")
+
+    print("%-8s %-45s %-18s %-18s" % ("build", "command", "first result (ms)", "total (ms)"))
+    for build, program in builds:
+        for arguments in COMMANDS:
+            times: list[tuple] = [measure(program + arguments) for _ in range(args.runs)]
+            first_outputs: list[float] = sorted(first_output for first_output, _ in times)
+            totals: list[float] = sorted(total for _, total in times)
+
+            # The median is less sensitive than the mean to the runs slowed down by the system
+            label: str = " ".join(os.path.basename(argument) for argument in arguments)
+            print("%-8s %-45s %-18.1f %-18.1f" % (build, label, first_outputs[len(times) // 2] * 1000, totals[len(times) // 2] * 1000))
+
+    if args.imports:
+        for arguments in COMMANDS:
+            print()
+            print(" ".join(os.path.basename(argument) for argument in arguments))
+            print_imports(arguments)
+
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+# The modules of gtit are in src/, and import each other by their name.
+
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from geddata import GEDData
+
+
+HEADER: str = "0 HEAD\n1 CHAR UTF-8\n"
+TRAILER: str = "0 TRLR\n"
+
+
+
+
+@pytest.fixture
+def write_ged(tmp_path):
+    """Return a function writing the given records (without header nor trailer) in a .GED file, and returning its path."""
+    def write(records: str, name: str = "test.ged") -> str:
+        path = tmp_path / name
+        path.write_text(HEADER + records + TRAILER, encoding="utf-8")
+        return str(path)
+    return write
+
+
+
+@pytest.fixture
+def load_ged(write_ged):
+    """Return a function loading the given records (see write_ged) in a GEDData."""
+    def load(records: str) -> GEDData:
+        ged_data: GEDData = GEDData()
+        ged_data.parse(write_ged(records))
+        return ged_data
+    return load
@@ -0,0 +1,84 @@
+import pytest
+
+
+# Adam and Eve have 2 children, Carl and Dora. Carl has Ed with Xena, Dora has Fay with Yann,
+# and the first cousins Ed and Fay have Gus.
+FAMILY: str = """0 @I1@ INDI
+1 NAME Adam /Smith/
+1 FAMS @F1@
+0 @I2@ INDI
+1 NAME Eve /Jones/
+1 FAMS @F1@
+0 @I3@ INDI
+1 NAME Carl /Smith/
+1 FAMC @F1@
+1 FAMS @F2@
+0 @I4@ INDI
+1 NAME Dora /Smith/
+1 FAMC @F1@
+1 FAMS @F3@
+0 @I5@ INDI
+1 NAME Xena /Hill/
+1 FAMS @F2@
+0 @I6@ INDI
+1 NAME Yann /Gray/
+1 FAMS @F3@
+0 @I7@ INDI
+1 NAME Ed /Smith/
+1 FAMC @F2@
+1 FAMS @F4@
+0 @I8@ INDI
+1 NAME Fay /Gray/
+1 FAMC @F3@
+1 FAMS @F4@
+0 @I9@ INDI
+1 NAME Gus /Smith/
+1 FAMC @F4@
+0 @F1@ FAM
+1 HUSB @I1@
+1 WIFE @I2@
+1 CHIL @I3@
+1 CHIL @I4@
+0 @F2@ FAM
+1 HUSB @I3@
+1 WIFE @I5@
+1 CHIL @I7@
+0 @F3@ FAM
+1 HUSB @I6@
+1 WIFE @I4@
+1 CHIL @I8@
+0 @F4@ FAM
+1 HUSB @I7@
+1 WIFE @I8@
+1 CHIL @I9@
+"""
+
+
+
+
+def get_ids(individuals) -> 'list[int]':
+    return sorted(indi.id for indi in individuals)
+
+
+
+
+def test_ancestors(load_ged):
+    ged_data = load_ged(FAMILY)
+    index = ged_data.get_ancestor_index()
+    gus, ed, adam = (ged_data.get_individual(i) for i in (9, 7, 1))
+
+    assert get_ids(index.get_ancestors(gus)) == [1, 2, 3, 4, 5, 6, 7, 8]
+    assert get_ids(index.get_ancestors(gus, 2)) == [3, 4, 5, 6, 7, 8]
+    assert index.count_ancestors(gus) == 8
+    assert index.is_ancestor(adam, gus) and not index.is_ancestor(gus, adam)
+    assert get_ids(index.get_common_ancestors(ed, ged_data.get_individual(8))) == [1, 2]
+
+
+
+def test_implex(load_ged):
+    # Gus has 10 ancestors counted once per path (2 parents, 4 grandparents, and Adam and Eve twice), 8 distinct
+    ged_data = load_ged(FAMILY)
+    index = ged_data.get_ancestor_index()
+    assert index.get_implex(ged_data.get_individual(9)) == pytest.approx(1 - 8 / 10)
+    assert index.get_implex(ged_data.get_individual(9), 2) == 0
+    assert index.get_implex(ged_data.get_individual(7)) == 0
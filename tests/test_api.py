@@ -0,0 +1,141 @@
+import os
+import time
+import asyncio
+import threading
+import concurrent.futures
+import pytest
+import api
+import gedreader
+from geddata import GEDData, LoadCancelled, AmbiguousIndividualError
+
+
+EXAMPLE: str = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "example", "royal92.ged")
+
+RECORDS: str = """0 @I1@ INDI
+1 NAME John /Smith/
+1 FAMS @F1@
+0 @I2@ INDI
+1 NAME John /Smith/
+1 FAMC @F1@
+0 @I3@ INDI
+1 NAME Mary /Jones/
+0 @F1@ FAM
+1 HUSB @I1@
+1 CHIL @I2@
+"""
+
+
+
+
+def test_load_progress(monkeypatch):
+    monkeypatch.setattr(gedreader, "CHUNK_SIZE", 1 << 12)
+    calls: list[tuple] = []
+    ged_data: GEDData = api.load(EXAMPLE, lambda *call: calls.append(call))
+
+    assert ged_data.is_frozen
+    size: int = os.path.getsize(EXAMPLE)
+
+    # Several reports, the bytes read never decrease, and the last one is the whole file
+    assert len(calls) > 10
+    assert all(previous[0] <= call[0] and previous[2] <= call[2] for previous, call in zip(calls, calls[1:]))
+    assert calls[-1] == (size, size, len(ged_data._items))
+
+
+def test_load_cancelled_before_start():
+    cancel: threading.Event = threading.Event()
+    cancel.set()
+    with pytest.raises(LoadCancelled):
+        api.load(EXAMPLE, cancel = cancel)
+
+
+
+
+def test_load_async_reports_in_the_loop():
+    loop_threads: set = set()
+
+    async def main() -> GEDData:
+        loop_thread: int = threading.get_ident()
+        ged_data: GEDData = await api.load_async(EXAMPLE, lambda *call: loop_threads.add(threading.get_ident() == loop_thread))
+        # The callbacks scheduled last have run once the loop got the hand back
+        await asyncio.sleep(0)
+        return ged_data
+
+    ged_data: GEDData = asyncio.run(main())
+    assert ged_data.is_frozen and len(ged_data.individuals) > 3000
+    assert loop_threads == {True}
+
+
+def test_load_async_cancel(monkeypatch):
+    # Small chunks: the loading is long enough to be cancelled in the middle
+    monkeypatch.setattr(gedreader, "CHUNK_SIZE", 256)
+
+    # Record how the worker thread ended
+    endings: list[str] = []
+    load = api.load
+    def recording_load(*arguments):
+        try:
+            ged_data: GEDData = load(*arguments)
+            endings.append("loaded")
+            return ged_data
+        except LoadCancelled:
+            endings.append("cancelled")
+            raise
+    monkeypatch.setattr(api, "load", recording_load)
+
+    executor: concurrent.futures.ThreadPoolExecutor = concurrent.futures.ThreadPoolExecutor(1)
+    reports: list[tuple] = []
+
+    async def main() -> None:
+        task: asyncio.Task = asyncio.ensure_future(api.load_async(EXAMPLE, lambda *call: reports.append(call), executor))
+        while not reports: await asyncio.sleep(0.001)
+        task.cancel()
+
+        # The cancellation does not wait for the worker thread
+        start: float = time.monotonic()
+        with pytest.raises(asyncio.CancelledError): await task
+        assert time.monotonic() - start < 0.5
+        count: int = len(reports)
+
+        # No progress is reported after the cancellation
+        await asyncio.sleep(0.2)
+        assert len(reports) <= count + 1
+
+    asyncio.run(main())
+    executor.shutdown(wait = True)
+    assert endings == ["cancelled"]
+    assert reports[-1][0] < os.path.getsize(EXAMPLE)
+
+
+
+
+def test_ambiguous_individual(load_ged):
+    ged_data: GEDData = load_ged(RECORDS).freeze()
+
+    with pytest.raises(AmbiguousIndividualError) as error:
+        api.get_individual(ged_data, "John")
+    assert [indi.id for indi in error.value.individuals] == [1, 2]
+    assert "2 individuals match 'John'" in str(error.value)
+
+    # The same search is fine as an id, or with a single match, and None without one
+    assert api.get_individual(ged_data, "2")["father"] == 1
+    assert api.get_individual(ged_data, "Mary")["id"] == 3
+    assert api.get_individual(ged_data, "Nobody") is None
+
+    # The functions finding an individual raise it too, instead of prompting
+    with pytest.raises(AmbiguousIndividualError): api.get_tree(ged_data, "Smith", 1)
+    with pytest.raises(AmbiguousIndividualError): api.get_relationship(ged_data, "Mary", "John")
+    with pytest.raises(LookupError, match = "Nobody"): api.get_relationship(ged_data, "Mary", "Nobody")
+
+
+def test_indexes_built_once_by_threads():
+    ged_data: GEDData = api.load(EXAMPLE)
+    builds: list[int] = []
+
+    def builder(data: GEDData) -> object:
+        builds.append(1)
+        time.sleep(0.05)
+        return object()
+
+    with concurrent.futures.ThreadPoolExecutor(8) as executor:
+        indexes: list = list(executor.map(lambda _: ged_data.get_index("test", builder), range(8)))
+    assert len(builds) == 1 and all(index is indexes[0] for index in indexes)
@@ -0,0 +1,65 @@
+import os
+import sys
+import subprocess
+
+
+SRC_DIR: str = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+EXAMPLE: str = os.path.join(os.path.dirname(SRC_DIR), "example", "royal92.ged")
+
+# Run gtit with the given arguments, then print the gtit modules it has imported
+IMPORTS_SCRIPT: str = """
+import sys, runpy
+sys.argv = ["gtit"] + sys.argv[1:]
+try: runpy.run_path("gtit.py", run_name="__main__")
+except SystemExit as e: code = e.code
+print(sorted(name for name in sys.modules if name in MODULES))
+sys.exit(code)
+"""
+
+MODULES: 'list[str]' = ["geddata", "gedreader", "graphic_tree", "dedupe", "validate", "fulltext", "query", "graph_arrays", "numpy"]
+
+
+def run(*arguments: str) -> subprocess.CompletedProcess:
+    script: str = f"MODULES = {MODULES!r}\n" + IMPORTS_SCRIPT
+    return subprocess.run([sys.executable, "-c", script] + list(arguments), capture_output = True, text = True, cwd = SRC_DIR, timeout = 60)
+
+
+
+
+def test_version():
+    from gtit import VERSION
+    for option in ["--version", "-V"]:
+        result: subprocess.CompletedProcess = run(option)
+        lines: list[str] = result.stdout.splitlines()
+        assert result.returncode == 0
+        assert lines[0] == f"gtit {VERSION}"
+
+        # Nothing else is imported to print the version
+        assert lines[1] == "[]"
+
+
+def test_version_wins_over_the_mode():
+    # argparse prints the version as soon as it reads the option, before checking the mode or the file
+    result: subprocess.CompletedProcess = run("tree", "--version", "missing.ged")
+    assert result.returncode == 0 and result.stdout.startswith("gtit ")
+
+
+def test_modes_only_import_what_they_use():
+    result: subprocess.CompletedProcess = run("validate", EXAMPLE)
+    assert result.stdout.splitlines()[-1] == "['gedreader', 'validate']"
+
+    result = run("tree", "-n", "1", "-d", "1", EXAMPLE)
+    assert result.stdout.splitlines()[-1] == "['geddata', 'gedreader', 'graphic_tree']"
+
+
+def test_invalid_mode():
+    result: subprocess.CompletedProcess = run("nothing")
+    assert result.returncode == 1 and result.stdout.splitlines()[-1] == "[]"
+
+
+def test_horizontal_tree():
+    # A depth too wide for the vertical chart is drawn sideways without being reduced
+    result: subprocess.CompletedProcess = run("tree", "-n", "1", "-d", "12", "--horizontal", EXAMPLE)
+    lines: list[str] = result.stdout.splitlines()
+    assert result.returncode == 0 and not any(line.startswith("Warning") for line in lines)
+    assert any(line.startswith("Victoria") for line in lines) and len(lines) > 50
@@ -0,0 +1,131 @@
+import sys
+import pytest
+from date import Date
+from geddata import GEDData
+
+
+RECORDS: str = """0 @I1@ INDI
+1 NAME John /Smith/
+1 SEX M
+1 BIRT
+2 DATE 1800
+2 PLAC London
+1 DEAT
+2 DATE BEF 1870
+2 PLAC Paris
+1 FAMS @F1@
+0 @I2@ INDI
+1 NAME Mary /Brown/
+1 SEX F
+1 BIRT
+2 DATE ABT 1805
+1 DEAT
+2 DATE BET 1860 AND 1865
+2 PLAC London
+1 FAMS @F1@
+0 @I10@ INDI
+1 NAME Tom /Smith/
+1 SEX U
+1 BIRT
+2 DATE AFT 1830
+1 DEAT
+2 PLAC Paris
+1 FAMC @F1@
+0 @I3@ INDI
+1 NAME Ann /Smith/
+1 FAMC @F2@
+0 @F1@ FAM
+1 HUSB @I1@
+1 WIFE @I2@
+1 CHIL @I10@
+0 @F2@ FAM
+1 WIFE @I2@
+1 CHIL @I3@
+"""
+
+
+
+
+def test_without_numpy(load_ged, monkeypatch):
+    # A None entry in sys.modules makes the import fail, as if NumPy was not installed
+    monkeypatch.setitem(sys.modules, "numpy", None)
+    with pytest.raises(Exception, match = "pip install numpy"):
+        load_ged(RECORDS).to_columns()
+
+
+
+
+def test_dtypes(load_ged):
+    np = pytest.importorskip("numpy")
+    individuals = load_ged(RECORDS).to_columns()["individuals"]
+
+    assert individuals.dtype.names == tuple(name for name, _ in GEDData.COLUMNS)
+    assert individuals.dtype["birth_min"] == np.float32 and individuals.dtype["father"] == np.int32
+    assert individuals.dtype["sex"] == np.int8 and individuals.dtype["families"] == np.int16
+
+    # The references are not cut: the column is as wide as the longest one
+    assert individuals.dtype["xref"] == np.dtype("U5")
+    assert list(individuals["xref"]) == ["@I1@", "@I2@", "@I10@", "@I3@"]
+    assert list(individuals["id"]) == [0, 1, 2, 3]
+    assert list(individuals["sex"]) == [1, 2, 0, 0]
+
+
+def test_year_bounds(load_ged):
+    np = pytest.importorskip("numpy")
+    individuals = load_ged(RECORDS).to_columns()["individuals"]
+
+    def bounds(row: int, event: str) -> list:
+        return [None if np.isnan(year) else int(year) for year in (individuals[row][event + "_min"], individuals[row][event + "_max"])]
+
+    assert bounds(0, "birth") == [1800, 1800]
+    assert bounds(0, "death") == [None, 1870]
+    assert bounds(1, "birth") == [1805 - Date.CIRCA_YEARS, 1805 + Date.CIRCA_YEARS]
+    assert bounds(1, "death") == [1860, 1865]
+    assert bounds(2, "birth") == [1830, None]
+
+    # A death without date, and no events at all
+    assert bounds(2, "death") == [None, None]
+    assert bounds(3, "birth") == bounds(3, "death") == [None, None]
+
+
+def test_parents_and_places(load_ged):
+    pytest.importorskip("numpy")
+    columns: dict = load_ged(RECORDS).to_columns()
+    individuals = columns["individuals"]
+
+    # The parents are dense ids (rows), not the numbers of the references; -1 if unknown
+    assert list(individuals["father"]) == [-1, -1, 0, -1]
+    assert list(individuals["mother"]) == [-1, -1, 1, 1]
+    assert list(individuals["families"]) == [1, 1, 0, 0]
+
+    # Each place is stored once, birth and death places together
+    assert list(columns["places"]) == ["London", "Paris"]
+    assert list(individuals["birth_place"]) == [0, -1, -1, -1]
+    assert list(individuals["death_place"]) == [1, 0, 1, -1]
+
+
+def test_empty(load_ged):
+    pytest.importorskip("numpy")
+    columns: dict = load_ged("").to_columns()
+    assert len(columns["individuals"]) == 0 and len(columns["places"]) == 0
+    assert columns["individuals"].dtype.names == tuple(name for name, _ in GEDData.COLUMNS)
+
+
+
+
+def test_export(load_ged, tmp_path, capsys):
+    np = pytest.importorskip("numpy")
+    from gtit import export
+    ged_data: GEDData = load_ged(RECORDS)
+
+    # The extension is added if it is missing, and the printed path is the one written
+    export(ged_data, str(tmp_path / "columns"))
+    assert capsys.readouterr().out.strip().endswith(str(tmp_path / "columns.npz") + ".")
+    export(ged_data, str(tmp_path / "other.npz"))
+    assert not (tmp_path / "other.npz.npz").exists()
+
+    with np.load(tmp_path / "columns.npz") as archive:
+        assert sorted(archive.files) == ["individuals", "places"]
+        assert archive["individuals"].dtype == ged_data.to_columns()["individuals"].dtype
+        assert list(archive["individuals"]["mother"]) == [-1, -1, 1, 1]
+        assert list(archive["places"]) == ["London", "Paris"]
@@ -0,0 +1,200 @@
+import os
+from geddata import GEDData
+from query import Query
+from relationship import Relationship
+
+
+EXAMPLE: str = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "example", "royal92.ged")
+
+
+# Ann lives alone. Bob and Cora are the parents of Dan, and Dan the father of Eva with Fay.
+# Gus and Hana are a couple without children.
+PEOPLE: str = """0 @I1@ INDI
+1 NAME Ann /Alone/
+0 @I2@ INDI
+1 NAME Bob /Berg/
+1 FAMS @F1@
+0 @I3@ INDI
+1 NAME Cora /Cole/
+1 FAMS @F1@
+0 @I4@ INDI
+1 NAME Gus /Gray/
+1 FAMS @F3@
+0 @I5@ INDI
+1 NAME Dan /Berg/
+1 FAMC @F1@
+1 FAMS @F2@
+0 @I6@ INDI
+1 NAME Hana /Hill/
+1 FAMS @F3@
+0 @I7@ INDI
+1 NAME Eva /Berg/
+1 FAMC @F2@
+0 @I8@ INDI
+1 NAME Fay /Ford/
+1 FAMS @F2@
+0 @F1@ FAM
+1 HUSB @I2@
+1 WIFE @I3@
+1 CHIL @I5@
+0 @F2@ FAM
+1 HUSB @I5@
+1 WIFE @I8@
+1 CHIL @I7@
+0 @F3@ FAM
+1 HUSB @I4@
+1 WIFE @I6@
+"""
+
+# Ann and Ben are siblings without known parents. Cal's family only points to a missing child,
+# and Dee is alone in hers. Eli and Flo, and Guy with his children Hal and Ida, are two families
+# joined by the marriage of Hal and Flo.
+ISLANDS: str = """0 @I1@ INDI
+1 NAME Ann /Ash/
+1 FAMC @F1@
+0 @I2@ INDI
+1 NAME Ben /Ash/
+1 FAMC @F1@
+0 @I3@ INDI
+1 NAME Cal /Cox/
+1 FAMS @F2@
+0 @I4@ INDI
+1 NAME Dee /Dunn/
+1 FAMS @F3@
+0 @I5@ INDI
+1 NAME Eli /Eng/
+1 FAMS @F5@
+0 @I6@ INDI
+1 NAME Flo /Fox/
+1 FAMS @F5@
+1 FAMS @F7@
+0 @I7@ INDI
+1 NAME Guy /Gale/
+1 FAMS @F6@
+0 @I8@ INDI
+1 NAME Hal /Gale/
+1 FAMC @F6@
+1 FAMS @F7@
+0 @I9@ INDI
+1 NAME Ida /Gale/
+1 FAMC @F6@
+0 @F1@ FAM
+1 CHIL @I1@
+1 CHIL @I2@
+0 @F2@ FAM
+1 HUSB @I3@
+1 CHIL @I99@
+0 @F3@ FAM
+1 WIFE @I4@
+0 @F4@ FAM
+0 @F5@ FAM
+1 HUSB @I5@
+1 WIFE @I6@
+0 @F6@ FAM
+1 HUSB @I7@
+1 CHIL @I8@
+1 CHIL @I9@
+0 @F7@ FAM
+1 HUSB @I8@
+1 WIFE @I6@
+"""
+
+
+
+
+def get_ids(individuals) -> 'list[int]':
+    return [indi.id for indi in individuals]
+
+
+
+
+def test_components_are_numbered_by_decreasing_size(load_ged):
+    ged_data = load_ged(PEOPLE)
+    assert list(ged_data.component_sizes) == [5, 2, 1]
+    assert [ged_data.get_individual(i).component for i in range(1, 9)] == [2, 0, 0, 1, 0, 1, 0, 0]
+
+
+
+def test_get_component(load_ged):
+    ged_data = load_ged(PEOPLE)
+    assert get_ids(ged_data.get_component(0)) == [2, 3, 5, 7, 8]
+    assert get_ids(ged_data.get_component(1)) == [4, 6]
+    assert get_ids(ged_data.get_component(2)) == [1]
+    assert ged_data.get_component(3) == []
+
+
+
+def test_are_connected(load_ged):
+    ged_data = load_ged(PEOPLE)
+    assert ged_data.are_connected(ged_data.get_individual(2), ged_data.get_individual(8))
+    assert not ged_data.are_connected(ged_data.get_individual(2), ged_data.get_individual(4))
+    assert Relationship.find(ged_data.get_individual(1), ged_data.get_individual(7)) is None
+
+
+
+def test_islands(load_ged):
+    ged_data: GEDData = load_ged(ISLANDS).freeze()
+
+    # The children of a family without parents are linked, the missing members and the empty families are skipped,
+    # and the components of equal size stay in the order of the file
+    assert ged_data.component_sizes == (5, 2, 1, 1)
+    assert [ged_data.get_individual(i).component for i in range(1, 10)] == [1, 1, 2, 3, 0, 0, 0, 0, 0]
+    assert get_ids(ged_data.get_component(0)) == [5, 6, 7, 8, 9]
+    assert ged_data.are_connected(ged_data.get_individual(5), ged_data.get_individual(9))
+    assert not ged_data.are_connected(ged_data.get_individual(3), ged_data.get_individual(4))
+
+
+
+def test_empty(load_ged):
+    ged_data: GEDData = load_ged("")
+    assert list(ged_data.component_sizes) == [] and ged_data.get_component(0) == []
+
+
+
+def test_royal92_agrees_with_a_search():
+    ged_data: GEDData = GEDData()
+    ged_data.parse(EXAMPLE)
+    assert sum(ged_data.component_sizes) == len(ged_data.individuals)
+    assert list(ged_data.component_sizes) == sorted(ged_data.component_sizes, reverse=True)
+
+    # Walk the families from each individual not reached yet: each walk finds a whole component
+    neighbours: dict = {indi: set() for indi in ged_data.individuals}
+    for family in ged_data.families:
+        members: list = [member for member in [family.husband, family.wife] + family.children if member is not None]
+        for member in members: neighbours[member].update(members)
+
+    seen: set = set()
+    for indi in ged_data.individuals:
+        if indi in seen: continue
+        component: set = {indi}
+        stack: list = [indi]
+        while stack:
+            for other in neighbours[stack.pop()] - component:
+                component.add(other)
+                stack.append(other)
+        seen |= component
+        assert set(ged_data.get_component(indi.component)) == component
+
+
+
+def test_query_and_list(load_ged, capsys):
+    from gtit import list as list_individuals
+    ged_data: GEDData = load_ged(ISLANDS).freeze()
+    assert get_ids(Query("component = 1").filter(ged_data)) == [1, 2]
+    assert get_ids(Query("component > 1").filter(ged_data)) == [3, 4]
+
+    # The component is combined with the name and the query
+    list_individuals(ged_data, "Gale", component=0, query=Query("born_in = Nowhere or component = 0"))
+    assert [line.split()[0] for line in capsys.readouterr().out.splitlines()[2:]] == ["7", "8", "9"]
+    list_individuals(ged_data, "Gale", component=1)
+    list_individuals(ged_data, None, component=4)
+    assert capsys.readouterr().out == ""
+
+
+
+def test_stats(load_ged, capsys):
+    from gtit import stats
+    stats(load_ged(ISLANDS).freeze())
+    output: str = capsys.readouterr().out
+    assert "connected components           4" in output and "isolated individuals           2" in output
+    assert output.rstrip().endswith("component  individuals\n0          5         \n1          2         \n2          1         \n3          1")
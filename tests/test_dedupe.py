@@ -0,0 +1,70 @@
+from dedupe import DuplicateFinder
+from individual import Individual
+
+
+
+
+def similarity(first: Individual, second: Individual) -> float:
+    return DuplicateFinder.similarity(DuplicateFinder.get_record(first), DuplicateFinder.get_record(second))
+
+
+
+def test_first_names_alone_are_not_duplicates() -> None:
+    assert similarity(Individual.from_values(1, "John //"), Individual.from_values(2, "John //")) == 0.0
+    assert similarity(Individual.from_values(1, "John //", birth_place = "York"), Individual.from_values(2, "John //", birth_place = "York")) == 0.0
+
+
+
+def test_duplicates() -> None:
+    # A last name, or a year, is enough to compare the individuals
+    assert similarity(Individual.from_values(1, "John /Smith/"), Individual.from_values(2, "John /Smith/")) == 1.0
+    assert similarity(Individual.from_values(1, "John //", birth_date = "1802"), Individual.from_values(2, "John //", birth_date = "1802")) == 1.0
+    assert similarity(Individual.from_values(1, "John /Smith/", "M", "1802"), Individual.from_values(2, "John /Smith/", "F", "1802")) == 0.0
+    assert similarity(Individual.from_values(1, "John /Smith/", birth_date = "1802"), Individual.from_values(2, "John /Smyth/", birth_date = "1840")) < 0.85
+
+
+
+def references(pairs: 'list[tuple]') -> 'list[set]':
+    return [{reference_a, reference_b} for _, reference_a, reference_b in pairs]
+
+
+
+def test_decade_boundary() -> None:
+    # 1799 and 1800 are in different decades: the neighbouring blocks are compared too
+    first: Individual = Individual.from_values(1, "John /Smith/", birth_date = "1799")
+    second: Individual = Individual.from_values(2, "John /Smith/", birth_date = "1800")
+    assert DuplicateFinder.get_blocking_key(first) != DuplicateFinder.get_blocking_key(second)
+    assert references(DuplicateFinder().find_duplicates([first, second])) == [{"@I1@", "@I2@"}]
+
+    # The decades further apart are not compared
+    third: Individual = Individual.from_values(3, "John /Smith/", birth_date = "1821")
+    assert DuplicateFinder().find_duplicates([first, third]) == []
+
+
+
+def test_unknown_year() -> None:
+    # A birth year found in one file only: compared with every decade
+    known: Individual = Individual.from_values(1, "Mary /Jones/", "F", "1842", death_date = "1900")
+    unknown: Individual = Individual.from_values(2, "Mary /Jones/", "F", death_date = "1900")
+    older: Individual = Individual.from_values(3, "Mary /Jones/", "F", "1790", death_date = "1900")
+    assert references(DuplicateFinder().find_duplicates([known, unknown, older])) == [{"@I1@", "@I2@"}, {"@I2@", "@I3@"}]
+
+
+
+def test_pairs_found_once() -> None:
+    # Twins of 1805 and a copy without a year: each pair is compared in a single block, and listed once
+    individuals: list[Individual] = [Individual.from_values(number, "Anne /Lee/", "F", year) for number, year in ((1, "1805"), (2, "1805"), (3, None), (4, "1811"))]
+    pairs: list[tuple] = DuplicateFinder(0.5).find_duplicates(individuals)
+    assert len(pairs) == len({frozenset(pair) for pair in references(pairs)})
+    assert {frozenset(pair) for pair in references(pairs)} >= {frozenset({"@I1@", "@I2@"}), frozenset({"@I1@", "@I3@"}), frozenset({"@I3@", "@I4@"})}
+
+
+
+def test_threshold_skips_the_name_comparison() -> None:
+    # The similarity is the same with a threshold, and 0.0 below it
+    a: tuple = DuplicateFinder.get_record(Individual.from_values(1, "Catherine /Howard/", birth_date = "1523"))
+    b: tuple = DuplicateFinder.get_record(Individual.from_values(2, "Katherine /Howarth/", birth_date = "1523"))
+    score: float = DuplicateFinder.similarity(a, b)
+    assert 0.0 < score < 1.0
+    assert DuplicateFinder.similarity(a, b, score) == score
+    assert DuplicateFinder.similarity(a, b, score + 0.01) == 0.0
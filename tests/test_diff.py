@@ -0,0 +1,177 @@
+from diff import GEDDiff
+
+
+OLD: str = """0 @I1@ INDI
+1 NAME John /Smith/
+1 BIRT
+2 DATE 1800
+1 FAMS @F1@
+0 @I2@ INDI
+1 NAME Mary /Smith/
+1 FAMS @F1@
+0 @I3@ INDI
+1 NAME Paul /Smith/
+1 FAMC @F1@
+0 @I4@ INDI
+1 NAME Lost /Record/
+0 @F1@ FAM
+1 HUSB @I1@
+1 WIFE @I2@
+1 CHIL @I3@
+"""
+
+# John is born in 1801, Mary gets a note, Paul is only indented, Lost is removed and Anna is
+# added to the family, before Paul
+NEW: str = """0 @I1@ INDI
+1 NAME John /Smith/
+1 BIRT
+2 DATE 1801
+1 FAMS @F1@
+0 @I2@ INDI
+1 NAME Mary /Smith/
+1 FAMS @F1@
+1 NOTE Born in York
+0 @I3@ INDI
+  1 NAME Paul /Smith/
+  1 FAMC @F1@
+0 @I5@ INDI
+1 NAME Anna /Smith/
+1 FAMC @F1@
+0 @F1@ FAM
+1 HUSB @I1@
+1 WIFE @I2@
+1 CHIL @I5@
+1 CHIL @I3@
+"""
+
+
+
+
+def compare(write_ged, old: str, new: str) -> GEDDiff:
+    ged_diff: GEDDiff = GEDDiff(write_ged(old, "old.ged"), write_ged(new, "new.ged"))
+    ged_diff.compare()
+    return ged_diff
+
+
+
+
+def test_added_and_removed(write_ged):
+    ged_diff: GEDDiff = compare(write_ged, OLD, NEW)
+    assert [(record.reference, GEDDiff.get_label(record)) for record in ged_diff.added] == [("@I5@", "Anna Smith")]
+    assert [(record.reference, GEDDiff.get_label(record)) for record in ged_diff.removed] == [("@I4@", "Lost Record")]
+
+
+
+def test_changed_fields(write_ged):
+    ged_diff: GEDDiff = compare(write_ged, OLD, NEW)
+    changed: dict = {new.reference: differences for _, new, differences in ged_diff.changed}
+
+    # Paul only differs by his indentation
+    assert list(changed) == ["@I1@", "@I2@", "@F1@"]
+    assert changed["@I1@"] == [("BIRT.DATE", "1800", "1801")]
+    assert changed["@I2@"] == [("other fields", None, None)]
+    assert changed["@F1@"] == [("CHIL", ["@I3@"], ["@I5@", "@I3@"])]
+
+
+
+def test_describe():
+    assert GEDDiff.describe("BIRT.DATE", "1800", "1801") == "1800 -> 1801"
+    assert GEDDiff.describe("DEAT.PLAC", None, "York") == "(none) -> York"
+    assert GEDDiff.describe("CHIL", ["@I3@"], ["@I5@", "@I3@"]) == "+@I5@"
+    assert GEDDiff.describe("CHIL", ["@I3@", "@I5@"], ["@I5@", "@I3@"]) == "reordered"
+
+
+
+def test_same_files(write_ged):
+    ged_diff: GEDDiff = compare(write_ged, OLD, OLD)
+    assert not (ged_diff.added or ged_diff.removed or ged_diff.changed)
+
+
+
+def write_bytes(tmp_path, records: str, name: str, encoding: str = "utf-8", newline: str = "\n") -> str:
+    path = tmp_path / name
+    text: str = ("0 HEAD\n1 CHAR UTF-8\n" + records + "0 TRLR\n").replace("\n", newline)
+    path.write_bytes(text.encode(encoding))
+    return str(path)
+
+
+
+def test_line_terminators_and_encodings(write_ged, tmp_path):
+    # The same records, with other line terminators or in UTF-16, have no difference
+    old_path: str = write_ged(OLD, "old.ged")
+    for name, encoding, newline in [("crlf.ged", "utf-8", "\r\n"), ("cr.ged", "utf-8", "\r"), ("utf16.ged", "utf-16", "\n")]:
+        ged_diff: GEDDiff = GEDDiff(old_path, write_bytes(tmp_path, OLD, name, encoding, newline))
+        ged_diff.compare()
+        assert not (ged_diff.added or ged_diff.removed or ged_diff.changed), name
+
+
+
+def test_compressed_file(write_ged, tmp_path):
+    import gzip
+    new_path: str = str(tmp_path / "new.ged.gz")
+    with open(write_ged(NEW, "new.ged"), "rb") as source, gzip.open(new_path, "wb") as target:
+        target.write(source.read())
+
+    ged_diff: GEDDiff = GEDDiff(write_ged(OLD, "old.ged"), new_path)
+    ged_diff.compare()
+    assert [new.reference for _, new, _ in ged_diff.changed] == ["@I1@", "@I2@", "@F1@"]
+    assert [record.reference for record in ged_diff.added] == ["@I5@"]
+
+
+
+def test_reordered_records(write_ged):
+    # The records are matched by their reference, wherever they are in the file
+    records: list[str] = ["0 @" + record for record in OLD.split("0 @")[1:]]
+    ged_diff: GEDDiff = compare(write_ged, OLD, "".join(reversed(records)))
+    assert not (ged_diff.added or ged_diff.removed or ged_diff.changed)
+
+
+
+def test_empty_files(write_ged):
+    ged_diff: GEDDiff = compare(write_ged, "", OLD)
+    assert [record.reference for record in ged_diff.added] == ["@I1@", "@I2@", "@I3@", "@I4@", "@F1@"]
+    assert not (ged_diff.removed or ged_diff.changed)
+
+    ged_diff = compare(write_ged, OLD, "")
+    assert [record.reference for record in ged_diff.removed] == ["@I1@", "@I2@", "@I3@", "@I4@", "@F1@"]
+    assert not (ged_diff.added or ged_diff.changed)
+
+
+
+def test_fields_added_and_removed(write_ged):
+    old: str = "0 @I1@ INDI\n1 NAME John /Smith/\n1 DEAT\n2 DATE 1850\n1 FAMS @F1@\n1 FAMS @F2@\n"
+    new: str = "0 @I1@ INDI\n1 NAME John /Smith/\n1 SEX M\n1 DEAT\n2 DATE 1850\n2 PLAC York\n1 FAMS @F2@\n1 FAMS @F1@\n"
+    (_, _, differences), = compare(write_ged, old, new).changed
+
+    # A field missing from a version is None, the repeated fields are lists
+    assert differences == [("SEX", None, "M"), ("DEAT.PLAC", None, "York"), ("FAMS", ["@F1@", "@F2@"], ["@F2@", "@F1@"])]
+    assert GEDDiff.describe(*differences[2]) == "reordered"
+
+    (_, _, differences), = compare(write_ged, new, old).changed
+    assert differences[:2] == [("SEX", "M", None), ("DEAT.PLAC", "York", None)]
+    assert GEDDiff.describe(*differences[1]) == "York -> (none)"
+
+
+
+def test_other_fields(write_ged):
+    # A continued text is not a compared field
+    old: str = "0 @N1@ NOTE Born\n1 CONC  in York\n0 @I1@ INDI\n1 NAME John /Smith/\n1 BIRT\n2 SOUR @S1@\n"
+    new: str = "0 @N1@ NOTE Born\n1 CONC  in Leeds\n0 @I1@ INDI\n1 NAME John /Smith/\n1 BIRT\n2 SOUR @S2@\n"
+    changed: dict = {new.reference: differences for _, new, differences in compare(write_ged, old, new).changed}
+    assert changed == {"@N1@": [("other fields", None, None)], "@I1@": [("other fields", None, None)]}
+
+    # The compared fields can move inside the record, but the other ones are compared in order
+    ged_diff: GEDDiff = compare(write_ged, old, "0 @N1@ NOTE Born\n1 CONC  in York\n0 @I1@ INDI\n1 BIRT\n2 SOUR @S1@\n1 NAME John /Smith/\n")
+    assert not ged_diff.changed
+    ged_diff = compare(write_ged, old + "1 NOTE @N1@\n", old.replace("1 BIRT\n", "1 NOTE @N1@\n1 BIRT\n"))
+    assert [differences for _, _, differences in ged_diff.changed] == [[("other fields", None, None)]]
+
+
+
+def test_exit_code(write_ged, capsys):
+    from gtit import diff
+    assert diff(write_ged(OLD, "old.ged"), write_ged(OLD, "new.ged"))
+    assert not diff(write_ged(OLD, "old.ged"), write_ged(NEW, "new.ged"))
+    output: str = capsys.readouterr().out
+    assert "1 added, 1 removed, 3 changed records." in output
+    assert "      BIRT.DATE  1800 -> 1801" in output and "      CHIL       +@I5@" in output
@@ -0,0 +1,120 @@
+import codecs
+import unicodedata
+import pytest
+import gedreader
+from geddata import GEDData
+from item import Item
+
+
+def write_bytes(tmp_path, content: bytes, name: str = "test.ged") -> str:
+    path = tmp_path / name
+    path.write_bytes(content)
+    return str(path)
+
+
+def load_bytes(tmp_path, content: bytes) -> GEDData:
+    ged_data: GEDData = GEDData()
+    ged_data.parse(write_bytes(tmp_path, content))
+    return ged_data
+
+
+
+
+def test_ansel_diacritics_come_before_their_letter():
+    # 0xE2 is the acute accent, 0xE8 the diaeresis: they modify the FOLLOWING letter
+    assert b'Jos\xe2e'.decode('ansel') == 'José'
+    assert b'M\xe8uller'.decode('ansel') == 'Müller'
+    assert b'\xa2stergaard \xa5'.decode('ansel') == 'Østergaard Æ'
+
+    # Two diacritics on the same letter, and a diacritic with no letter after it
+    assert b'\xe2\xe3e'.decode('ansel') == unicodedata.normalize('NFC', 'e\u0301\u0302')
+    assert b'e\xe2'.decode('ansel') == '\u00e9'
+
+
+def test_ansel_round_trip():
+    for text in ['José', 'Müller', 'Østergaard', 'ça', 'ẽ', 'plain ascii']:
+        assert text.encode('ansel').decode('ansel') == text
+    assert 'José'.encode('ansel') == b'Jos\xe2e'
+
+
+def test_ansel_errors():
+    with pytest.raises(UnicodeDecodeError): b'A\x90B'.decode('ansel')
+    assert b'A\x90B'.decode('ansel', 'replace') == 'A�B'
+    assert b'A\x90B'.decode('ansel', 'ignore') == 'AB'
+
+    with pytest.raises(UnicodeEncodeError): 'A中'.encode('ansel')
+    assert 'A中'.encode('ansel', 'replace') == b'A?'
+
+
+
+
+def test_detect_encoding():
+    assert gedreader.detect_encoding(b'0 HEAD\n1 CHAR ANSEL\n') == 'ansel'
+    assert gedreader.detect_encoding(b'0 HEAD\r1 CHAR ansi\r') == 'cp1252'
+    assert gedreader.detect_encoding(b'0 HEAD\n1 CHAR UNKNOWN\n') == 'utf-8'
+    assert gedreader.detect_encoding(b'0 HEAD\n1 SOUR X\n') == 'utf-8'
+
+    # The byte order mark wins over the declared encoding
+    assert gedreader.detect_encoding(codecs.BOM_UTF8 + b'0 HEAD\n1 CHAR ANSEL\n') == 'utf-8'
+    assert gedreader.detect_encoding('0 HEAD\n'.encode('utf-16-le')) == 'utf-16-le'
+    assert gedreader.detect_encoding('0 HEAD\n'.encode('utf-16-be')) == 'utf-16-be'
+
+
+
+
+def test_values_are_decoded_lazily(tmp_path):
+    ged_data: GEDData = load_bytes(tmp_path, b'0 HEAD\n1 CHAR ANSEL\n0 @I1@ INDI\n1 NAME Jos\xe2e /Lee/\n1 NOTE Jos\xe2e\n0 TRLR\n')
+    note: Item = ged_data.get_items('INDI')[0].get_child('NOTE')
+
+    assert note._value is None and note._raw_value == b'Jos\xe2e'
+    assert note.value == 'José'
+    assert note._value == 'José'
+
+    # Setting the value replaces the bytes
+    note.value = 'Other'
+    assert note._raw_value is None and note.value == 'Other'
+
+
+def test_pointer_without_decoding():
+    item: Item = Item()
+    item.set_raw_value(b'@F12@', 'utf-8')
+    assert item.is_pointer() and item._value is None
+
+    for raw_value in [b'@', b'@@', b'F12@', b'']:
+        item.set_raw_value(raw_value, 'utf-8')
+        assert not item.is_pointer()
+
+
+
+
+@pytest.mark.parametrize("encoding, content", [
+    ('ANSEL', b'Fran\xf0cois /M\xe8uller/'),
+    ('ANSI', 'François /Müller/'.encode('cp1252')),
+    ('IBMPC', 'François /Müller/'.encode('cp437')),
+    ('MACINTOSH', 'François /Müller/'.encode('mac_roman')),
+])
+def test_declared_encodings(tmp_path, encoding, content):
+    ged_data: GEDData = load_bytes(tmp_path, b'0 HEAD\n1 CHAR ' + encoding.encode() + b'\n0 @I1@ INDI\n1 NAME ' + content + b'\n0 TRLR\n')
+    assert ged_data.individuals[0].get_cleared_raw_name() == 'François Müller'
+
+
+def test_utf16_and_line_endings(tmp_path):
+    text: str = '0 HEAD\r\n1 CHAR UNICODE\r\n0 @I1@ INDI\r\n1 NAME Zoë /Ĳsselmeer/\r\n0 TRLR\r\n'
+    assert load_bytes(tmp_path, codecs.BOM_UTF16_LE + text.encode('utf-16-le')).individuals[0].get_cleared_raw_name() == 'Zoë Ĳsselmeer'
+    assert load_bytes(tmp_path, text.encode('utf-16-be')).individuals[0].get_cleared_raw_name() == 'Zoë Ĳsselmeer'
+
+    # Old Macintosh files end their lines with CR only
+    cr_only: bytes = text.replace('\r\n', '\r').replace('UNICODE', 'UTF-8').encode('utf-8')
+    assert load_bytes(tmp_path, codecs.BOM_UTF8 + cr_only).individuals[0].get_cleared_raw_name() == 'Zoë Ĳsselmeer'
+
+
+def test_invalid_bytes_are_replaced(tmp_path):
+    ged_data: GEDData = load_bytes(tmp_path, b'0 HEAD\n1 CHAR UTF-8\n0 @I1@ INDI\n1 NAME Ann\xff /Lee/\n0 TRLR\n')
+    assert ged_data.individuals[0].get_cleared_raw_name() == 'Ann� Lee'
+
+
+def test_crlf_split_between_chunks():
+    # A CR at the end of a chunk and its LF at the start of the next one are a single line terminator
+    chunks: list[bytes] = [b'0 HEAD\r', b'\n1 CHAR UTF-8\r', b'\n0 TRLR']
+    assert list(gedreader.iter_numbered_lines(chunks)) == [(1, b'0 HEAD'), (2, b'1 CHAR UTF-8'), (3, b'0 TRLR')]
+    assert list(gedreader.iter_lines(chunks)) == [b'0 HEAD', b'1 CHAR UTF-8', b'0 TRLR']
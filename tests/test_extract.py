@@ -0,0 +1,90 @@
+import io
+from extract import Extractor
+
+
+# Adam and Eve are the parents of Carl, Carl is the father of Ed with Xena, and Ed the father of
+# Gus. Carl's birth is cited from a source, which has a note.
+FAMILY: str = """0 @I1@ INDI
+1 NAME Adam /Smith/
+1 FAMS @F1@
+0 @I2@ INDI
+1 NAME Eve /Jones/
+1 FAMS @F1@
+0 @I3@ INDI
+1 NAME Carl /Smith/
+1 BIRT
+2 DATE 1850
+2 SOUR @S1@
+3 PAGE 12
+1 FAMC @F1@
+1 FAMS @F2@
+0 @I4@ INDI
+1 NAME Xena /Hill/
+1 FAMS @F2@
+0 @I5@ INDI
+1 NAME Ed /Smith/
+1 FAMC @F2@
+1 FAMS @F3@
+0 @I6@ INDI
+1 NAME Gus /Smith/
+1 FAMC @F3@
+0 @F1@ FAM
+1 HUSB @I1@
+1 WIFE @I2@
+1 CHIL @I3@
+0 @F2@ FAM
+1 HUSB @I3@
+1 WIFE @I4@
+1 CHIL @I5@
+0 @F3@ FAM
+1 HUSB @I5@
+1 CHIL @I6@
+0 @S1@ SOUR
+1 TITL Parish register
+1 NOTE @N1@
+0 @N1@ NOTE Kept at the town hall
+"""
+
+
+
+
+def scan(write_ged) -> Extractor:
+    extractor: Extractor = Extractor(write_ged(FAMILY))
+    extractor.scan()
+    return extractor
+
+
+
+
+def test_closure(write_ged):
+    extractor: Extractor = scan(write_ged)
+
+    # The parents of Ed, their family, and the source of Carl with its note
+    assert extractor.get_closure("@I5@", 1) == {"@I5@", "@I3@", "@I4@", "@F2@", "@S1@", "@N1@"}
+
+    # The descendants of Xena up to her grandson, with their other parents
+    assert extractor.get_closure("@I4@", -2) == {"@I4@", "@I3@", "@I5@", "@I6@", "@F2@", "@F3@", "@S1@", "@N1@"}
+    assert extractor.get_closure("@I6@", -1) == {"@I6@"}
+    assert extractor.get_closure("@I5@", 1, both = True) == {"@I5@", "@I3@", "@I4@", "@I6@", "@F2@", "@F3@", "@S1@", "@N1@"}
+
+
+
+def test_find_individuals(write_ged):
+    extractor: Extractor = scan(write_ged)
+    assert extractor.find_individuals("3") == ["@I3@"]
+    assert extractor.find_individuals("Smith") == ["@I1@", "@I3@", "@I5@", "@I6@"]
+    assert extractor.find_individuals("99") == []
+
+
+
+def test_write_removes_dangling_pointers(write_ged):
+    extractor: Extractor = scan(write_ged)
+    output: io.BytesIO = io.BytesIO()
+    assert extractor.write(output, extractor.get_closure("@I5@", 1)) == 6
+
+    # Carl is a child, and Ed a husband, of families that are not extracted
+    lines: list[str] = output.getvalue().decode("utf-8").splitlines()
+    assert lines[0] == "0 HEAD" and lines[-1] == "0 TRLR"
+    assert "1 FAMC @F1@" not in lines and "1 FAMS @F3@" not in lines
+    assert "2 SOUR @S1@" in lines and "3 PAGE 12" in lines
+    assert "0 @N1@ NOTE Kept at the town hall" in lines
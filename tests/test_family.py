@@ -0,0 +1,134 @@
+from geddata import GEDData
+from individual import Individual
+
+
+# Frank has 2 children with Mary, then 1 with Helen. Helen had Dora with her first husband Hugo.
+# Eve was born in Frank and Mary's family, and adopted by Hugo and Helen.
+RECORDS: str = """0 @I1@ INDI
+1 NAME Frank /Lee/
+1 FAMS @F1@
+1 FAMS @F2@
+0 @I2@ INDI
+1 NAME Mary /Kent/
+1 FAMS @F1@
+0 @I3@ INDI
+1 NAME Helen /Park/
+1 FAMS @F3@
+1 FAMS @F2@
+0 @I4@ INDI
+1 NAME Anna /Lee/
+1 FAMC @F1@
+0 @I5@ INDI
+1 NAME Bert /Lee/
+1 FAMC @F1@
+1 FAMC @F99@
+0 @I6@ INDI
+1 NAME Carl /Lee/
+1 FAMC @F2@
+0 @I7@ INDI
+1 NAME Hugo /Ross/
+1 FAMS @F3@
+0 @I8@ INDI
+1 NAME Dora /Ross/
+1 FAMC @F3@
+0 @I9@ INDI
+1 NAME Eve /Lee/
+1 FAMC @F1@
+1 FAMC @F3@
+0 @F1@ FAM
+1 HUSB @I1@
+1 WIFE @I2@
+1 CHIL @I4@
+1 CHIL @I5@
+1 CHIL @I9@
+1 CHIL @I99@
+0 @F2@ FAM
+1 HUSB @I1@
+1 WIFE @I3@
+1 CHIL @I6@
+0 @F3@ FAM
+1 HUSB @I7@
+1 WIFE @I3@
+1 CHIL @I8@
+1 CHIL @I9@
+0 @F4@ FAM
+1 WIFE @I98@
+"""
+
+
+def ids(individuals: 'list[Individual]') -> 'list[int]':
+    return [indi.id for indi in individuals]
+
+
+
+
+def test_families(load_ged):
+    ged_data: GEDData = load_ged(RECORDS)
+    assert [family.reference for family in ged_data.families] == ["@F1@", "@F2@", "@F3@", "@F4@"]
+
+    # The pointers to missing records are skipped
+    family = ged_data.get_family("@F1@")
+    assert ids(family.children) == [4, 5, 9] and family.children_references[-1] == "@I99@"
+    assert ged_data.get_family("@F4@").get_parents() == []
+    assert [f.reference for f in ged_data.get_individual(5).child_families] == ["@F1@"]
+
+    frank: Individual = ged_data.get_individual(1)
+    assert family.get_other_spouse(frank).id == 2
+    assert family.get_other_spouse(ged_data.get_individual(4)) is None
+
+
+
+def test_remarriage(load_ged):
+    ged_data: GEDData = load_ged(RECORDS)
+    frank, helen = ged_data.get_individual(1), ged_data.get_individual(3)
+
+    # The children of every marriage, in the order of the families
+    assert ids(frank.get_spouses()) == [2, 3] and ids(helen.get_spouses()) == [7, 1]
+    assert ids(frank.children) == [4, 5, 9, 6]
+    assert ids(helen.children) == [8, 9, 6]
+
+    # Eve is a child of Helen (adopted), so she is not a step child
+    assert ids(frank.get_step_children()) == [8]
+    assert ids(helen.get_step_children()) == [4, 5]
+
+
+
+def test_siblings(load_ged):
+    ged_data: GEDData = load_ged(RECORDS)
+    anna: Individual = ged_data.get_individual(4)
+
+    assert ids(anna.get_siblings()) == [5, 9]
+    assert ids(anna.get_half_siblings()) == [6]
+    assert ids(anna.get_step_parents()) == [3]
+
+    # Dora is the daughter of Helen, but Eve shares Frank and Mary with Anna: not a step sibling
+    assert ids(anna.get_step_siblings()) == [8]
+
+    # Carl shares Frank with Anna and Helen with Dora
+    carl: Individual = ged_data.get_individual(6)
+    assert carl.get_siblings() == []
+    assert ids(carl.get_half_siblings()) == [4, 5, 9, 8]
+    assert carl.get_step_siblings() == []
+
+
+
+def test_several_child_families(load_ged):
+    ged_data: GEDData = load_ged(RECORDS)
+    eve: Individual = ged_data.get_individual(9)
+
+    # The father and mother come from the first family, the parents from every family
+    assert (eve.father.id, eve.mother.id) == (1, 2)
+    assert ids(eve.get_parents()) == [1, 2, 7, 3]
+    assert ids(eve.get_siblings()) == [4, 5, 8]
+
+    # Helen is a parent of Eve, so she is not her step parent
+    assert eve.get_step_parents() == []
+
+
+
+def test_without_families(load_ged):
+    ged_data: GEDData = load_ged("0 @I1@ INDI\n1 NAME Solo /Han/\n1 FAMS @F1@\n")
+    solo: Individual = ged_data.get_individual(1)
+    assert solo.spouse_families == [] and solo.children == []
+    assert solo.get_spouses() == solo.get_siblings() == solo.get_half_siblings() == []
+    assert solo.get_step_parents() == solo.get_step_children() == solo.get_step_siblings() == []
@@ -0,0 +1,154 @@
+import json
+from fulltext import TextIndex
+
+
+RECORDS: str = """0 @I1@ INDI
+1 NAME Henry /Tudor/
+1 TITL King of England
+1 NOTE Crowned at Westminster
+1 SOUR @S1@
+0 @I2@ INDI
+1 NAME Arthur /Tudor/
+1 TITL Prince of Wales
+0 @S1@ SOUR
+1 TITL Chronicle of the Kings
+"""
+
+
+
+
+def test_titles_of_individuals_are_not_indexed(load_ged):
+    index: TextIndex = load_ged(RECORDS).get_text_index()
+    assert index.find_individuals("Wales") == {}
+    assert index.find_individuals("England") == {}
+
+
+
+def test_notes_and_sources_are_indexed(load_ged):
+    index: TextIndex = load_ged(RECORDS).get_text_index()
+    assert list(index.find_individuals("Westminster")) == ["@I1@"]
+    assert list(index.find_individuals("Chronicle")) == ["@I1@"]
+
+
+
+PHRASES: str = """0 @I1@ INDI
+1 NAME Anne /Boleyn/
+1 NOTE Married the king of England in 1533
+0 @I2@ INDI
+1 NAME Jane /Seymour/
+1 NOTE The king married her; England mourned her
+0 @I3@ INDI
+1 NAME Mary /Tudor/
+1 NOTE Queen of the
+2 CONT Kingdom of England, king
+2 CONC dom of the island
+"""
+
+
+
+def test_phrases_need_adjacent_words(load_ged):
+    index: TextIndex = load_ged(PHRASES).get_text_index()
+
+    # Every word is in the notes of Anne and Jane, but only the note of Anne has them in this order
+    assert list(index.find_individuals('king England')) == ["@I1@", "@I2@"]
+    assert list(index.find_individuals('"king of England"')) == ["@I1@"]
+    assert list(index.find_individuals('"England king"')) == []
+
+    # A phrase and a word, two phrases, and a phrase of a single word
+    assert list(index.find_individuals('married "of england"')) == ["@I1@"]
+    assert list(index.find_individuals('"the king" "her England"')) == ["@I2@"]
+    assert list(index.find_individuals('"mourned"')) == ["@I2@"]
+
+
+
+def test_phrases_across_continuations(load_ged):
+    index: TextIndex = load_ged(PHRASES).get_text_index()
+
+    # CONT starts a new line and CONC continues the word
+    assert list(index.find_individuals('"the kingdom of England"')) == ["@I3@"]
+    assert list(index.find_individuals('"kingdom of the island"')) == ["@I3@"]
+    assert list(index.find_individuals('"king dom"')) == []
+
+
+
+def test_saved_index(load_ged, write_ged, tmp_path):
+    filepath: str = write_ged(PHRASES)
+    path: str = str(tmp_path / "test.ged.idx")
+    load_ged(PHRASES).get_text_index().save(path, filepath)
+
+    # The positions are kept by the saved index
+    index: TextIndex = TextIndex.load(path, filepath)
+    assert list(index.find_individuals('"king of England"')) == ["@I1@"]
+    assert index.postings["OF"] == [[0, [3]], [2, [1, 4, 7]]]
+
+    # An index saved by another version is built again
+    with open(path, encoding = "utf-8") as file: data: dict = json.load(file)
+    data["version"] = TextIndex.VERSION - 1
+    with open(path, "w", encoding = "utf-8") as file: json.dump(data, file)
+    assert TextIndex.load(path, filepath) is None
+
+
+
+# A family note, and a source cited by a note that is cited by an individual. The notes N3 and N4 cite each other.
+LINKS: str = """0 @I1@ INDI
+1 NAME Zoë /Adler/
+1 FAMS @F1@
+0 @I2@ INDI
+1 NAME Karl /Adler/
+1 FAMS @F1@
+1 NOTE @N1@
+0 @I3@ INDI
+1 NAME Lena /Adler/
+1 FAMC @F1@
+0 @F1@ FAM
+1 HUSB @I2@
+1 WIFE @I1@
+1 CHIL @I3@
+1 NOTE Emigrated together to Chicago
+0 @N1@ NOTE Letters of Zoë, see the source
+1 SOUR @S1@
+0 @S1@ SOUR
+1 TITL Archives of Hamburg
+0 @N3@ NOTE Loop one
+1 NOTE @N4@
+0 @N4@ NOTE Loop two
+1 NOTE @N3@
+"""
+
+
+
+def test_records_are_linked_to_individuals(load_ged):
+    index: TextIndex = load_ged(LINKS).get_text_index()
+
+    # A family note is about every member of the family
+    assert index.find_individuals("Chicago") == {"@I2@": ["@F1@"], "@I1@": ["@F1@"], "@I3@": ["@F1@"]}
+
+    # A source is reached through the note citing it
+    assert index.find_individuals("Hamburg") == {"@I2@": ["@S1@"]}
+
+    # Notes pointing to each other, but not linked to anyone
+    assert index.search("loop") == [index.records.index("@N3@"), index.records.index("@N4@")]
+    assert index.find_individuals("loop") == {}
+    assert index.names == {"@I1@": "Zoë Adler", "@I2@": "Karl Adler", "@I3@": "Lena Adler"}
+
+
+
+def test_terms_are_normalized(load_ged):
+    index: TextIndex = load_ged(LINKS).get_text_index()
+    assert list(index.find_individuals("zoe")) == ["@I2@"]
+    assert list(index.find_individuals('"letters of ZOË"')) == ["@I2@"]
+    assert index.search("") == [] and index.search('""') == [] and index.search("...") == []
+    assert index.search("Chicago Nowhere") == []
+
+
+
+def test_saved_index_of_a_changed_file(load_ged, write_ged, tmp_path):
+    filepath: str = write_ged(LINKS)
+    path: str = str(tmp_path / "test.ged.idx")
+    load_ged(LINKS).get_text_index().save(path, filepath)
+    assert TextIndex.load(path, filepath) is not None
+
+    # Another size (or modification time) of the .GED file: the index is outdated
+    with open(filepath, "a", encoding = "utf-8") as file: file.write("0 @N9@ NOTE Added later\n")
+    assert TextIndex.load(path, filepath) is None
+    assert TextIndex.load(str(tmp_path / "missing.idx"), filepath) is None
@@ -0,0 +1,63 @@
+import pytest
+from geddata import GEDData
+
+
+FIRST: str = """0 @I1@ INDI
+1 NAME John /Smith/
+1 FAMS @F1@
+0 @I2@ INDI
+1 NAME Paul /Smith/
+1 FAMC @F1@
+0 @F1@ FAM
+1 HUSB @I1@
+1 CHIL @I2@
+"""
+
+SECOND: str = """0 @I1@ INDI
+1 NAME Anna /Weber/
+0 @I3@ INDI
+1 NAME Hans /Weber/
+"""
+
+
+
+
+def test_parse_again(write_ged):
+    ged_data: GEDData = GEDData()
+    ged_data.parse(write_ged(FIRST, "first.ged"))
+    assert ged_data.find_individuals_fuzzy("Smith", 5)
+    ancestors = ged_data.get_ancestor_index()
+
+    # The same file again: nothing is duplicated
+    ged_data.parse(write_ged(FIRST, "first.ged"))
+    assert len(ged_data.individuals) == 2 and len(ged_data.families) == 1
+    assert [len(indi.children) for indi in ged_data.individuals] == [1, 0]
+    assert ged_data.get_ancestor_index() is not ancestors
+
+    # Another file: the individuals, the references and the indexes are the ones of the new file
+    ged_data.parse(write_ged(SECOND, "second.ged"))
+    assert [indi.get_cleared_raw_name() for indi in ged_data.individuals] == ["Anna Weber", "Hans Weber"]
+    assert ged_data.get_individual(2) is None and ged_data.families == []
+    assert [indi.id for indi in ged_data.find_individuals_fuzzy("Smith", 5)] == []
+    assert list(ged_data.component_sizes) == [1, 1] and ged_data.cycles == []
+    assert ged_data.version == 3
+
+
+
+def test_instances_are_independent(write_ged):
+    first: GEDData = GEDData()
+    first.parse(write_ged(FIRST, "first.ged"))
+    second: GEDData = GEDData()
+    second.parse(write_ged(SECOND, "second.ged"))
+    assert first.get_individual(1).last_name == "Smith" and second.get_individual(1).last_name == "Weber"
+    assert len(first.individuals) == len(second.individuals) == 2
+
+
+
+def test_frozen_data_cannot_be_parsed_again(write_ged):
+    ged_data: GEDData = GEDData()
+    ged_data.parse(write_ged(FIRST))
+    ged_data.freeze()
+    with pytest.raises(Exception, match="frozen"):
+        ged_data.parse(write_ged(SECOND))
+    assert len(ged_data.individuals) == 2
@@ -0,0 +1,151 @@
+import io
+import os
+import sys
+import bz2
+import gzip
+import lzma
+import time
+import zipfile
+import threading
+import subprocess
+import pytest
+import gedreader
+from geddata import GEDData
+
+
+SRC_DIR: str = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+CONTENT: bytes = b"0 HEAD\n1 CHAR UTF-8\n0 @I1@ INDI\n1 NAME Ann /Lee/\n0 @I2@ INDI\n1 NAME Bob /Lee/\n0 TRLR\n"
+
+
+def names(filepath: str) -> 'list[str]':
+    ged_data: GEDData = GEDData()
+    ged_data.parse(filepath)
+    return [indi.get_cleared_raw_name() for indi in ged_data.individuals]
+
+
+def write_zip(path, files: 'list[tuple[str, bytes]]') -> str:
+    with zipfile.ZipFile(path, 'w') as archive:
+        for name, content in files: archive.writestr(name, content)
+    return str(path)
+
+
+
+
+@pytest.mark.parametrize("compress", [gzip.compress, lzma.compress, bz2.compress])
+def test_compressed_inputs(tmp_path, compress):
+    # The format comes from the first bytes, not from the extension
+    path = tmp_path / "family.ged"
+    path.write_bytes(compress(CONTENT))
+    assert names(str(path)) == ["Ann Lee", "Bob Lee"]
+
+    # The size of a compressed input is unknown, but the decompressed bytes are counted
+    progress: gedreader.ReadProgress = gedreader.ReadProgress()
+    list(gedreader.iter_records(str(path), progress))
+    assert progress.total_bytes is None and progress.bytes_read == len(CONTENT)
+
+
+def test_plain_input_size(tmp_path):
+    path = tmp_path / "family.ged"
+    path.write_bytes(CONTENT)
+    progress: gedreader.ReadProgress = gedreader.ReadProgress()
+    list(gedreader.iter_records(str(path), progress))
+    assert progress.total_bytes == progress.bytes_read == len(CONTENT)
+
+
+def test_zip_archives(tmp_path):
+    # The first .ged file is read, even if it is not the first file of the archive
+    path: str = write_zip(tmp_path / "a.zip", [("docs/", b""), ("README.txt", b"not a .GED file"), ("tree/family.GED", CONTENT)])
+    assert names(path) == ["Ann Lee", "Bob Lee"]
+
+    # Without a .ged file, the first file is read
+    assert names(write_zip(tmp_path / "b.zip", [("family.txt", CONTENT)])) == ["Ann Lee", "Bob Lee"]
+
+    with pytest.raises(Exception, match = "empty"):
+        names(write_zip(tmp_path / "c.zip", [("docs/", b"")]))
+
+
+def test_empty_input(tmp_path):
+    path = tmp_path / "empty.ged"
+    path.write_bytes(b"")
+    assert list(gedreader.iter_records(str(path))) == []
+    with pytest.raises(Exception, match = "not a valid"):
+        names(str(path))
+
+
+
+
+def zip_content(content: bytes) -> bytes:
+    buffer: io.BytesIO = io.BytesIO()
+    write_zip(buffer, [("family.ged", content)])
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("compress", [bytes, gzip.compress, zip_content])
+def test_standard_input(compress):
+    # The input is piped, so it can't be seeked: a .zip archive is read in memory
+    script: str = "from geddata import GEDData\nd = GEDData()\nd.parse('-')\nprint(len(d.individuals))"
+    result = subprocess.run([sys.executable, "-c", script], input = compress(CONTENT), capture_output = True, cwd = SRC_DIR, timeout = 30)
+    assert result.stdout.strip() == b"2", result.stderr
+
+
+
+
+class BlockingStream:
+    """A stream returning one chunk, then blocking like a pipe nobody writes to."""
+
+    def __init__(self) -> None:
+        self.release: threading.Event = threading.Event()
+        self.reads: int = 0
+
+    def read(self, size: int) -> bytes:
+        self.reads += 1
+        if self.reads == 1: return b"0 HEAD\n"
+        self.release.wait()
+        return b"1 CHAR UTF-8\n"
+
+
+def test_blocked_reader_is_not_waited_for(monkeypatch):
+    monkeypatch.setattr(gedreader, "STOP_TIMEOUT", 0.2)
+    stream: BlockingStream = BlockingStream()
+    threads: int = threading.active_count()
+
+    chunks = gedreader.read_chunks(stream)
+    assert next(chunks) == b"0 HEAD\n"
+
+    # Stopping early waits at most STOP_TIMEOUT for the blocked thread (the timer only ends the test if it waits longer)
+    timer: threading.Timer = threading.Timer(3, stream.release.set)
+    timer.start()
+    start: float = time.monotonic()
+    chunks.close()
+    assert time.monotonic() - start < 2
+    timer.cancel()
+    timer.join()
+
+    # Once its read returns, the thread ends without putting anything
+    stream.release.set()
+    deadline: float = time.monotonic() + 5
+    while threading.active_count() > threads and time.monotonic() < deadline: time.sleep(0.05)
+    assert stream.reads == 2 and threading.active_count() == threads
+
+
+def test_reading_errors_are_raised_again():
+    class FailingStream:
+        def read(self, size: int) -> bytes:
+            raise OSError("disk error")
+
+    with pytest.raises(OSError, match = "disk error"):
+        list(gedreader.read_chunks(FailingStream()))
+
+
+def test_stopped_reader_reads_no_further(monkeypatch):
+    # A reader stopped early does not read the whole input
+    monkeypatch.setattr(gedreader, "CHUNK_SIZE", 4)
+    monkeypatch.setattr(gedreader, "PREFETCH_CHUNKS", 2)
+    stream: io.BytesIO = io.BytesIO(CONTENT * 100)
+
+    chunks = gedreader.read_chunks(stream)
+    next(chunks)
+    chunks.close()
+    time.sleep(0.3)
+    assert stream.tell() < len(CONTENT)
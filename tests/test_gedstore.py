@@ -0,0 +1,91 @@
+# The database must give the same answers as the GEDData loaded from the same file.
+
+import os
+import pytest
+from geddata import GEDData
+from gedstore import GEDStore
+from graphic_tree import GraphicTree
+
+
+ROYAL92: str = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "example", "royal92.ged")
+
+
+
+
+@pytest.fixture(scope="module")
+def royal92() -> GEDData:
+    ged_data: GEDData = GEDData()
+    ged_data.parse(ROYAL92)
+    return ged_data
+
+
+
+@pytest.fixture(scope="module")
+def store(tmp_path_factory) -> GEDStore:
+    store: GEDStore = GEDStore(str(tmp_path_factory.mktemp("store") / "royal92.db"))
+    store.import_ged_file(ROYAL92)
+    yield store
+    store.close()
+
+
+
+def get_ids(individuals) -> 'list[int]':
+    return [indi.id for indi in individuals]
+
+
+
+
+def test_round_trip(royal92, store):
+    assert len(store.individuals) == len(royal92.individuals)
+    for indi in royal92.individuals[::50]:
+        stored = store.get_individual(indi.id)
+        assert (stored.get_cleared_raw_name(), stored.first_name, stored.last_name, stored.sex) == \
+               (indi.get_cleared_raw_name(), indi.first_name, indi.last_name, indi.sex)
+        assert stored.get_tree_date_str() == indi.get_tree_date_str()
+
+
+
+def test_find_individuals(royal92, store):
+    # "Victoria  Hanover" only matches the first and last names separated by 2 spaces
+    for search in ["Victoria", "^Albert", "Victoria  Hanover", "Charles  Stuart", "Tudor/$", "of Saxe"]:
+        assert get_ids(store.find_individuals(search)) == sorted(get_ids(royal92.find_individuals(search))), search
+    assert store.find_individuals("Victoria  Hanover") != []
+
+
+
+def test_find_name_variations(write_ged, tmp_path):
+    # "Smith$" only matches the first and last names without the suffix
+    path: str = write_ged("0 @I1@ INDI\n1 NAME John /Smith/ Jr\n0 @I2@ INDI\n1 NAME Ann_Mary /Smith/\n0 @I3@ INDI\n1 NAME Paul /Smithson/\n")
+    ged_data: GEDData = GEDData()
+    ged_data.parse(path)
+    store: GEDStore = GEDStore(str(tmp_path / "names.db"))
+    store.import_ged_file(path)
+
+    for search in ["Smith$", "^John  Smith$", "Ann Mary", "/Smith/", "Smith"]:
+        assert get_ids(store.find_individuals(search)) == get_ids(ged_data.find_individuals(search)), search
+    assert get_ids(store.find_individuals("Smith$")) == [1, 2]
+    store.close()
+
+
+
+def test_load_tree(royal92, store):
+    for depth in (3, -2):
+        root = store.load_tree(store.get_individual(1), depth)
+        for generation in range(0, depth + (1 if depth > 0 else -1), 1 if depth > 0 else -1):
+            assert get_ids(root.get_ancestors(generation)) == get_ids(royal92.get_individual(1).get_ancestors(generation))
+
+
+
+def test_individual_without_name(write_ged, tmp_path):
+    # The file can't be loaded in a GEDData, but it can be stored and drawn
+    store: GEDStore = GEDStore(str(tmp_path / "unnamed.db"))
+    store.import_ged_file(write_ged("0 @I1@ INDI\n1 SEX F\n0 @I2@ INDI\n1 NAME Mary\n1 FAMC @F1@\n0 @F1@ FAM\n1 WIFE @I1@\n1 CHIL @I2@\n"))
+
+    assert get_ids(store.individuals) == [1, 2]
+    assert GraphicTree.get_label(store.get_individual(1)) == ["", "", ""]
+    assert get_ids(store.find_individuals("Mary")) == [2]
+
+    root = store.load_tree(store.get_individual(2), 1)
+    assert GraphicTree.get_label(root) == ["", "Mary", ""]
+    assert root.mother.id == 1
+    store.close()
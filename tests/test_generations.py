@@ -0,0 +1,69 @@
+# Adam and Eve are founders, Carl is their son and Dora his daughter. By mistake, Hugo is the
+# father of Ivan and Ivan the father of Hugo, and Jack is the son of Ivan. Kate is her own mother.
+FAMILY: str = """0 @I1@ INDI
+1 NAME Adam /Smith/
+1 FAMS @F1@
+0 @I2@ INDI
+1 NAME Eve /Jones/
+1 FAMS @F1@
+0 @I3@ INDI
+1 NAME Carl /Smith/
+1 FAMC @F1@
+1 FAMS @F2@
+0 @I4@ INDI
+1 NAME Dora /Smith/
+1 FAMC @F2@
+0 @I5@ INDI
+1 NAME Hugo /Brown/
+1 FAMC @F4@
+1 FAMS @F3@
+0 @I6@ INDI
+1 NAME Ivan /Brown/
+1 FAMC @F3@
+1 FAMS @F4@
+0 @I7@ INDI
+1 NAME Jack /Brown/
+1 FAMC @F4@
+0 @I8@ INDI
+1 NAME Kate /White/
+1 FAMC @F5@
+1 FAMS @F5@
+0 @F1@ FAM
+1 HUSB @I1@
+1 WIFE @I2@
+1 CHIL @I3@
+0 @F2@ FAM
+1 HUSB @I3@
+1 CHIL @I4@
+0 @F3@ FAM
+1 HUSB @I5@
+1 CHIL @I6@
+0 @F4@ FAM
+1 HUSB @I6@
+1 CHIL @I5@
+1 CHIL @I7@
+0 @F5@ FAM
+1 WIFE @I8@
+1 CHIL @I8@
+"""
+
+
+
+
+def test_generations(load_ged):
+    ged_data = load_ged(FAMILY)
+    assert [ged_data.get_individual(i).generation for i in range(1, 5)] == [0, 0, 1, 2]
+    assert [indi.reference for indi in ged_data.topological_order[:2]] == ["@I1@", "@I2@"]
+
+
+
+def test_cycles(load_ged):
+    ged_data = load_ged(FAMILY)
+    assert sorted(sorted(cycle) for cycle in ged_data.cycles) == [["@I5@", "@I6@"], ["@I8@"]]
+
+
+
+def test_descendants_of_a_cycle_have_no_generation(load_ged):
+    ged_data = load_ged(FAMILY)
+    assert [ged_data.get_individual(i).generation for i in range(5, 9)] == [None, None, None, None]
+    assert len(ged_data.topological_order) == 4
@@ -0,0 +1,70 @@
+# The walks on the arrays must find the same individuals as the walks on the objects of the GEDData.
+
+import os
+import pytest
+import extract
+from extract import Extractor
+from geddata import GEDData
+
+np = pytest.importorskip("numpy")
+
+
+ROYAL92: str = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "example", "royal92.ged")
+
+
+
+
+@pytest.fixture(scope="module")
+def royal92() -> GEDData:
+    ged_data: GEDData = GEDData()
+    ged_data.parse(ROYAL92)
+    return ged_data
+
+
+
+def walk(indi, generations: int, upward: bool) -> 'list[set]':
+    """Return the generations of ancestors (or descendants) of the individual, by following its attributes."""
+    visited: set = {indi}
+    frontiers: list[set] = []
+    frontier: set = {indi}
+    while frontier and len(frontiers) < generations:
+        neighbours = ([person.father, person.mother] if upward else person.children for person in frontier)
+        frontier = {other for others in neighbours for other in others if other is not None and other not in visited}
+        visited |= frontier
+        if frontier: frontiers.append(frontier)
+    return frontiers
+
+
+
+
+def test_frontiers(royal92):
+    arrays = royal92.get_graph_arrays()
+    for indi in royal92.individuals[::25]:
+        for upward in (True, False):
+            frontiers: list = arrays.get_frontiers([indi], 6, upward)
+            assert [set(arrays.to_individuals(frontier)) for frontier in frontiers] == walk(indi, 6, upward)
+
+
+
+def test_counts(royal92):
+    arrays = royal92.get_graph_arrays()
+    victoria = royal92.get_individual(1)
+    descendants: set = set().union(*walk(victoria, 100, False))
+    assert arrays.count_descendants([victoria]) == len(descendants)
+    assert set(arrays.get_ancestors(victoria, 3)) == set().union(*walk(victoria, 3, True))
+    assert list(arrays.count_children()[:10]) == [len(indi.children) for indi in royal92.individuals[:10]]
+    assert arrays.generation_histogram().sum() == sum(1 for indi in royal92.individuals if indi.generation is not None)
+
+
+
+def test_extract_with_and_without_arrays(monkeypatch):
+    with_arrays: Extractor = Extractor(ROYAL92)
+    with_arrays.scan()
+    without_arrays: Extractor = Extractor(ROYAL92)
+    without_arrays.scan()
+
+    roots: list[str] = list(with_arrays.names)[::100]
+    closures: list = [with_arrays.get_closure(root, depth, both) for root in roots for depth in (2, -2, -5) for both in (False, True)]
+    monkeypatch.setattr(extract, "has_numpy", lambda: False)
+    assert closures == [without_arrays.get_closure(root, depth, both) for root in roots for depth in (2, -2, -5) for both in (False, True)]
+    assert without_arrays._arrays is None
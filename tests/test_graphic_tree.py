@@ -0,0 +1,292 @@
+import os
+import pytest
+from geddata import GEDData
+from graphic_tree import GraphicTree, LRUCache
+from individual import Individual
+
+
+EXAMPLE: str = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "example", "royal92.ged")
+
+
+
+
+@pytest.fixture(scope="module")
+def royal92() -> GEDData:
+    ged_data: GEDData = GEDData()
+    ged_data.parse(EXAMPLE)
+    return ged_data
+
+
+
+def test_initials_label() -> None:
+    indi: Individual = Individual.from_values(1, "George Frederick Ernest /Saxe-Coburg-Gotha/", birth_date = "1738", death_date = "1820")
+    full: list[str] = GraphicTree.get_label(indi)
+    short: list[str] = GraphicTree.get_label(indi, "initials", 12)
+    assert all(len(line) <= 12 for line in short)
+    assert short[0].startswith("G.") and short[2] == full[2]
+
+    # The years are left out rather than cut
+    assert GraphicTree.get_label(indi, "initials", 6)[2] == ""
+
+
+
+def test_initials_of_particles_and_brackets() -> None:
+    # Names of the grandparents of George IV in royal92
+    charlotte: Individual = Individual.from_values(1, "(Sophia) Charlotte //")
+    elizabeth: Individual = Individual.from_values(2, "Elizabeth of_Saxe- Hildburghausen/Albertin/")
+    francis: Individual = Individual.from_values(3, "Francis Frederick of_Saxe-Coburg//")
+
+    assert GraphicTree.get_label(charlotte, "initials", 8)[:2] == ["", "Charlot."]
+    assert GraphicTree.get_label(elizabeth, "initials", 20)[:2] == ["E. S. H.", "Albertin"]
+    assert GraphicTree.get_label(francis, "initials", 20)[:2] == ["F.", "F. Saxe-Coburg"]
+
+    # The lines are cut after a word, not after a space or a dot
+    assert GraphicTree.get_label(elizabeth, "initials", 7)[0] == "E. S."
+    assert GraphicTree.get_label(francis, "initials", 8)[1] == "F. Saxe."
+    assert GraphicTree.get_label(francis, "initials", 4)[1] == "F."
+    assert GraphicTree.get_label(francis, "initials", 1)[:2] == ["", ""]
+
+
+
+def test_realistic_depth_uses_initials(royal92: GEDData) -> None:
+    # The grandparents of Queen Victoria don't fit in 80 columns with their full names
+    royal_tree: GraphicTree = GraphicTree()
+    royal_tree.set_dataset(royal92)
+    root: Individual = royal92.get_individual(1)
+    depth, label_styles = royal_tree.fit(root, 2, 80)
+    assert depth == 2
+    assert label_styles == ["full", "full", "initials"]
+
+    chart: str = royal_tree.draw(root, depth, 80, label_styles)
+    assert "Hanover" in chart and "G. III" in chart
+    assert all(len(line) <= 80 for line in chart.split('\n'))
+
+
+
+def test_wide_family(load_ged) -> None:
+    # 40 children: their labels only fit a wide chart, even as initials
+    children: range = range(10, 50)
+    ged_data: GEDData = load_ged("0 @I1@ INDI\n1 NAME Abraham Bartholomew /Vandermeulen/\n1 FAMS @F1@\n"
+                                 + "".join(f"0 @I{n}@ INDI\n1 NAME Child{n} Maximilian /Vandermeulen/\n1 FAMC @F1@\n" for n in children)
+                                 + "0 @F1@ FAM\n1 HUSB @I1@\n" + "".join(f"1 CHIL @I{n}@\n" for n in children))
+    wide_tree: GraphicTree = GraphicTree()
+    wide_tree.set_dataset(ged_data)
+    root: Individual = ged_data.get_individual(1)
+
+    assert wide_tree.fit(root, -1, 200) == (-1, ["full", "initials"])
+    chart: str = wide_tree.draw(root, -1, 200, ["full", "initials"])
+    assert chart.split("\n")[-3].split() == ["C."] * 40
+
+    # Narrower, the initials would be cut down to nothing and the ids overlap: only the root is drawn
+    assert not wide_tree.labels_fit(root, -1, 120, "initials", True)
+    assert wide_tree.fit(root, -1, 120) == (0, ["full"])
+
+
+
+def test_fitted_charts_fit(royal92: GEDData) -> None:
+    royal_tree: GraphicTree = GraphicTree()
+    royal_tree.set_dataset(royal92)
+
+    for number in (1, 2, 52, 400):
+        root: Individual = royal92.get_individual(number)
+        for width in (12, 30, 80, 120):
+            for depth in (3, 1, 0, -1, -3):
+                used_depth, label_styles = royal_tree.fit(root, depth, width)
+                assert abs(used_depth) <= abs(depth) and len(label_styles) == abs(used_depth) + 1
+
+                # Drawn as fitted, no line is too long, and no generation is left blank
+                chart: str = royal_tree.draw(root, used_depth, width, label_styles)
+                assert all(len(line) <= width for line in chart.split("\n")), (number, width, depth)
+                for generation, label_style in zip(range(0, used_depth + (1 if depth >= 0 else -1), 1 if depth >= 0 else -1), label_styles):
+                    individuals, centers = royal_tree.get_generation(root, generation, width, depth < 0)
+                    max_length: int = GraphicTree.get_label_length(centers, width)
+                    assert all(any(GraphicTree.get_label(indi, label_style, max_length)) for indi in individuals)
+
+
+
+def test_tiny_width(royal92: GEDData) -> None:
+    # The root is always drawn, with the least detailed labels if nothing fits
+    royal_tree: GraphicTree = GraphicTree()
+    royal_tree.set_dataset(royal92)
+    assert royal_tree.fit(royal92.get_individual(1), 3, 1) == (0, ["ids"])
+    assert royal_tree.draw(royal92.get_individual(1), 0, 1, ["ids"]).strip() == "1"
+
+
+
+def test_lru_cache() -> None:
+    cache: LRUCache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1                  # "a" is now the most recently used
+    cache.put("c", 3)                           # so "b" is dropped
+    assert cache.get("b") is None and cache.get("c") == 3 and cache.get("a") == 1
+    assert cache.stats() == {"hits": 3, "misses": 1, "size": 2, "maxsize": 2}
+
+    cache.clear()
+    assert cache.get("a") is None and cache.stats()["size"] == 0
+
+
+
+def test_draw_reuses_fit_and_charts(royal92: GEDData) -> None:
+    royal_tree: GraphicTree = GraphicTree()
+    royal_tree.set_dataset(royal92)
+    root: Individual = royal92.get_individual(1)
+
+    depth, label_styles = royal_tree.fit(root, 2, 80)
+    misses: int = royal_tree.cache_stats()["lines"]["misses"]
+    chart: str = royal_tree.draw(root, depth, 80, label_styles)
+
+    # The generations computed by fit() are not computed again, only the lines
+    stats: dict = royal_tree.cache_stats()
+    assert stats["lines"]["hits"] >= 3 and stats["lines"]["misses"] == misses + 5
+    assert royal_tree.draw(root, depth, 80, label_styles) is chart
+    assert royal_tree.cache_stats()["charts"]["hits"] == 1
+
+
+
+def test_directions_are_cached_apart(royal92: GEDData) -> None:
+    royal_tree: GraphicTree = GraphicTree()
+    royal_tree.set_dataset(royal92)
+    root: Individual = royal92.get_individual(1)
+
+    royal_tree.draw(root, 1, 80)
+    hits: int = royal_tree.cache_stats()["lines"]["hits"]
+    royal_tree.draw(root, -1, 80)
+    assert royal_tree.cache_stats()["lines"]["hits"] == hits
+    assert royal_tree.draw(root, 0, 80) != "" and royal_tree.cache_stats()["charts"]["hits"] == 0
+
+
+
+def test_eviction_and_dataset_change(royal92: GEDData) -> None:
+    royal_tree: GraphicTree = GraphicTree(cache_size = 2)
+    royal_tree.set_dataset(royal92)
+    charts: list[str] = [royal_tree.draw(royal92.get_individual(number), 1, 80) for number in (1, 2, 3)]
+
+    # The chart of the first root was dropped, the last one is kept
+    assert royal_tree.cache_stats()["charts"]["size"] == 2
+    assert royal_tree.draw(royal92.get_individual(1), 1, 80) == charts[0]
+    assert royal_tree.cache_stats()["charts"]["hits"] == 0
+    assert royal_tree.draw(royal92.get_individual(3), 1, 80) is charts[2]
+    assert royal_tree.cache_stats()["charts"]["hits"] == 1
+
+    # A new version of the dataset empties the caches, without calling set_dataset()
+    royal92.version += 1
+    try:
+        royal_tree.draw(royal92.get_individual(3), 1, 80)
+        assert royal_tree.cache_stats()["charts"]["hits"] == 1 and royal_tree.cache_stats()["charts"]["size"] == 1
+    finally:
+        royal92.version -= 1
+
+
+
+
+# Dad and Mum are half-siblings: Grandpa, and his father, appear twice in the pedigree of Child.
+# Dad's family has no mother, Ann and Ben are the father of each other (a cycle).
+PEDIGREE: str = """0 @I1@ INDI
+1 NAME Child /Doe/
+1 FAMC @F1@
+0 @I2@ INDI
+1 NAME Dad /Doe/
+1 BIRT
+2 DATE 1900
+1 FAMC @F2@
+0 @I3@ INDI
+1 NAME Mum /Doe/
+1 FAMC @F3@
+0 @I4@ INDI
+1 NAME Grandpa /Doe/
+1 FAMC @F4@
+0 @I5@ INDI
+1 NAME Grandma /Poe/
+0 @I6@ INDI
+1 NAME Great /Doe/
+0 @I7@ INDI
+1 NAME Ann /Cyc/
+1 FAMC @F7@
+0 @I8@ INDI
+1 NAME Ben /Cyc/
+1 FAMC @F8@
+0 @F1@ FAM
+1 HUSB @I2@
+1 WIFE @I3@
+1 CHIL @I1@
+0 @F2@ FAM
+1 HUSB @I4@
+1 CHIL @I2@
+0 @F3@ FAM
+1 HUSB @I4@
+1 WIFE @I5@
+1 CHIL @I3@
+0 @F4@ FAM
+1 HUSB @I6@
+1 CHIL @I4@
+0 @F7@ FAM
+1 HUSB @I8@
+1 CHIL @I7@
+0 @F8@ FAM
+1 HUSB @I7@
+1 CHIL @I8@
+"""
+
+
+
+def test_pedigree_depths(load_ged) -> None:
+    ged_data: GEDData = load_ged(PEDIGREE)
+    pedigree_tree: GraphicTree = GraphicTree()
+    child: Individual = ged_data.get_individual(1)
+
+    assert list(pedigree_tree.iter_pedigree_lines(child, 0)) == ["Child Doe (1)"]
+    assert list(pedigree_tree.iter_pedigree_lines(child, 1)) == [
+        "  ╔══ Dad Doe (2, 1900)",
+        "Child Doe (1)",
+        "  ╚══ Mum Doe (3)",
+    ]
+
+    # An individual without parents ends its branch before the depth
+    assert list(pedigree_tree.iter_pedigree_lines(ged_data.get_individual(6), 5)) == ["Great Doe (6)"]
+
+
+
+def test_pedigree_collapse(load_ged) -> None:
+    ged_data: GEDData = load_ged(PEDIGREE)
+    lines: list[str] = list(GraphicTree().iter_pedigree_lines(ged_data.get_individual(1), 10))
+
+    # Fathers above, mothers below. Dad has no mother, and Grandpa is only expanded the first time
+    assert lines == [
+        "              ╔══ Great Doe (6)",
+        "        ╔══ Grandpa Doe (4)",
+        "  ╔══ Dad Doe (2, 1900)",
+        "Child Doe (1)",
+        "  ║     ╔══ Grandpa Doe (4) (see above)",
+        "  ╚══ Mum Doe (3)",
+        "        ╚══ Grandma Poe (5)",
+    ]
+
+    # Each generation is a column of the same width
+    width: int = GraphicTree.PEDIGREE_COLUMN_WIDTH
+    for line in lines:
+        column: int = len(line) - len(line.lstrip(" ║╔╚═"))
+        assert column % width == 0
+
+
+
+def test_pedigree_cycle(load_ged) -> None:
+    # A cycle is not followed forever, even without a depth limit
+    ged_data: GEDData = load_ged(PEDIGREE)
+    lines: list[str] = list(GraphicTree().iter_pedigree_lines(ged_data.get_individual(7), 1000))
+    assert [line.strip(" ║╔╚═") for line in lines] == ["Ann Cyc (7) (see above)", "Ben Cyc (8)", "Ann Cyc (7)"]
+
+
+
+def test_pedigree_is_streamed(royal92: GEDData) -> None:
+    # The first lines come before the rest of the pedigree is walked
+    lines = GraphicTree().iter_pedigree_lines(royal92.get_individual(1), 30)
+    first: str = next(lines)
+    assert first.strip(" ║╔╚═") != "" and not first.startswith("Victoria")
+
+    # Each ancestor is expanded once, adding at most 2 lines: the chart grows with the number of
+    # distinct ancestors, not as 2 ** depth
+    labels: list[str] = [line.strip(" ║╔╚═") for line in [first] + list(lines)]
+    assert "Victoria  Hanover (1, 1819-†1901)" in labels
+    assert any(label.endswith("(see above)") for label in labels)
+    assert len(labels) <= 1 + 2 * len(set(label.replace(" (see above)", "") for label in labels))
@@ -0,0 +1,35 @@
+PEOPLE: str = """0 @I1@ INDI
+1 NAME William /Smith/
+0 @I2@ INDI
+1 NAME Willem /Smyth/
+0 @I3@ INDI
+1 NAME Wilhelmina /Schmidt/
+0 @I4@ INDI
+1 NAME John /Taylor/
+0 @I5@ INDI
+1 NAME Jon /Smith/
+"""
+
+
+
+
+def get_ids(individuals) -> 'list[int]':
+    return [indi.id for indi in individuals]
+
+
+
+
+def test_spelling_variations(load_ged):
+    ged_data = load_ged(PEOPLE)
+    assert get_ids(ged_data.find_individuals_fuzzy("William Smith", 2)) == [1, 2]
+    assert get_ids(ged_data.find_individuals_fuzzy("Willem Smyth", 2)) == [2, 1]
+    assert get_ids(ged_data.find_individuals_fuzzy("Jon Smith", 1)) == [5]
+
+
+
+def test_scores(load_ged):
+    index = load_ged(PEOPLE).get_name_index()
+    assert [(score, indi.id) for score, indi in index.search("william smith", 3)] == [(0, 1), (3, 2), (7, 5)]
+    assert get_ids(index.best_matches("Smith")) == [1, 5]
+    assert index.search("", 3) == []
+    assert index.search("Zzyzx", 3) == []
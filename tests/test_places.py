@@ -0,0 +1,84 @@
+from geddata import GEDData
+from individual import Individual
+from places import PlaceTrie, PlaceNode
+
+
+PLACES: 'list[tuple[str, str]]' = [
+    ("Munich, Bavaria, Germany", None),
+    ("Nuremberg,, Bavaria , Germany,", "Munich, Bavaria, Germany"),
+    ("Paris, France", "Paris, Texas, USA"),
+    ("Paris, Texas, USA", None),
+    ("Washington, Washington, USA", "bavaria,  GERMANY"),
+    ("", ""),
+]
+
+
+def individuals() -> 'list[Individual]':
+    return [Individual.from_values(number, "A /B/", birth_place = birth, death_place = death)
+            for number, (birth, death) in enumerate(PLACES, 1)]
+
+
+def ids(individuals: 'list[Individual]') -> 'list[int]':
+    return sorted(indi.id for indi in individuals)
+
+
+
+
+def test_split():
+    # From the largest jurisdiction, without the empty ones and the spaces around the names
+    assert PlaceTrie.split("Nuremberg,, Bavaria , Germany,") == ["Germany", "Bavaria", "Nuremberg"]
+    assert PlaceTrie.split(" , ") == [] and PlaceTrie.split(None) == []
+
+
+
+def test_hierarchy():
+    trie: PlaceTrie = PlaceTrie(individuals())
+
+    # The spellings of a same place share a node, named as first written
+    bavaria: PlaceNode = trie.get_node("Bavaria, Germany")
+    assert trie.get_node("BAVARIA,germany") is bavaria and bavaria.get_full_name() == "Bavaria, Germany"
+    assert sorted(bavaria.children) == ["munich", "nuremberg"]
+    assert ids(bavaria.deaths) == [5] and bavaria.births == []
+
+    # The places are located in every jurisdiction containing them, births and deaths apart
+    assert ids(bavaria.get_births()) == [1, 2] and ids(bavaria.get_deaths()) == [2, 5]
+    assert trie.get_node("Germany").count_births() == 2
+    assert [node.name for node in trie.get_node("Munich, Bavaria, Germany").get_parents()] == ["Bavaria", "Germany", ""]
+
+    # Unknown places are not created by a lookup
+    assert trie.get_node("Augsburg, Bavaria, Germany") is None
+    assert sorted(bavaria.children) == ["munich", "nuremberg"] and trie.find_regions("Augsburg") == []
+
+
+
+def test_regions_with_the_same_name():
+    trie: PlaceTrie = PlaceTrie(individuals())
+
+    # A name at any level, and in several countries
+    assert ids(trie.get_births_in("Paris")) == [3, 4]
+    assert ids(trie.get_births_in("paris,  france")) == [3]
+    assert ids(trie.get_deaths_in("Texas")) == [3]
+
+    # The jurisdictions must follow each other: Munich is not directly in Germany
+    assert trie.find_regions("Munich, Germany") == []
+
+    # Washington the city is inside Washington the state: listed once
+    assert [node.get_full_name() for node in trie.find_regions("Washington")] == ["Washington, USA"]
+    assert ids(trie.get_births_in("Washington")) == [5]
+    assert trie.find_regions("") == []
+
+
+
+def test_is_in_agrees_with_the_trie():
+    trie: PlaceTrie = PlaceTrie(individuals())
+    for region in ["Bavaria", "Germany", "Paris", "Paris, France", "Texas, USA", "Washington", "Munich, Germany", "Spain"]:
+        expected: list[int] = ids(indi for indi in individuals() if indi.birth_place and PlaceTrie.is_in(indi.birth_place, region))
+        assert ids(trie.get_births_in(region)) == expected, region
+
+
+
+def test_places_are_interned(load_ged):
+    ged_data: GEDData = load_ged("".join(f"0 @I{number}@ INDI\n1 NAME A /B/\n1 BIRT\n2 PLAC Munich, Bavaria\n1 DEAT\n2 PLAC Munich, Bavaria\n" for number in (1, 2)))
+    places: list[str] = [place for indi in ged_data.individuals for place in (indi.birth_place, indi.death_place)]
+    assert places == ["Munich, Bavaria"] * 4
+    assert all(place is places[0] for place in places)
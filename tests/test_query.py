@@ -0,0 +1,83 @@
+import pytest
+from query import Query, QueryError
+
+
+PEOPLE: str = """0 @I1@ INDI
+1 NAME John /Smith/
+1 SEX M
+1 BIRT
+2 DATE 1790
+2 PLAC York, York, England
+0 @I2@ INDI
+1 NAME Mary /Smith/
+1 SEX F
+1 BIRT
+2 DATE 1795
+2 PLAC Leeds, York, England
+1 DEAT
+2 DATE 1850
+2 PLAC London, England
+0 @I3@ INDI
+1 NAME Anna /Weber/
+1 SEX F
+1 BIRT
+2 DATE 1810
+2 PLAC Munich, Bavaria, Germany
+0 @I4@ INDI
+1 NAME Hans /Weber/
+1 SEX M
+1 BIRT
+2 DATE 1805
+2 PLAC New York, USA
+"""
+
+
+
+
+def filter_ids(ged_data, expression: str) -> 'list[int]':
+    """Return the ids of the individuals matching the expression, sorted (duplicates are kept)."""
+    return sorted(indi.id for indi in Query(expression).filter(ged_data))
+
+
+
+def test_region_queries(load_ged):
+    ged_data = load_ged(PEOPLE)
+    assert filter_ids(ged_data, 'born_in = England') == [1, 2]
+    assert filter_ids(ged_data, 'born_in = Bavaria') == [3]
+    assert filter_ids(ged_data, 'born_in = "Bavaria, Germany"') == [3]
+    assert filter_ids(ged_data, 'died_in = England') == [2]
+    assert filter_ids(ged_data, 'born_in = Spain') == []
+
+
+
+def test_nested_regions_are_not_repeated(load_ged):
+    # "York, York, England" is a York inside the York county: John is only listed once
+    ged_data = load_ged(PEOPLE)
+    assert filter_ids(ged_data, 'born_in = York') == [1, 2]
+    assert filter_ids(ged_data, 'born_in = "York, England"') == [1, 2]
+    assert sorted(indi.id for indi in ged_data.get_place_trie().get_births_in("York")) == [1, 2]
+
+
+
+def test_conditions(load_ged):
+    ged_data = load_ged(PEOPLE)
+    assert filter_ids(ged_data, 'sex = F and born < 1800') == [2]
+    assert filter_ids(ged_data, 'name ~ weber or born_in = York') == [1, 2, 3, 4]
+    assert filter_ids(ged_data, 'not has_death and place ~ "york"') == [1, 4]
+
+
+
+def test_indexes_select_the_same_individuals(load_ged):
+    # The candidates of the indexes are only a superset: the result is the same as testing everyone
+    ged_data = load_ged(PEOPLE)
+    for expression in ['born >= 1795 and born < 1810', 'sex = M and name ~ "smi"', 'place ~ york and died > 1800',
+                       'birth_place ~ "^new" and sex = M', 'born_in = England and not has_death']:
+        query: Query = Query(expression)
+        assert filter_ids(ged_data, expression) == sorted(indi.id for indi in ged_data.individuals if query.predicate(indi))
+
+
+
+def test_invalid_expressions():
+    for expression in ['born <', 'sex = F and (', 'foo = 3', 'name ~ "("']:
+        with pytest.raises(QueryError):
+            Query(expression)
@@ -0,0 +1,218 @@
+from individual import Individual
+from relationship import Relationship
+
+
+# Grandparents Adam and Eve, their children Carl and Dora, Carl's children Ann and Bob, and
+# Dora's son Ed. Fred had Gina with Dora in another family.
+FAMILY: str = """0 @I1@ INDI
+1 NAME Adam /Smith/
+1 SEX M
+1 FAMS @F1@
+0 @I2@ INDI
+1 NAME Eve /Jones/
+1 SEX F
+1 FAMS @F1@
+0 @I3@ INDI
+1 NAME Carl /Smith/
+1 SEX M
+1 FAMC @F1@
+1 FAMS @F2@
+0 @I4@ INDI
+1 NAME Dora /Smith/
+1 SEX F
+1 FAMC @F1@
+1 FAMS @F3@
+1 FAMS @F4@
+0 @I5@ INDI
+1 NAME Ann /Smith/
+1 SEX F
+1 FAMC @F2@
+0 @I6@ INDI
+1 NAME Bob /Smith/
+1 SEX M
+1 FAMC @F2@
+0 @I7@ INDI
+1 NAME Ed /Brown/
+1 SEX M
+1 FAMC @F3@
+0 @I8@ INDI
+1 NAME Fred /White/
+1 SEX M
+1 FAMS @F4@
+0 @I9@ INDI
+1 NAME Gina /White/
+1 SEX F
+1 FAMC @F4@
+0 @F1@ FAM
+1 HUSB @I1@
+1 WIFE @I2@
+1 CHIL @I3@
+1 CHIL @I4@
+0 @F2@ FAM
+1 HUSB @I3@
+1 CHIL @I5@
+1 CHIL @I6@
+0 @F3@ FAM
+1 WIFE @I4@
+1 CHIL @I7@
+0 @F4@ FAM
+1 HUSB @I8@
+1 WIFE @I4@
+1 CHIL @I9@
+"""
+
+
+
+
+def get_name(ged_data, first: int, second: int) -> str:
+    relationship: Relationship = Relationship.find(ged_data.get_individual(first), ged_data.get_individual(second))
+    return relationship.get_name() if relationship is not None else None
+
+
+
+def test_siblings_and_cousins(load_ged):
+    ged_data = load_ged(FAMILY)
+    assert get_name(ged_data, 3, 4) == "brother"
+    assert get_name(ged_data, 5, 7) == "first cousin"
+    assert get_name(ged_data, 1, 5) == "grandfather"
+    assert get_name(ged_data, 7, 4) == "son"
+    assert get_name(ged_data, 4, 6) == "aunt"
+
+
+
+def test_unknown_parent_is_not_half(load_ged):
+    # Ann and Bob only have their father on file, in the same family
+    ged_data = load_ged(FAMILY)
+    assert get_name(ged_data, 5, 6) == "sister"
+
+
+
+def test_half_siblings(load_ged):
+    # Ed and Gina are children of Dora in 2 different families
+    ged_data = load_ged(FAMILY)
+    assert get_name(ged_data, 7, 9) == "half-brother"
+    assert get_name(ged_data, 5, 9) == "first cousin"
+
+
+
+def test_no_common_ancestor(load_ged):
+    ged_data = load_ged(FAMILY)
+    assert get_name(ged_data, 1, 2) is None
+    assert get_name(ged_data, 5, 8) is None
+
+
+
+def test_names_of_numbers():
+    from relationship import numbered, ordinal, times, greats
+    assert [numbered(n) for n in (1, 2, 3, 4, 11, 12, 13, 21, 22, 101, 111, 112)] == \
+        ["1st", "2nd", "3rd", "4th", "11th", "12th", "13th", "21st", "22nd", "101st", "111th", "112th"]
+    assert (ordinal(10), ordinal(11)) == ("tenth", "11th")
+    assert (times(3), times(4)) == ("thrice", "4 times")
+    assert [greats(n) for n in (0, 1, 2)] == ["", "great-", "2nd great-"]
+
+
+
+def chain_name(up: int, down: int, sex: str = None) -> str:
+    # Only the lengths of the paths and the sex of the first individual matter for the name
+    relationship: Relationship = Relationship()
+    relationship.first = Individual.from_values(1, "A /B/", sex)
+    relationship.ancestors = [Individual.from_values(2, "C /D/")]
+    relationship.first_path = [relationship.first] * up + relationship.ancestors
+    relationship.second_path = [Individual.from_values(3, "E /F/")] * down + relationship.ancestors
+    return relationship.get_name()
+
+
+
+def test_names_of_distances():
+    assert chain_name(0, 0) == "same individual"
+    assert chain_name(1, 1) == "sibling" and chain_name(1, 1, "F") == "sister"
+    assert chain_name(0, 4, "M") == "2nd great-grandfather"
+    assert chain_name(3, 0, "F") == "great-granddaughter"
+    assert chain_name(1, 3, "M") == "great-uncle" and chain_name(4, 1) == "2nd great-nephew/niece"
+    assert chain_name(3, 2) == "first cousin once removed"
+    assert chain_name(4, 7) == "third cousin thrice removed"
+    assert chain_name(13, 13) == "12th cousin"
+
+
+
+# Pat's father Sam is a grandson of Gus, and Pat's mother Ruth is a daughter of Gus: Gus is both
+# a grandfather and a great-grandfather of Pat
+COUSIN_MARRIAGE: str = """0 @I1@ INDI
+1 NAME Gus /Old/
+1 SEX M
+1 FAMS @F1@
+0 @I2@ INDI
+1 NAME Tom /Old/
+1 FAMC @F1@
+1 FAMS @F3@
+0 @I4@ INDI
+1 NAME Ruth /Old/
+1 SEX F
+1 FAMC @F1@
+1 FAMS @F4@
+0 @I5@ INDI
+1 NAME Sam /Old/
+1 SEX M
+1 FAMC @F3@
+1 FAMS @F4@
+0 @I6@ INDI
+1 NAME Pat /Old/
+1 FAMC @F4@
+0 @F1@ FAM
+1 HUSB @I1@
+1 CHIL @I2@
+1 CHIL @I4@
+0 @F3@ FAM
+1 HUSB @I2@
+1 CHIL @I5@
+0 @F4@ FAM
+1 HUSB @I5@
+1 WIFE @I4@
+1 CHIL @I6@
+"""
+
+
+
+def test_closest_path_is_used(load_ged):
+    ged_data = load_ged(COUSIN_MARRIAGE)
+    assert get_name(ged_data, 1, 6) == "grandfather"
+    assert get_name(ged_data, 5, 4) == "nephew"
+
+    # Tom is the grandfather of Pat through Sam, before being an uncle through Ruth
+    assert get_name(ged_data, 2, 6) == "grandparent"
+
+    relationship: Relationship = Relationship.find(ged_data.get_individual(6), ged_data.get_individual(1))
+    assert [indi.id for indi in relationship.first_path] == [6, 4, 1]
+
+
+
+def test_long_line(load_ged):
+    # A line of 1500 generations: the search is iterative and only follows this line
+    records: str = "".join(f"0 @I{n}@ INDI\n1 NAME N{n} /Line/\n1 SEX M\n1 FAMC @F{n}@\n0 @F{n}@ FAM\n1 HUSB @I{n + 1}@\n1 CHIL @I{n}@\n" for n in range(1, 1500))
+    ged_data = load_ged(records + "0 @I1500@ INDI\n1 NAME Root /Line/\n1 SEX M\n")
+    assert get_name(ged_data, 1500, 1) == "1497th great-grandfather"
+    assert get_name(ged_data, 750, 1) == "747th great-grandfather"
+
+
+
+def test_components_are_checked_first(load_ged, monkeypatch):
+    ged_data = load_ged(FAMILY + COUSIN_MARRIAGE.replace("@I", "@I1").replace("@F", "@F1"))
+    assert ged_data.get_individual(5).component != ged_data.get_individual(16).component
+
+    # Individuals of different components are not searched at all
+    def fail(indi): raise AssertionError("searched")
+    monkeypatch.setattr(Relationship, "get_parents", staticmethod(fail))
+    assert get_name(ged_data, 5, 16) is None
+
+
+
+def test_royal92():
+    import os
+    from geddata import GEDData
+    ged_data: GEDData = GEDData()
+    ged_data.parse(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "example", "royal92.ged"))
+
+    # Queen Victoria and Prince Albert were first cousins, through the Duke of Saxe-Coburg
+    relationship: Relationship = Relationship.find(ged_data.get_individual(2), ged_data.get_individual(1))
+    assert relationship.get_name() == "first cousin"
+    assert [indi.get_cleared_raw_name() for indi in relationship.ancestors] == ["Francis Frederick of Saxe-Coburg", "Augusta Reuss-Ebersdorf "]
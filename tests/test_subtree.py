@@ -0,0 +1,103 @@
+# Adam and Eve have 2 children, Carl and Dora, whose children Ann and Bob marry: their son
+# Ed descends twice from Adam. Hal and Ida are each other's parent (a cycle).
+FAMILY: str = """0 @I1@ INDI
+1 NAME Adam /Smith/
+1 BIRT
+2 DATE 1700
+1 DEAT
+2 DATE 1760
+0 @I2@ INDI
+1 NAME Eve /Jones/
+1 BIRT
+2 DATE 1702
+1 DEAT
+2 DATE 1770
+0 @I3@ INDI
+1 NAME Carl /Smith/
+1 BIRT
+2 DATE 1730
+1 DEAT
+2 DATE 1790
+0 @I4@ INDI
+1 NAME Dora /Smith/
+1 BIRT
+2 DATE 1732
+1 DEAT
+2 DATE 1795
+0 @I5@ INDI
+1 NAME Ann /Smith/
+1 BIRT
+2 DATE 1760
+1 DEAT
+2 DATE 1820
+0 @I6@ INDI
+1 NAME Bob /Brown/
+1 BIRT
+2 DATE 1758
+1 DEAT
+2 DATE 1830
+0 @I7@ INDI
+1 NAME Ed /Brown/
+0 @I8@ INDI
+1 NAME Hal /Gray/
+0 @I9@ INDI
+1 NAME Ida /Gray/
+0 @F1@ FAM
+1 HUSB @I1@
+1 WIFE @I2@
+1 CHIL @I3@
+1 CHIL @I4@
+0 @F2@ FAM
+1 HUSB @I3@
+1 CHIL @I5@
+0 @F3@ FAM
+1 WIFE @I4@
+1 CHIL @I6@
+0 @F4@ FAM
+1 HUSB @I6@
+1 WIFE @I5@
+1 CHIL @I7@
+0 @F5@ FAM
+1 HUSB @I8@
+1 CHIL @I9@
+0 @F6@ FAM
+1 HUSB @I9@
+1 CHIL @I8@
+"""
+
+
+
+
+def test_descendants_are_counted_once_per_line(load_ged):
+    # Ed is counted twice for Adam and Eve, once through Carl and once through Dora
+    ged_data = load_ged(FAMILY)
+    metrics = ged_data.get_subtree_metrics()
+    counts: list[int] = [metrics.count_descendants(ged_data.get_individual(number)) for number in range(1, 8)]
+    assert counts == [6, 6, 2, 2, 1, 1, 0]
+
+
+
+def test_distinct_descendants(load_ged):
+    ged_data = load_ged(FAMILY)
+    metrics = ged_data.get_subtree_metrics()
+    counts: list[int] = [metrics.count_descendants(ged_data.get_individual(number), exact = True) for number in range(1, 8)]
+    assert counts == [5, 5, 2, 2, 1, 1, 0]
+
+
+
+def test_living_lines_and_depths(load_ged):
+    ged_data = load_ged(FAMILY)
+    metrics = ged_data.get_subtree_metrics()
+    adam, ann, ed = (ged_data.get_individual(number) for number in (1, 5, 7))
+    # Ed has no dates, so he may be alive
+    assert metrics.count_living_lines(adam) == 2 and metrics.count_living_lines(ann) == 1
+    assert metrics.get_depth(adam) == 3 and metrics.get_depth(ed) == 0
+
+
+
+def test_cycles(load_ged):
+    ged_data = load_ged(FAMILY)
+    metrics = ged_data.get_subtree_metrics()
+    hal = ged_data.get_individual(8)
+    assert metrics.count_descendants(hal) == metrics.count_descendants(hal, exact = True) == 2
+    assert metrics.get_depth(hal) is None
@@ -0,0 +1,43 @@
+import pytest
+from geddata import GEDData
+from validate import Validator
+
+
+VALID: str = """0 @I1@ INDI
+1 NAME John /Smith/
+1 FAMS @F1@
+0 @F1@ FAM
+1 HUSB @I1@
+"""
+
+
+
+
+def get_codes(path: str) -> 'list[tuple]':
+    """Return the (line, code) of the errors of the file."""
+    return [(issue["line"], issue["code"]) for issue in Validator(path).validate() if issue["severity"] == "error"]
+
+
+
+
+def test_valid_file(write_ged):
+    path: str = write_ged(VALID)
+    assert get_codes(path) == []
+    GEDData().parse(path)
+
+
+
+def test_individual_without_name(write_ged):
+    # The last record of the file has no name either: it is checked at the trailer
+    path: str = write_ged(VALID + "0 @I2@ INDI\n1 SEX F\n0 @I3@ INDI\n1 NAME Ann /Smith/\n0 @I4@ INDI\n")
+    assert get_codes(path) == [(8, "missing-name"), (12, "missing-name")]
+    with pytest.raises(Exception):
+        GEDData().parse(path)
+
+
+
+def test_reference_not_numbered(write_ged):
+    path: str = write_ged(VALID + "0 @X12A@ INDI\n1 NAME Ann /Smith/\n0 @SMITH@ NOTE The Smith family\n")
+    assert get_codes(path) == [(8, "invalid-reference")]
+    with pytest.raises(ValueError):
+        GEDData().parse(path)